@@ -0,0 +1,383 @@
+import json
+import os
+import glob
+import threading
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+from data_catalog import find_data_files
+
+# 날짜별 컬럼형 10분봉 저장소
+#
+# data/<date>/bars/part-*.npz 파일 하나에 그날 여러 종목의 봉이 들어감
+#   codes       : 종목코드 사전 (유니코드 배열)
+#   code_index  : 행별 종목코드 번호 (int32, codes의 인덱스)
+#   timestamp   : localDateTime (int64, YYYYMMDDHHMMSS)
+#   open / high / low / close : float64 (없는 값은 NaN)
+#   volume      : accumulatedTradingVolume (int64, 없는 값은 -1)
+# 행은 (종목, 시간) 순으로 정렬되어 있어 종목별 데이터는 연속된 구간으로 읽힘
+# 같은 종목이 여러 part에 있으면 나중에 쓰인 part의 데이터를 사용
+# part 이후에 stock_data_*.json이 다시 쓰였으면(storage가 json인 재수집) JSON 파일의 데이터를 사용
+
+BAR_FIELDS = [
+    ('localDateTime', 'timestamp'),
+    ('currentPrice', 'close'),
+    ('openPrice', 'open'),
+    ('highPrice', 'high'),
+    ('lowPrice', 'low'),
+    ('accumulatedTradingVolume', 'volume'),
+]
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+def partition_dir(date, data_dir='data'):
+    return os.path.join(data_dir, date, 'bars')
+
+def list_partition_files(date, data_dir='data'):
+    """
+    날짜 파티션의 part 파일 목록 (쓰인 순서대로 정렬)
+    """
+    part_files = glob.glob(os.path.join(partition_dir(date, data_dir), 'part-*.npz'))
+    return sorted(part_files, key=lambda path: (os.path.getmtime(path), path))
+
+def _to_float(value):
+    return np.nan if value is None else float(value)
+
+def bars_to_columns(bars_by_code):
+    """
+    {종목코드: 봉 리스트}를 컬럼 배열 dict로 변환하는 함수
+    """
+    codes = sorted(code for code, bars in bars_by_code.items() if bars)
+    n_rows = sum(len(bars_by_code[code]) for code in codes)
+
+    columns = {
+        'codes': np.array(codes, dtype='U'),
+        'code_index': np.empty(n_rows, dtype=np.int32),
+        'timestamp': np.empty(n_rows, dtype=np.int64),
+        'volume': np.empty(n_rows, dtype=np.int64),
+    }
+    for name in PRICE_COLUMNS:
+        columns[name] = np.empty(n_rows, dtype=np.float64)
+
+    row = 0
+    for code_idx, code in enumerate(codes):
+        bars = sorted(bars_by_code[code], key=lambda bar: str(bar['localDateTime']))
+        for bar in bars:
+            columns['code_index'][row] = code_idx
+            columns['timestamp'][row] = int(bar['localDateTime'])
+            columns['close'][row] = _to_float(bar.get('currentPrice'))
+            columns['open'][row] = _to_float(bar.get('openPrice'))
+            columns['high'][row] = _to_float(bar.get('highPrice'))
+            columns['low'][row] = _to_float(bar.get('lowPrice'))
+            volume = bar.get('accumulatedTradingVolume')
+            columns['volume'][row] = -1 if volume is None else int(volume)
+            row += 1
+    return columns
+
+def write_day_bars(date, bars_by_code, data_dir='data', part_name=None):
+    """
+    한 날짜의 여러 종목 봉 데이터를 컬럼형 part 파일 하나로 저장하는 함수
+    (임시 파일에 쓴 뒤 교체하므로 읽는 쪽에서 불완전한 파일을 보지 않음)
+
+    Args:
+        date (str): 날짜 (YYYYMMDD)
+        bars_by_code (dict): {종목코드: stock_data 형식의 봉 리스트}
+        data_dir (str): 데이터 디렉토리
+        part_name (str): part 이름 (None이면 시각+프로세스ID로 생성)
+
+    Returns:
+        str: 저장된 part 파일 경로 (저장할 데이터가 없으면 None)
+    """
+    if not any(bars_by_code.values()):
+        return None
+    if part_name is None:
+        part_name = f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{os.getpid()}"
+
+    folder = partition_dir(date, data_dir)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"part-{part_name}.npz")
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.savez(f, **bars_to_columns(bars_by_code))
+    os.replace(temp_path, path)
+    return path
+
+class DayBars:
+    """
+    한 날짜의 컬럼형 봉 데이터 (모든 part를 합친 결과)
+
+    columns의 각 배열은 같은 길이이며, 종목별 행 구간은 ranges[code] = (start, end)
+    written_at[code]는 종목 데이터가 들어 있는 part 파일의 수정 시각
+    """
+
+    def __init__(self, date, columns, ranges, written_at=None):
+        self.date = date
+        self.columns = columns
+        self.ranges = ranges
+        self.written_at = written_at or {}
+
+    @property
+    def codes(self):
+        return list(self.ranges)
+
+    def __contains__(self, stock_code):
+        return stock_code in self.ranges
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def stock_columns(self, stock_code):
+        """
+        한 종목의 컬럼 배열 dict (복사 없이 슬라이스)
+        """
+        start, end = self.ranges[stock_code]
+        return {name: values[start:end] for name, values in self.columns.items()}
+
+    def stock_bars(self, stock_code):
+        """
+        한 종목의 봉 데이터를 stock_data_*.json의 'data'와 같은 dict 리스트로 반환
+        """
+        if stock_code not in self.ranges:
+            return None
+        cols = self.stock_columns(stock_code)
+        bars = []
+        for i in range(len(cols['timestamp'])):
+            bar = {}
+            for field, name in BAR_FIELDS:
+                value = cols[name][i]
+                if name == 'timestamp':
+                    bar[field] = str(int(value))
+                elif name == 'volume':
+                    bar[field] = None if value < 0 else int(value)
+                else:
+                    bar[field] = None if np.isnan(value) else float(value)
+            bars.append(bar)
+        return bars
+
+def read_day_bars(date, data_dir='data'):
+    """
+    날짜 파티션의 모든 part를 한 번에 읽어 DayBars로 반환하는 함수
+
+    Returns:
+        DayBars: 해당 날짜의 컬럼형 봉 데이터 (파티션이 없으면 None)
+    """
+    part_files = list_partition_files(date, data_dir)
+    if not part_files:
+        return None
+
+    # 종목별로 가장 나중에 쓰인 part의 행만 선택
+    parts = []
+    owner = {}
+    part_mtimes = [os.path.getmtime(path) for path in part_files]
+    for part_idx, path in enumerate(part_files):
+        with np.load(path) as npz:
+            part = {name: npz[name] for name in npz.files}
+        parts.append(part)
+        for code in part['codes']:
+            owner[str(code)] = part_idx
+
+    pieces = {name: [] for name in ('timestamp', 'volume') + PRICE_COLUMNS}
+    ranges = OrderedDict()
+    row = 0
+    for code in sorted(owner):
+        part = parts[owner[code]]
+        code_idx = int(np.searchsorted(part['codes'], code))
+        rows = np.flatnonzero(part['code_index'] == code_idx)
+        for name in pieces:
+            pieces[name].append(part[name][rows])
+        ranges[code] = (row, row + len(rows))
+        row += len(rows)
+
+    columns = {name: (np.concatenate(values) if values else np.empty(0))
+               for name, values in pieces.items()}
+    written_at = {code: part_mtimes[part_idx] for code, part_idx in owner.items()}
+    return DayBars(date, columns, ranges, written_at)
+
+_day_cache = OrderedDict()
+_day_cache_lock = threading.Lock()
+_DAY_CACHE_SIZE = 4
+
+def get_day_bars(date, data_dir='data'):
+    """
+    read_day_bars 결과를 최근 몇 개 날짜만큼 메모리에 보관하여 재사용하는 함수
+    (part 파일이 새로 쓰이거나 바뀌면 다시 읽음)
+    """
+    part_files = list_partition_files(date, data_dir)
+    if not part_files:
+        return None
+    signature = tuple((path, os.path.getmtime(path)) for path in part_files)
+    key = (data_dir, date)
+    with _day_cache_lock:
+        cached = _day_cache.get(key)
+        if cached and cached[0] == signature:
+            _day_cache.move_to_end(key)
+            return cached[1]
+
+    day_bars = read_day_bars(date, data_dir)
+    with _day_cache_lock:
+        _day_cache[key] = (signature, day_bars)
+        _day_cache.move_to_end(key)
+        while len(_day_cache) > _DAY_CACHE_SIZE:
+            _day_cache.popitem(last=False)
+    return day_bars
+
+def stock_json_path(stock_code, date, data_dir='data'):
+    return os.path.join(data_dir, date, f'stock_data_{stock_code}_{date}.json')
+
+def _json_is_newer(day_bars, stock_code, json_path):
+    """
+    stock_data_*.json이 종목의 part 파일보다 나중에 쓰였는지 확인 (part 이후 JSON으로 재수집된 경우)
+    """
+    try:
+        return os.path.getmtime(json_path) > day_bars.written_at.get(stock_code, 0)
+    except OSError:
+        return False
+
+def load_stock_bars(stock_code, date, data_dir='data'):
+    """
+    종목/날짜의 10분봉 데이터를 읽는 함수
+    컬럼형 저장소(data/<date>/bars/)를 먼저 확인하고, 없으면 stock_data_*.json 파일을 읽음
+    (part 파일 이후에 JSON 파일이 다시 쓰였으면 더 최신인 JSON 파일을 읽음)
+
+    Returns:
+        list: stock_data 형식의 봉 dict 리스트 (데이터가 없으면 None)
+    """
+    json_path = stock_json_path(stock_code, date, data_dir)
+    day_bars = get_day_bars(date, data_dir)
+    if day_bars is not None and stock_code in day_bars and not _json_is_newer(day_bars, stock_code, json_path):
+        return day_bars.stock_bars(stock_code)
+
+    if not os.path.exists(json_path):
+        return None
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['data']
+
+def has_stock_bars(stock_code, date, data_dir='data'):
+    """
+    종목/날짜의 10분봉 데이터가 있는지 확인 (컬럼형 저장소 또는 stock_data_*.json)
+    """
+    day_bars = get_day_bars(date, data_dir)
+    if day_bars is not None and stock_code in day_bars:
+        return True
+    return os.path.exists(stock_json_path(stock_code, date, data_dir))
+
+def stock_bar_count(stock_code, date, data_dir='data'):
+    """
+    컬럼형 저장소에 저장된 종목/날짜의 봉 개수 (없거나 JSON 파일이 더 최신이면 None)
+    """
+    day_bars = get_day_bars(date, data_dir)
+    if day_bars is None or stock_code not in day_bars:
+        return None
+    if _json_is_newer(day_bars, stock_code, stock_json_path(stock_code, date, data_dir)):
+        return None
+    start, end = day_bars.ranges[stock_code]
+    return end - start
+
+def list_stock_codes(date, data_dir='data'):
+    """
+    해당 날짜에 봉 데이터가 있는 종목코드 목록 (컬럼형 저장소 + JSON 파일)
+    (JSON 파일 목록은 data_catalog 카탈로그에서 조회)
+    """
+    codes = set()
+    day_bars = get_day_bars(date, data_dir)
+    if day_bars is not None:
+        codes.update(day_bars.codes)
+    prefix = 'stock_data_'
+    for path in find_data_files('stock_data', date, data_dir):
+        codes.add(os.path.basename(path)[len(prefix):].split('_')[0])
+    return sorted(codes)
+
+class BarStoreWriter:
+    """
+    수집 중인 봉 데이터를 날짜별로 모아 두었다가 part 파일로 쓰는 writer (스레드 안전)
+    """
+
+    def __init__(self, data_dir='data', part_prefix=None):
+        self.data_dir = data_dir
+        self.part_prefix = part_prefix
+        self._buffer = {}
+        self._lock = threading.Lock()
+        self._flush_count = 0
+
+    def add(self, stock_code, all_data):
+        """
+        한 종목의 {날짜: 봉 리스트}를 버퍼에 추가
+        """
+        with self._lock:
+            for date_str, day_data in all_data.items():
+                self._buffer.setdefault(date_str, {})[stock_code] = day_data
+
+    def pending_stocks(self):
+        with self._lock:
+            return len({code for bars_by_code in self._buffer.values() for code in bars_by_code})
+
+    def flush(self):
+        """
+        버퍼의 데이터를 날짜별 part 파일로 저장하고 저장된 파일 경로 리스트를 반환
+        """
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+            self._flush_count += 1
+            flush_count = self._flush_count
+        written = []
+        for date_str, bars_by_code in sorted(buffer.items()):
+            part_name = None
+            if self.part_prefix:
+                part_name = f"{self.part_prefix}-{datetime.now().strftime('%Y%m%d%H%M%S')}-{flush_count}"
+            path = write_day_bars(date_str, bars_by_code, self.data_dir, part_name)
+            if path:
+                written.append(path)
+        return written
+
+def convert_date_from_json(date, data_dir='data', compact=True):
+    """
+    기존 data/<date>/stock_data_*.json 파일들을 컬럼형 파티션으로 변환하는 함수
+
+    Args:
+        compact (bool): True면 기존 part 파일을 지우고 하나의 part로 다시 씀
+
+    Returns:
+        int: 변환된 종목 수
+    """
+    bars_by_code = {}
+    day_bars = get_day_bars(date, data_dir)
+    if day_bars is not None and compact:
+        for code in day_bars.codes:
+            bars_by_code[code] = day_bars.stock_bars(code)
+
+    prefix = 'stock_data_'
+    for path in sorted(glob.glob(os.path.join(data_dir, date, f'{prefix}*_{date}.json'))):
+        stock_code = os.path.basename(path)[len(prefix):].split('_')[0]
+        with open(path, 'r', encoding='utf-8') as f:
+            bars_by_code[stock_code] = json.load(f)['data']
+
+    if not bars_by_code:
+        return 0
+    old_parts = list_partition_files(date, data_dir) if compact else []
+    new_path = write_day_bars(date, bars_by_code, data_dir)
+    for path in old_parts:
+        if path != new_path:
+            os.remove(path)
+    return len(bars_by_code)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='10분봉 JSON 파일을 날짜별 컬럼형 저장소로 변환')
+    parser.add_argument('--date', type=str, help='변환할 날짜 (YYYYMMDD)')
+    parser.add_argument('--all', action='store_true', help='data 디렉토리의 모든 날짜 변환')
+    parser.add_argument('--data_dir', default='data', help='데이터 디렉토리 (기본값: data)')
+    args = parser.parse_args()
+
+    if args.date:
+        dates = [args.date]
+    elif args.all:
+        dates = sorted(item for item in os.listdir(args.data_dir)
+                       if item.isdigit() and len(item) == 8 and os.path.isdir(os.path.join(args.data_dir, item)))
+    else:
+        print("사용법:")
+        print("  특정 날짜 변환: python bar_store.py --date 20250722")
+        print("  전체 날짜 변환: python bar_store.py --all")
+        dates = []
+
+    for date in dates:
+        count = convert_date_from_json(date, args.data_dir)
+        print(f"{date}: {count}개 종목 변환 완료 ({partition_dir(date, args.data_dir)})")
@@ -2,9 +2,16 @@ import json
 import os
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import glob
+from datetime import datetime
 import argparse
+from trading_calendar import load_trading_calendar
+from bar_store import load_stock_bars, has_stock_bars
+from data_catalog import get_catalog, find_data_files, folder_mtimes
+from rsi_engine import batch_rsi_with_warmup
+from calculate_rsi_with_previous import build_input_fingerprint, rsi_rebuild_reason, PREVIOUS_WINDOW_METHOD
+
+# 워밍업에 사용하는 전영업일 마지막 가격 수 (결과 파일 입력 기록의 previous_window)
+PREVIOUS_WINDOW = 14
 
 def calculate_rsi_with_previous_data(current_prices, previous_prices=None, period=14):
     """
@@ -30,39 +37,8 @@ def calculate_rsi_with_previous_data(current_prices, previous_prices=None, perio
         print(f"  경고: 데이터 부족 (필요: {period + 1}개, 보유: {len(all_prices)}개)")
         return [None] * len(current_prices)
     
-    # 가격 변화 계산
-    deltas = np.diff(all_prices)
-    
-    # 상승/하락 분리
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    # 초기 평균 계산
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-    
-    # 전체 데이터에 대한 RSI 계산
-    rsi_values_all = [None] * period  # 초기 period개는 None
-    
-    # RSI 계산
-    for i in range(period, len(all_prices)):
-        # 지수이동평균 방식으로 평균 업데이트
-        avg_gain = (avg_gain * (period - 1) + gains[i-1]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i-1]) / period
-        
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-        
-        rsi_values_all.append(rsi)
-    
-    # 전일자 데이터가 있으면 당일 데이터 부분만 반환
-    if previous_prices:
-        return rsi_values_all[len(previous_prices):]
-    else:
-        return rsi_values_all
+    # 전일자 + 당일 데이터로 RSI 계산 후 당일 데이터 부분만 반환 (rsi_engine)
+    return batch_rsi_with_warmup([current_prices], [previous_prices], period)[0]
 
 def get_previous_date_data(stock_code, current_date, data_dir='data'):
     """
@@ -77,39 +53,50 @@ def get_previous_date_data(stock_code, current_date, data_dir='data'):
         list: 전영업일 가격 데이터 (없으면 None)
     """
     try:
-        # 현재 날짜를 datetime 객체로 변환
-        current_dt = datetime.strptime(current_date, '%Y%m%d')
+        # 거래일 캘린더로 전영업일 계산 (파일 탐색 없이 1회 확인)
+        previous_date = load_trading_calendar().previous_trading_day(current_date)
         
-        # 최대 7일 전까지 확인 (주말 고려)
-        for days_back in range(1, 8):
-            previous_dt = current_dt - timedelta(days=days_back)
-            previous_date = previous_dt.strftime('%Y%m%d')
-            
-            # 전영업일 파일 경로
-            previous_file = os.path.join(data_dir, stock_code, f'stock_data_{stock_code}_{previous_date}.json')
+        # 전영업일 파일 경로
+        previous_file = os.path.join(data_dir, stock_code, f'stock_data_{stock_code}_{previous_date}.json')
+        
+        if os.path.exists(previous_file):
+            print(f"  전영업일 데이터 파일 발견: {previous_date}")
+            with open(previous_file, 'r', encoding='utf-8') as f:
+                previous_bars = json.load(f)['data']
+        else:
+            # 날짜별 폴더 / 컬럼형 저장소에서 찾기
+            previous_bars = load_stock_bars(stock_code, previous_date, data_dir)
+            if previous_bars:
+                print(f"  전영업일 데이터 발견 (날짜별 저장소): {previous_date}")
+        
+        if previous_bars:
+            # 전영업일 가격 데이터 추출 (최근 PREVIOUS_WINDOW개 데이터 사용)
+            previous_prices = [item['currentPrice'] for item in previous_bars]
+            # 최근 PREVIOUS_WINDOW개만 사용 (RSI 계산에 충분한 데이터)
+            if len(previous_prices) > PREVIOUS_WINDOW:
+                previous_prices = previous_prices[-PREVIOUS_WINDOW:]
             
-            if os.path.exists(previous_file):
-                print(f"  전영업일 데이터 파일 발견: {previous_date} ({days_back}일 전)")
-                with open(previous_file, 'r', encoding='utf-8') as f:
-                    previous_data = json.load(f)
-                
-                # 전영업일 가격 데이터 추출 (최근 14개 데이터 사용)
-                previous_prices = [item['currentPrice'] for item in previous_data['data']]
-                # 최근 14개만 사용 (RSI 계산에 충분한 데이터)
-                if len(previous_prices) > 14:
-                    previous_prices = previous_prices[-14:]
-                
-                print(f"  전영업일 가격 데이터 {len(previous_prices)}개 로드 완료")
-                return previous_prices
+            print(f"  전영업일 가격 데이터 {len(previous_prices)}개 로드 완료")
+            return previous_prices
         
-        print(f"  전영업일 데이터 파일 없음: 최근 7일 내 데이터 확인 완료")
+        print(f"  전영업일 데이터 파일 없음: {previous_date}")
         return None
             
     except Exception as e:
         print(f"  전영업일 데이터 로드 중 오류: {str(e)}")
         return None
 
-def process_stock_data(file_path, rsi_period=14, use_previous_data=True):
+def load_existing_output(output_path):
+    """
+    기존 RSI 결과 파일을 읽는 함수 (없거나 읽을 수 없으면 None)
+    """
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def process_stock_data(file_path, rsi_period=14, use_previous_data=True, incremental=False, dry_run=False):
     """
     주식 데이터 파일을 읽어서 RSI를 계산하고 결과를 저장
     
@@ -117,26 +104,66 @@ def process_stock_data(file_path, rsi_period=14, use_previous_data=True):
         file_path (str): 주식 데이터 파일 경로
         rsi_period (int): RSI 계산 기간
         use_previous_data (bool): 전일자 데이터 사용 여부
+        incremental (bool): 결과 파일에 기록된 입력(당일 봉, 전일 가격, 계산 설정)과 같으면 건너뜀
+        dry_run (bool): 다시 계산할지 여부만 출력하고 저장하지 않음
+    
+    Returns:
+        dict: 저장한 RSI 데이터 (실패하거나 건너뛰면 None)
     """
     try:
-        # JSON 파일 읽기
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        stock_code = data['stock_code']
-        date = data['date']
+        if os.path.exists(file_path):
+            # JSON 파일 읽기
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            stock_code = data['stock_code']
+            date = data['date']
+            bars = data['data']
+        else:
+            # 파일이 없으면 날짜별 컬럼형 저장소에서 읽기
+            stock_code, date = os.path.basename(file_path)[len('stock_data_'):-len('.json')].split('_')
+            bars = load_stock_bars(stock_code, date)
+            if not bars:
+                print(f"주식 데이터를 찾을 수 없습니다: {file_path}")
+                return None
         
         print(f"처리 중: {stock_code} ({date})")
         
         # 현재 날짜의 가격 데이터 추출
-        current_prices = [item['currentPrice'] for item in data['data']]
-        timestamps = [item['localDateTime'] for item in data['data']]
+        current_prices = [item['currentPrice'] for item in bars]
+        timestamps = [item['localDateTime'] for item in bars]
         
         # 전일자 데이터 가져오기
         previous_prices = None
         if use_previous_data:
             previous_prices = get_previous_date_data(stock_code, date)
         
+        # 결과 파일에 기록할 입력 (calculate_rsi_with_previous.py와 같은 형식, 전일 가격 사용 개수와 계산 방식을 함께 기록해
+        # 다시 확인/계산할 때도 같은 개수만 사용)
+        inputs = {
+            'date': date,
+            'timestamps': timestamps,
+            'current_prices': current_prices,
+            'previous_date': load_trading_calendar().previous_trading_day(date) if previous_prices else None,
+            'previous_prices': previous_prices,
+            'previous_window': PREVIOUS_WINDOW if use_previous_data else 0
+        }
+        fingerprint = build_input_fingerprint(inputs, rsi_period, calculation_method=PREVIOUS_WINDOW_METHOD)
+        
+        # 출력 파일명 생성 (종목별 폴더)
+        output_filename = f"rsi_data_{stock_code}_{date}.json"
+        stock_folder = f"data/{stock_code}"
+        output_path = os.path.join(stock_folder, output_filename)
+        
+        if incremental or dry_run:
+            reason = rsi_rebuild_reason(fingerprint, load_existing_output(output_path))
+            if reason is None:
+                print(f"  변경 없음 - 건너뜀: {output_filename}")
+                return None
+            if dry_run:
+                print(f"  [다시 계산 대상] {stock_code} ({date}): {reason}")
+                return None
+        
         # RSI 계산 (전일자 데이터 활용)
         rsi_values = calculate_rsi_with_previous_data(current_prices, previous_prices, rsi_period)
         
@@ -162,22 +189,19 @@ def process_stock_data(file_path, rsi_period=14, use_previous_data=True):
                 'rsi_period': rsi_period,
                 'calculation_method': 'exponential_moving_average',
                 'used_previous_data': previous_prices is not None,
-                'previous_data_count': len(previous_prices) if previous_prices else 0
+                'previous_data_count': len(previous_prices) if previous_prices else 0,
+                'inputs': fingerprint
             },
             'data': result_data
         }
         
-        # 출력 파일명 생성
-        output_filename = f"rsi_data_{stock_code}_{date}.json"
-        
         # 종목별 폴더 생성
-        stock_folder = f"data/{stock_code}"
         os.makedirs(stock_folder, exist_ok=True)
         
-        output_path = os.path.join(stock_folder, output_filename)
-        
+        before = folder_mtimes([output_path])
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, ensure_ascii=False, indent=4)
+        get_catalog().record_file(output_path, 'calculate_rsi', result_data, before)
         
         print(f"RSI 계산 완료: {output_filename}")
         
@@ -197,17 +221,18 @@ def process_stock_data(file_path, rsi_period=14, use_previous_data=True):
         print(f"오류 발생 ({file_path}): {str(e)}")
         return None
 
-def process_all_stock_data(data_dir='data', rsi_period=14):
+def process_all_stock_data(data_dir='data', rsi_period=14, incremental=False, dry_run=False):
     """
     data 디렉토리의 모든 주식 데이터 파일에 대해 RSI를 계산
     
     Args:
         data_dir (str): 데이터 디렉토리 경로
         rsi_period (int): RSI 계산 기간
+        incremental (bool): 결과 파일에 기록된 입력과 달라진 파일만 다시 계산
+        dry_run (bool): 다시 계산할 파일만 출력하고 저장하지 않음
     """
-    # stock_data_*.json 파일들 찾기
-    pattern = os.path.join(data_dir, 'stock_data_*.json')
-    stock_files = glob.glob(pattern)
+    # data 디렉토리의 stock_data_*.json 파일들을 카탈로그에서 조회
+    stock_files = find_data_files('stock_data', data_dir=data_dir, folder=data_dir)
     
     if not stock_files:
         print("처리할 주식 데이터 파일을 찾을 수 없습니다.")
@@ -219,11 +244,15 @@ def process_all_stock_data(data_dir='data', rsi_period=14):
     
     results = []
     for file_path in stock_files:
-        result = process_stock_data(file_path, rsi_period)
+        result = process_stock_data(file_path, rsi_period, incremental=incremental, dry_run=dry_run)
         if result:
             results.append(result)
         print()
     
+    if dry_run:
+        print("dry run: 파일을 저장하지 않았습니다.")
+        return
+    
     print(f"처리 완료: {len(results)}개 파일")
     
     # 전체 통계 생성
@@ -288,7 +317,7 @@ def process_specific_stock_data(stock_code, date, rsi_period=14, use_previous_da
     input_filename = f"stock_data_{stock_code}_{date}.json"
     input_path = os.path.join('data', stock_code, input_filename)
     
-    if not os.path.exists(input_path):
+    if not os.path.exists(input_path) and not has_stock_bars(stock_code, date):
         print(f"파일을 찾을 수 없습니다: {input_path}")
         return None
     
@@ -301,6 +330,10 @@ if __name__ == "__main__":
     parser.add_argument('--rsi_period', type=int, default=14, help='RSI 계산 기간 (기본값: 14)')
     parser.add_argument('--all', action='store_true', help='모든 주식 데이터 파일 처리')
     parser.add_argument('--no_previous_data', action='store_true', help='전일자 데이터 사용하지 않음')
+    parser.add_argument('--incremental', action='store_true',
+                        help='--all 처리 시 결과 파일에 기록된 입력과 달라진 파일만 다시 계산')
+    parser.add_argument('--dry_run', action='store_true',
+                        help='--all 처리 시 다시 계산할 파일만 출력하고 저장하지 않음')
     
     args = parser.parse_args()
     
@@ -315,7 +348,7 @@ if __name__ == "__main__":
     
     if args.all:
         # 모든 주식 데이터 파일 처리
-        process_all_stock_data(rsi_period=RSI_PERIOD)
+        process_all_stock_data(rsi_period=RSI_PERIOD, incremental=args.incremental, dry_run=args.dry_run)
     elif args.date and args.stock_code:
         # 특정 종목과 날짜에 대한 처리
         print(f"종목코드: {args.stock_code}")
@@ -333,4 +366,6 @@ if __name__ == "__main__":
         print("  특정 종목과 날짜: python calculate_rsi.py --date 20250717 --stock_code 005930")
         print("  전일자 데이터 없이: python calculate_rsi.py --date 20250717 --stock_code 005930 --no_previous_data")
         print("  모든 파일 처리: python calculate_rsi.py --all")
+        print("  입력이 바뀐 파일만 다시 계산: python calculate_rsi.py --all --incremental")
+        print("  다시 계산할 대상 확인: python calculate_rsi.py --all --dry_run")
         print("  RSI 기간 변경: python calculate_rsi.py --date 20250717 --stock_code 005930 --rsi_period 21") 
\ No newline at end of file
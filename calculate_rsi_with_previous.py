@@ -1,13 +1,25 @@
 import json
 import os
-import pandas as pd
+import hashlib
 import numpy as np
+from concurrent.futures import as_completed
 from datetime import datetime
-import glob
+from trading_calendar import load_trading_calendar
+from bar_store import list_stock_codes
+from price_matrix import load_price_series
+from data_catalog import folder_mtimes, get_catalog
+from rsi_engine import (batch_rsi, batch_rsi_multi, batch_rsi_with_previous, batch_rsi_with_previous_multi,
+                        batch_rsi_with_warmup, parse_periods)
+from pool_utils import create_process_pool
+from rsi_state import find_previous_rsi_state, carry_forward_rsi, load_rsi_state, save_rsi_state
+
+# calculate_rsi.py 방식: 전일 마지막 N개 가격 + 당일 가격을 이어 calculate_rsi로 계산 (입력 기록에 previous_window로 N 기록)
+PREVIOUS_WINDOW_METHOD = 'exponential_moving_average_previous_window'
 
 def calculate_rsi_with_previous_data(current_prices, previous_prices, period=14):
     """
     전일자 데이터를 활용하여 RSI(Relative Strength Index) 계산
+    (결합 데이터 앞부분 period개 평균으로 시작하여 전일자 데이터 이후부터 갱신, rsi_engine 사용)
     
     Args:
         current_prices (list): 현재일 가격 리스트
@@ -17,111 +29,274 @@ def calculate_rsi_with_previous_data(current_prices, previous_prices, period=14)
     Returns:
         list: RSI 값 리스트
     """
-    # 전일자 데이터와 현재일 데이터 결합
-    all_prices = previous_prices + current_prices
-    
-    if len(all_prices) < period + 1:
-        return [None] * len(current_prices)
-    
-    # 가격 변화 계산
-    deltas = np.diff(all_prices)
-    
-    # 상승/하락 분리
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    # 초기 평균 계산 (전일자 데이터 포함)
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-    
-    # 현재일 데이터에 대한 RSI 계산
-    rsi_values = []
-    
-    # 전일자 데이터 이후부터 RSI 계산
-    for i in range(len(previous_prices), len(all_prices) - 1):
-        # 지수이동평균 방식으로 평균 업데이트
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-        
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-        
-        rsi_values.append(rsi)
-    
-    return rsi_values
+    return batch_rsi_with_previous([current_prices], [previous_prices], period)[0]
 
-def find_previous_data_file(stock_code, current_date, max_lookback=7):
+def load_previous_day_prices(stock_code, current_date, max_lookback=7):
     """
-    전일자(가장 가까운 이전 거래일) 데이터 파일을 찾는 함수
-    토/일/공휴일 등 비거래일은 자동으로 건너뜀
+    전일자(가장 가까운 이전 거래일) 10분 종가 데이터를 읽는 함수
+    토/일/공휴일 등 비거래일은 거래일 캘린더로 건너뜀
+    (가격 행렬 → 컬럼형 저장소 → stock_data_*.json 순으로 확인)
 
     Args:
         stock_code (str): 종목 코드
         current_date (str): 현재일 (YYYYMMDD 형식)
-        max_lookback (int): 최대 며칠 전까지 찾을지 (기본 7일)
+        max_lookback (int): 전영업일이 며칠 전까지일 때만 사용할지 (기본 7일)
 
     Returns:
-        str: 전일자 데이터 파일 경로 또는 None
-    """
-    current_dt = datetime.strptime(current_date, '%Y%m%d')
-    for i in range(1, max_lookback + 1):
-        previous_dt = current_dt - pd.Timedelta(days=i)
-        previous_date = previous_dt.strftime('%Y%m%d')
-        previous_file = f"stock_data_{stock_code}_{previous_date}.json"
-        previous_path = os.path.join('data', previous_date, previous_file)  # <--- 변경
-        if os.path.exists(previous_path):
-            return previous_path
-    print(f"전일자 데이터 파일을 찾을 수 없습니다: {stock_code} {current_date} 기준 {max_lookback}일 내")
-    return None
+        tuple: (전영업일, 종가 리스트) 또는 (None, None)
+    """
+    previous_date = load_trading_calendar().previous_trading_day(current_date)
+    gap_days = (datetime.strptime(current_date, '%Y%m%d') - datetime.strptime(previous_date, '%Y%m%d')).days
+    if gap_days <= max_lookback:
+        previous_series = load_price_series(stock_code, previous_date)
+        if previous_series and previous_series[1]:
+            return previous_date, previous_series[1]
+    print(f"전일자 데이터를 찾을 수 없습니다: {stock_code} {current_date} 기준 전영업일 {previous_date}")
+    return None, None
 
 def process_stock_data_with_previous(file_path, rsi_period=14):
     """
     전일자 데이터를 활용하여 주식 데이터 파일을 읽어서 RSI를 계산하고 결과를 저장
     
     Args:
-        file_path (str): 주식 데이터 파일 경로
+        file_path (str): 주식 데이터 파일 경로 (data/<date>/stock_data_<code>_<date>.json)
         rsi_period (int): RSI 계산 기간
     """
+    stock_code, date = os.path.basename(file_path)[len('stock_data_'):-len('.json')].split('_')
+    return process_stock_bars_with_previous(stock_code, date, rsi_period)
+
+def load_rsi_inputs(stock_code, date, with_previous=True, errors=None, previous_window=None):
+    """
+    RSI 계산에 필요한 종목/날짜의 당일 가격과 전일자 가격을 읽는 함수
+    (가격은 가격 행렬, 컬럼형 저장소, stock_data_*.json 순으로 읽음)
+    
+    Args:
+        with_previous (bool): False이면 전일자 가격을 읽지 않음 (RSI 상태 이어서 계산할 때)
+        errors (dict): 주어지면 실패 시 {종목코드: 오류 메시지}를 기록
+        previous_window (int): 주어지면 전일자 가격을 마지막 N개만 사용 (calculate_rsi.py 방식, 0이면 전일자 가격 미사용)
+    
+    Returns:
+        dict: stock_code, date, timestamps, current_prices, previous_date, previous_prices, previous_window
+              (데이터가 없으면 None)
+    """
     try:
-        # JSON 파일 읽기
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        stock_code = data['stock_code']
-        date = data['date']
+        series = load_price_series(stock_code, date)
+        if not series:
+            message = f"주식 데이터를 찾을 수 없습니다: {stock_code} ({date})"
+            print(message)
+            if errors is not None:
+                errors[stock_code] = message
+            return None
         
         print(f"처리 중: {stock_code} ({date})")
         
         # 현재일 가격 데이터 추출
-        current_prices = [item['currentPrice'] for item in data['data']]
-        timestamps = [item['localDateTime'] for item in data['data']]
+        timestamps, current_prices = series
         
         # 전일자 데이터 찾기
-        previous_file = find_previous_data_file(stock_code, date)
-        previous_prices = []
-        
-        if previous_file:
-            print(f"  전일자 데이터 활용: {os.path.basename(previous_file)}")
-            with open(previous_file, 'r', encoding='utf-8') as f:
-                previous_data = json.load(f)
-            previous_prices = [item['currentPrice'] for item in previous_data['data']]
-            print(f"  전일자 데이터 포인트: {len(previous_prices)}개")
-        else:
-            print("  전일자 데이터 없음 - 기본 RSI 계산 사용")
-        
-        # RSI 계산 (전일자 데이터 활용)
-        if previous_prices:
-            rsi_values = calculate_rsi_with_previous_data(current_prices, previous_prices, rsi_period)
-        else:
-            # 전일자 데이터가 없는 경우 기본 계산 사용
-            rsi_values = calculate_rsi(current_prices, rsi_period)
+        previous_date, previous_prices = None, None
+        if with_previous and previous_window != 0:
+            previous_date, previous_prices = load_previous_day_prices(stock_code, date)
+            if previous_prices and previous_window:
+                previous_prices = previous_prices[-previous_window:]
+            
+            if previous_prices:
+                print(f"  전일자 데이터 활용: {stock_code} ({previous_date})")
+                print(f"  전일자 데이터 포인트: {len(previous_prices)}개")
+            else:
+                print("  전일자 데이터 없음 - 기본 RSI 계산 사용")
         
+        return {
+            'stock_code': stock_code,
+            'date': date,
+            'timestamps': timestamps,
+            'current_prices': current_prices,
+            'previous_date': previous_date,
+            'previous_prices': previous_prices,
+            'previous_window': previous_window
+        }
+    
+    except Exception as e:
+        print(f"오류 발생 ({stock_code} {date}): {str(e)}")
+        if errors is not None:
+            errors[stock_code] = f"RSI 입력 로드 실패: {str(e)}"
+        return None
+
+def compute_rsi_batch(inputs_list, rsi_period=14):
+    """
+    여러 종목의 RSI를 rsi_engine으로 한 번에 계산하는 함수
+    (전일자 데이터가 있는 종목은 calculate_rsi_with_previous_data, 없는 종목은 calculate_rsi와 같은 결과)
+    
+    Returns:
+        list: inputs_list 순서의 종목별 RSI 리스트
+    """
+    return [rsi_by_period[rsi_period] for rsi_by_period in compute_rsi_batch_multi(inputs_list, [rsi_period])]
+
+def compute_rsi_batch_multi(inputs_list, rsi_periods):
+    """
+    여러 종목의 여러 기간 RSI를 같은 변화량 배열로 한 번에 계산하는 함수
+    
+    Args:
+        inputs_list (list): load_rsi_inputs 결과 리스트
+        rsi_periods (list): RSI 기간 리스트
+    
+    Returns:
+        list: inputs_list 순서의 종목별 {기간: RSI 리스트}
+    """
+    with_previous = [i for i, inputs in enumerate(inputs_list) if inputs['previous_prices']]
+    without_previous = [i for i, inputs in enumerate(inputs_list) if not inputs['previous_prices']]
+    
+    rsi_by_period_list = [{} for _ in inputs_list]
+    if with_previous:
+        batch = batch_rsi_with_previous_multi([inputs_list[i]['current_prices'] for i in with_previous],
+                                              [inputs_list[i]['previous_prices'] for i in with_previous], rsi_periods)
+        for period, rsi_values_list in batch.items():
+            for i, rsi_values in zip(with_previous, rsi_values_list):
+                rsi_by_period_list[i][period] = rsi_values
+    if without_previous:
+        batch = batch_rsi_multi([inputs_list[i]['current_prices'] for i in without_previous], rsi_periods)
+        for period, rsi_values_list in batch.items():
+            for i, rsi_values in zip(without_previous, rsi_values_list):
+                rsi_by_period_list[i][period] = rsi_values
+    return rsi_by_period_list
+
+def _sha256_json(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+def build_input_fingerprint(inputs, rsi_period=14, rsi_periods=None, calculation_method='exponential_moving_average'):
+    """
+    RSI 결과가 어떤 입력으로 만들어졌는지 나타내는 기록을 만드는 함수
+    (가격은 행렬/컬럼형 저장소/JSON 중 어디서 읽었는지와 관계없이 읽은 값의 sha256으로 기록)
+    
+    Args:
+        inputs (dict): load_rsi_inputs 결과 (상태 이어서 계산이면 previous_state, 전일 마지막 N개만 쓰면 previous_window 포함)
+        rsi_periods (list): 함께 저장한 RSI 기간 리스트 (없으면 None)
+        calculation_method (str): 계산 방식
+    
+    Returns:
+        dict: current (당일 봉), previous (전일 가격 또는 전일 RSI 상태), 계산 설정 (previous_window: 전일 가격 사용 개수)
+    """
+    current = {
+        'date': inputs['date'],
+        'bar_count': len(inputs['current_prices']),
+        'sha256': _sha256_json([[str(ts) for ts in inputs['timestamps']],
+                                [None if price is None else float(price) for price in inputs['current_prices']]])
+    }
+    previous = None
+    if inputs.get('previous_state') is not None:
+        previous = {'date': inputs['previous_date'], 'state_sha256': _sha256_json(inputs['previous_state'])}
+    elif inputs['previous_prices']:
+        previous = {
+            'date': inputs['previous_date'],
+            'bar_count': len(inputs['previous_prices']),
+            'sha256': _sha256_json([float(price) for price in inputs['previous_prices']])
+        }
+    return {
+        'current': current,
+        'previous': previous,
+        'rsi_period': rsi_period,
+        'rsi_periods': list(rsi_periods) if rsi_periods else None,
+        'calculation_method': calculation_method,
+        'previous_window': inputs.get('previous_window')
+    }
+
+def rsi_output_path(stock_code, date):
+    return os.path.join('data', date, f"rsi_data_{stock_code}_{date}.json")
+
+def load_rsi_output(stock_code, date):
+    """
+    기존 RSI 결과 파일을 읽는 함수 (없거나 읽을 수 없으면 None)
+    """
+    try:
+        with open(rsi_output_path(stock_code, date), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def rsi_rebuild_reason(fingerprint, existing_output):
+    """
+    기존 결과 파일의 입력 기록과 현재 입력을 비교해 다시 계산해야 하는 이유를 반환
+    
+    Returns:
+        str: 다시 계산할 이유 (최신이면 None)
+    """
+    if existing_output is None:
+        return '결과 없음'
+    recorded = existing_output.get('calculation_settings', {}).get('inputs')
+    if not recorded:
+        return '입력 기록 없음'
+    if recorded.get('current') != fingerprint['current']:
+        return '당일 입력 변경'
+    if recorded.get('previous') != fingerprint['previous']:
+        return '전일 입력 변경'
+    if any(recorded.get(key) != fingerprint.get(key)
+           for key in ('rsi_period', 'rsi_periods', 'calculation_method', 'previous_window')):
+        return '계산 설정 변경'
+    return None
+
+def select_stale_inputs(loaded, rsi_period, rsi_periods, calculation_method, dry_run=False):
+    """
+    입력이 바뀐 (종목, 날짜)만 골라내는 함수 (dry_run이면 다시 계산할 목록만 출력하고 빈 리스트 반환)
+    """
+    stale = []
+    for inputs in loaded:
+        fingerprint = build_input_fingerprint(inputs, rsi_period, rsi_periods, calculation_method)
+        reason = rsi_rebuild_reason(fingerprint, load_rsi_output(inputs['stock_code'], inputs['date']))
+        if reason:
+            stale.append(inputs)
+            if dry_run:
+                print(f"  [다시 계산 대상] {inputs['stock_code']} ({inputs['date']}): {reason}")
+    
+    date = loaded[0]['date'] if loaded else ''
+    print(f"{date} 증분 계산: 다시 계산 {len(stale)}개, 변경 없음 {len(loaded) - len(stale)}개")
+    return [] if dry_run else stale
+
+def rsi_stale_reason(stock_code, date):
+    """
+    data/<date>/rsi_data_*.json이 현재 입력(당일 봉, 전일 가격 또는 전일 RSI 상태)과 맞는지 확인하는 함수
+    (결과 파일에 기록된 계산 방식/기간을 그대로 사용해 비교)
+    
+    Returns:
+        str: 다시 계산할 이유 (최신이면 None)
+    """
+    existing_output = load_rsi_output(stock_code, date)
+    recorded = (existing_output or {}).get('calculation_settings', {}).get('inputs')
+    if not recorded:
+        return rsi_rebuild_reason(None, existing_output)
+    
+    carry_state = recorded['calculation_method'] == 'wilder_carry_forward'
+    inputs = load_rsi_inputs(stock_code, date, with_previous=not carry_state,
+                             previous_window=recorded.get('previous_window'))
+    if inputs is None:
+        return '당일 입력 없음'
+    if carry_state:
+        periods = recorded['rsi_periods'] or [recorded['rsi_period']]
+        previous_date, states_by_period = load_previous_states(date, periods, recorded['rsi_period'])
+        attach_previous_state(inputs, previous_date, states_by_period)
+    fingerprint = build_input_fingerprint(inputs, recorded['rsi_period'], recorded['rsi_periods'],
+                                          recorded['calculation_method'])
+    return rsi_rebuild_reason(fingerprint, existing_output)
+
+def save_rsi_result(inputs, rsi_values, rsi_period=14, calculation_method='exponential_moving_average',
+                    previous_data_used=None, rsi_by_period=None, errors=None):
+    """
+    계산된 RSI를 data/<date>/rsi_data_<code>_<date>.json으로 저장하고 통계를 출력하는 함수
+    
+    Args:
+        calculation_method (str): 결과 파일에 기록할 계산 방식
+        previous_data_used (bool): 전일 데이터 사용 여부 (None이면 전일자 가격 유무로 판단)
+        rsi_by_period (dict): 함께 저장할 {기간: RSI 리스트} (data의 'rsi'는 rsi_period 값)
+        errors (dict): 주어지면 실패 시 {종목코드: 오류 메시지}를 기록
+    
+    Returns:
+        dict: 저장한 RSI 데이터 (실패하면 None)
+    """
+    stock_code = inputs['stock_code']
+    date = inputs['date']
+    try:
         # 결과 데이터 생성
         result_data = []
-        for i, (timestamp, price, rsi) in enumerate(zip(timestamps, current_prices, rsi_values)):
+        for i, (timestamp, price, rsi) in enumerate(zip(inputs['timestamps'], inputs['current_prices'], rsi_values)):
             result_item = {
                 'localDateTime': timestamp,
                 'currentPrice': price,
@@ -138,23 +313,31 @@ def process_stock_data_with_previous(file_path, rsi_period=14):
             'data_count': len(result_data),
             'calculation_settings': {
                 'rsi_period': rsi_period,
-                'calculation_method': 'exponential_moving_average',
-                'previous_data_used': previous_file is not None
+                'calculation_method': calculation_method,
+                'previous_data_used': (inputs['previous_prices'] is not None
+                                       if previous_data_used is None else previous_data_used),
+                'inputs': build_input_fingerprint(inputs, rsi_period, sorted(rsi_by_period) if rsi_by_period else None,
+                                                  calculation_method)
             },
             'data': result_data
         }
+        if rsi_by_period:
+            # data 순서와 같은 기간별 RSI (시뮬레이션에서 --rsi_period로 선택)
+            output_data['rsi_periods'] = sorted(rsi_by_period)
+            output_data['rsi_by_period'] = {str(period): list(rsi_by_period[period][:len(result_data)])
+                                            for period in sorted(rsi_by_period)}
         
         # 출력 파일명 생성
         output_filename = f"rsi_data_{stock_code}_{date}.json"
         
         # 일자별 폴더 생성
-        date_folder = f"data/{date}"
-        os.makedirs(date_folder, exist_ok=True)
-        
-        output_path = os.path.join(date_folder, output_filename)
+        output_path = rsi_output_path(stock_code, date)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
+        before = folder_mtimes([output_path])
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, ensure_ascii=False, indent=4)
+        get_catalog().record_file(output_path, 'calculate_rsi_with_previous', result_data, before)
         
         print(f"RSI 계산 완료: {output_filename}")
         
@@ -172,46 +355,209 @@ def process_stock_data_with_previous(file_path, rsi_period=14):
         return output_data
         
     except Exception as e:
-        print(f"오류 발생 ({file_path}): {str(e)}")
+        print(f"오류 발생 ({stock_code} {date}): {str(e)}")
+        if errors is not None:
+            errors[stock_code] = f"RSI 결과 저장 실패: {str(e)}"
         return None
 
-def calculate_rsi(prices, period=14):
+def process_stock_bars_with_previous(stock_code, date, rsi_period=14, carry_state=False, rsi_periods=None,
+                                     incremental=False, dry_run=False):
+    """
+    전일자 데이터를 활용하여 종목/날짜의 10분봉 데이터로 RSI를 계산하고 결과를 저장
+    
+    Args:
+        stock_code (str): 종목 코드
+        date (str): 날짜 (YYYYMMDD 형식)
+        rsi_period (int): RSI 계산 기간
+        carry_state (bool): 전일 RSI 상태에서 이어서 계산할지 여부
+        rsi_periods (list): 함께 계산해 저장할 RSI 기간 리스트 (None이면 rsi_period만)
+        incremental (bool): 입력이 바뀐 경우에만 다시 계산
+        dry_run (bool): 다시 계산할 대상만 출력하고 저장하지 않음
     """
-    기본 RSI 계산 함수 (기존 코드와 동일)
+    process_date = process_date_with_state if carry_state else process_date_with_previous
+    return process_date([stock_code], date, rsi_period, rsi_periods, incremental, dry_run)[0]
+
+def _with_base_period(rsi_period, rsi_periods):
+    # 기본 기간은 항상 포함
+    return sorted(set(rsi_periods or []) | {rsi_period})
+
+def compute_rsi_batch_window(inputs_list, rsi_periods):
     """
-    if len(prices) < period + 1:
-        return [None] * len(prices)
+    calculate_rsi.py와 같이 (전일 마지막 N개 가격 + 당일 가격)으로 calculate_rsi를 계산하는 함수
+    (inputs의 previous_prices는 load_rsi_inputs(previous_window=N)으로 이미 잘라 둔 값)
     
-    # 가격 변화 계산
-    deltas = np.diff(prices)
+    Returns:
+        list: inputs_list 순서의 종목별 {기간: RSI 리스트}
+    """
+    current_rows = [inputs['current_prices'] for inputs in inputs_list]
+    previous_rows = [inputs['previous_prices'] for inputs in inputs_list]
+    rsi_by_period_list = [{} for _ in inputs_list]
+    for period in rsi_periods:
+        for rsi_by_period, rsi_values in zip(rsi_by_period_list, batch_rsi_with_warmup(current_rows, previous_rows, period)):
+            rsi_by_period[period] = rsi_values
+    return rsi_by_period_list
+
+def process_date_with_previous(stock_codes, date, rsi_period=14, rsi_periods=None, incremental=False, dry_run=False,
+                               errors=None, previous_window=None):
+    """
+    한 날짜의 여러 종목 RSI를 한 번에 계산하고 종목별 결과 파일을 저장
+    (가격을 모두 읽은 뒤 rsi_engine으로 전 종목, 전 기간을 일괄 계산)
     
-    # 상승/하락 분리
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
+    Args:
+        incremental (bool): 결과 파일에 기록된 입력과 달라진 종목만 다시 계산
+        dry_run (bool): 다시 계산할 대상만 출력하고 계산/저장하지 않음
+        errors (dict): 주어지면 실패한 종목의 {종목코드: 오류 메시지}를 기록 (건너뛴 종목은 기록하지 않음)
+        previous_window (int): 주어지면 calculate_rsi.py 방식 (전일 마지막 N개 가격으로 워밍업, 0이면 당일 가격만)으로 계산
     
-    # 초기 평균 계산
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
+    Returns:
+        list: stock_codes 순서의 저장 결과 (실패하거나 건너뛴 종목은 None)
+    """
+    calculation_method = PREVIOUS_WINDOW_METHOD if previous_window is not None else 'exponential_moving_average'
+    inputs_list = [load_rsi_inputs(stock_code, date, errors=errors, previous_window=previous_window)
+                   for stock_code in stock_codes]
+    loaded = [inputs for inputs in inputs_list if inputs]
+    if incremental or dry_run:
+        saved_periods = _with_base_period(rsi_period, rsi_periods) if rsi_periods else None
+        loaded = select_stale_inputs(loaded, rsi_period, saved_periods, calculation_method, dry_run)
+    compute = compute_rsi_batch_window if previous_window is not None else compute_rsi_batch_multi
+    rsi_by_period_list = compute(loaded, _with_base_period(rsi_period, rsi_periods))
+    rsi_by_period_map = {id(inputs): rsi_by_period for inputs, rsi_by_period in zip(loaded, rsi_by_period_list)}
     
-    rsi_values = [None] * period  # 초기 period개는 None
+    results = []
+    for inputs in inputs_list:
+        if not inputs or id(inputs) not in rsi_by_period_map:
+            results.append(None)
+            continue
+        rsi_by_period = rsi_by_period_map[id(inputs)]
+        results.append(save_rsi_result(inputs, rsi_by_period[rsi_period], rsi_period, calculation_method,
+                                       rsi_by_period=rsi_by_period if rsi_periods else None, errors=errors))
+    return results
+
+def load_previous_states(date, periods, rsi_period=14):
+    """
+    기간별 전일 종료 RSI 상태를 읽는 함수
     
-    # RSI 계산
-    for i in range(period, len(prices)):
-        # 지수이동평균 방식으로 평균 업데이트
-        avg_gain = (avg_gain * (period - 1) + gains[i-1]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i-1]) / period
-        
-        if avg_loss == 0:
-            rsi = 100
+    Returns:
+        tuple: (기본 기간 상태의 날짜, {기간: {종목코드: 상태} 또는 None})
+    """
+    previous_date = None
+    states_by_period = {}
+    for period in periods:
+        state_date, previous_states = find_previous_rsi_state(date, period)
+        states_by_period[period] = previous_states
+        if period == rsi_period:
+            previous_date = state_date
+    return previous_date, states_by_period
+
+def attach_previous_state(inputs, previous_date, states_by_period):
+    # 종목이 이어받는 기간별 상태 (입력 기록과 전일 상태 사용 여부 판단에 사용)
+    inputs['previous_date'] = previous_date
+    inputs['previous_state'] = {str(period): (states or {}).get(inputs['stock_code'])
+                                for period, states in states_by_period.items()}
+
+def process_date_with_state(stock_codes, date, rsi_period=14, rsi_periods=None, incremental=False, dry_run=False,
+                            errors=None):
+    """
+    전일 종료 RSI 상태(rsi_state_<period>.json)에서 이어서 한 날짜의 여러 종목 RSI를 계산하고
+    종목별 결과 파일과 당일 종료 상태를 저장 (전일 가격 파일은 읽지 않음, 상태는 기간별로 저장)
+    (incremental이어도 상태는 전 종목 계산해 저장하고, 결과 파일만 입력이 바뀐 종목을 다시 씀)
+    
+    Args:
+        errors (dict): 주어지면 실패한 종목의 {종목코드: 오류 메시지}를 기록 (건너뛴 종목은 기록하지 않음)
+    
+    Returns:
+        list: stock_codes 순서의 저장 결과 (실패하거나 건너뛴 종목은 None)
+    """
+    periods = _with_base_period(rsi_period, rsi_periods)
+    previous_date, states_by_period = load_previous_states(date, periods, rsi_period)
+    for period, previous_states in states_by_period.items():
+        if previous_states is None:
+            print(f"전일 RSI 상태 없음 ({date}, 기간 {period}) - 당일 데이터로 새로 시작 (rsi_state.py --backfill로 상태 체인 생성 가능)")
         else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+            print(f"전일 RSI 상태 사용 (기간 {period}, {len(previous_states)}개 종목)")
+    
+    inputs_list = [load_rsi_inputs(stock_code, date, with_previous=False, errors=errors) for stock_code in stock_codes]
+    loaded = [inputs for inputs in inputs_list if inputs]
+    for inputs in loaded:
+        attach_previous_state(inputs, previous_date, states_by_period)
+    to_save = loaded
+    if incremental or dry_run:
+        to_save = select_stale_inputs(loaded, rsi_period, periods if rsi_periods else None,
+                                      'wilder_carry_forward', dry_run)
+        if dry_run:
+            return [None] * len(stock_codes)
+    
+    loaded_codes = [inputs['stock_code'] for inputs in loaded]
+    rsi_by_period_list = [{} for _ in loaded]
+    for period in periods:
+        rsi_values_list, states = carry_forward_rsi(loaded_codes, [inputs['current_prices'] for inputs in loaded],
+                                                    states_by_period[period], period)
+        for rsi_by_period, rsi_values in zip(rsi_by_period_list, rsi_values_list):
+            rsi_by_period[period] = rsi_values
         
-        rsi_values.append(rsi)
+        # 일부 종목만 계산한 경우에도 같은 날짜의 다른 종목 상태는 유지
+        saved_states = load_rsi_state(date, period) or {}
+        for stock_code, state in states.items():
+            if stock_code in loaded_codes or stock_code not in saved_states:
+                saved_states[stock_code] = state
+        save_rsi_state(date, saved_states, period, previous_date)
+    
+    rsi_by_period_map = {id(inputs): rsi_by_period for inputs, rsi_by_period in zip(loaded, rsi_by_period_list)}
+    save_ids = {id(inputs) for inputs in to_save}
+    results = []
+    for inputs in inputs_list:
+        if not inputs or id(inputs) not in save_ids:
+            results.append(None)
+            continue
+        rsi_by_period = rsi_by_period_map[id(inputs)]
+        results.append(save_rsi_result(inputs, rsi_by_period[rsi_period], rsi_period,
+                                       calculation_method='wilder_carry_forward',
+                                       previous_data_used=inputs['previous_state'][str(rsi_period)] is not None,
+                                       rsi_by_period=rsi_by_period if rsi_periods else None, errors=errors))
+    return results
+
+def calculate_rsi(prices, period=14):
+    """
+    기본 RSI 계산 함수 (기존 코드와 동일한 결과, rsi_engine 사용)
+    """
+    return batch_rsi([prices], period)[0]
+
+def _process_chunk(stock_codes, date, rsi_period, rsi_periods, incremental):
+    return process_date_with_previous(stock_codes, date, rsi_period, rsi_periods, incremental)
+
+def process_dates_in_pool(codes_by_date, rsi_period=14, rsi_periods=None, workers=2, chunk_size=None,
+                          incremental=False):
+    """
+    날짜별 종목을 묶음(chunk)으로 나누어 프로세스 풀에서 계산하는 함수
+    (묶음마다 process_date_with_previous로 일괄 계산/저장하고 결과는 부모 프로세스에서 모음)
+    
+    Args:
+        codes_by_date (dict): {날짜: 종목 코드 리스트}
+        workers (int): 작업 프로세스 수
+        chunk_size (int): 한 작업의 종목 수 (None이면 날짜별 종목 수 / (workers * 4))
     
-    return rsi_values
+    Returns:
+        list: 저장 결과 리스트 (날짜, 종목 순서)
+    """
+    tasks = []
+    for date, stock_codes in codes_by_date.items():
+        size = chunk_size or max(1, -(-len(stock_codes) // (workers * 4)))
+        tasks.extend((stock_codes[i:i + size], date) for i in range(0, len(stock_codes), size))
+    
+    print(f"프로세스 풀 실행: 작업 프로세스 {workers}개, 작업 {len(tasks)}개")
+    chunk_results = [None] * len(tasks)
+    with create_process_pool(workers) as executor:
+        futures = {executor.submit(_process_chunk, stock_codes, date, rsi_period, rsi_periods, incremental): index
+                   for index, (stock_codes, date) in enumerate(tasks)}
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            stock_codes, date = tasks[index]
+            chunk_results[index] = [result for result in future.result() if result]
+            print(f"  [{done}/{len(tasks)}] {date}: {len(chunk_results[index])}/{len(stock_codes)}개 종목 저장")
+    return [result for results in chunk_results for result in results]
 
-def process_all_stock_data_with_previous(data_dir='data', rsi_period=14, target_date=None):
+def process_all_stock_data_with_previous(data_dir='data', rsi_period=14, target_date=None, carry_state=False,
+                                         rsi_periods=None, workers=1, incremental=False, dry_run=False):
     """
     data 디렉토리의 모든 주식 데이터 파일에 대해 전일자 데이터를 활용한 RSI 계산
     특정 날짜(target_date)가 주어지면 해당 날짜의 파일만 처리
@@ -219,6 +565,11 @@ def process_all_stock_data_with_previous(data_dir='data', rsi_period=14, target_
         data_dir (str): 데이터 디렉토리 경로
         rsi_period (int): RSI 계산 기간
         target_date (str): 처리할 날짜 (YYYYMMDD) 또는 None
+        carry_state (bool): 전일 RSI 상태에서 이어서 계산할지 여부 (날짜 순서대로 상태를 이어감)
+        rsi_periods (list): 함께 계산해 저장할 RSI 기간 리스트 (None이면 rsi_period만)
+        workers (int): 2 이상이면 종목 묶음을 프로세스 풀에서 계산
+        incremental (bool): 결과 파일에 기록된 입력(당일 봉, 전일 가격/상태, 계산 설정)과 달라진 종목만 다시 계산
+        dry_run (bool): 다시 계산할 (종목, 날짜)만 출력하고 저장하지 않음
     """
     # data 디렉토리 내의 모든 일자 폴더 찾기
     date_folders = []
@@ -232,17 +583,13 @@ def process_all_stock_data_with_previous(data_dir='data', rsi_period=14, target_
         print("처리할 일자 폴더를 찾을 수 없습니다.")
         return
     
-    # 각 일자 폴더에서 stock_data_*.json 파일들 찾기
+    # 각 일자 폴더에서 종목 찾기 (컬럼형 저장소 + stock_data_*.json 파일)
     stock_files = []
-    for folder in date_folders:
-        if target_date:
-            if os.path.basename(folder) != target_date:
-                continue
-            pattern = os.path.join(folder, f'stock_data_*_{target_date}.json')
-        else:
-            pattern = os.path.join(folder, 'stock_data_*.json')
-        files = glob.glob(pattern)
-        stock_files.extend(files)
+    for folder in sorted(date_folders):
+        date = os.path.basename(folder)
+        if target_date and date != target_date:
+            continue
+        stock_files.extend((stock_code, date) for stock_code in list_stock_codes(date, data_dir))
     
     if not stock_files:
         if target_date:
@@ -253,17 +600,41 @@ def process_all_stock_data_with_previous(data_dir='data', rsi_period=14, target_
     
     print(f"총 {len(stock_files)}개의 주식 데이터 파일을 처리합니다.")
     print(f"RSI 계산 기간: {rsi_period}")
+    if rsi_periods:
+        print(f"함께 저장할 RSI 기간: {', '.join(map(str, rsi_periods))}")
     if target_date:
         print(f"대상 날짜: {target_date}")
-    print("전일자 데이터를 활용한 RSI 계산을 시작합니다.")
+    if carry_state:
+        print("전일 RSI 상태에서 이어서 계산합니다.")
+    else:
+        print("전일자 데이터를 활용한 RSI 계산을 시작합니다.")
     print("-" * 50)
     
+    # 날짜별로 전 종목을 한 번에 계산
+    codes_by_date = {}
+    for stock_code, date in stock_files:
+        codes_by_date.setdefault(date, []).append(stock_code)
+    
+    if workers > 1 and carry_state:
+        # 상태는 전일 결과에 의존하고 날짜별 상태 파일 하나에 모이므로 순차 처리
+        print("--carry_state는 날짜 순서대로 상태를 이어가므로 --workers 없이 순차 처리합니다.")
+        workers = 1
+    if workers > 1 and dry_run:
+        workers = 1
+    
     results = []
-    for file_path in stock_files:
-        result = process_stock_data_with_previous(file_path, rsi_period)
-        if result:
-            results.append(result)
-        print()
+    if workers > 1:
+        results = process_dates_in_pool(codes_by_date, rsi_period, rsi_periods, workers, incremental=incremental)
+    else:
+        for date, stock_codes in codes_by_date.items():
+            process_date = process_date_with_state if carry_state else process_date_with_previous
+            results.extend(result for result in process_date(stock_codes, date, rsi_period, rsi_periods,
+                                                             incremental, dry_run) if result)
+            print()
+    
+    if dry_run:
+        print("dry run: 파일을 저장하지 않았습니다.")
+        return
     
     print(f"처리 완료: {len(results)}개 파일")
     
@@ -318,7 +689,8 @@ def create_summary_report(results):
     
     print(f"요약 보고서 생성: {summary_filename}")
 
-def process_specific_stock_date(stock_code, date, rsi_period=14):
+def process_specific_stock_date(stock_code, date, rsi_period=14, carry_state=False, rsi_periods=None,
+                                incremental=False, dry_run=False):
     """
     특정 종목과 날짜에 대한 RSI 계산
     
@@ -326,18 +698,16 @@ def process_specific_stock_date(stock_code, date, rsi_period=14):
         stock_code (str): 종목 코드
         date (str): 날짜 (YYYYMMDD 형식)
         rsi_period (int): RSI 계산 기간
+        carry_state (bool): 전일 RSI 상태에서 이어서 계산할지 여부
+        rsi_periods (list): 함께 계산해 저장할 RSI 기간 리스트 (None이면 rsi_period만)
+        incremental (bool): 입력이 바뀐 경우에만 다시 계산
+        dry_run (bool): 다시 계산할지 여부만 출력
     """
-    # 파일 경로 생성
-    file_path = os.path.join('data', date, f'stock_data_{stock_code}_{date}.json')
-    
-    if not os.path.exists(file_path):
-        print(f"파일을 찾을 수 없습니다: {file_path}")
-        return None
-    
     print(f"특정 종목 RSI 계산: {stock_code} ({date})")
     print("=" * 50)
     
-    return process_stock_data_with_previous(file_path, rsi_period)
+    return process_stock_bars_with_previous(stock_code, date, rsi_period, carry_state, rsi_periods,
+                                            incremental, dry_run)
 
 if __name__ == "__main__":
     import argparse
@@ -348,11 +718,22 @@ if __name__ == "__main__":
     parser.add_argument('--date', type=str, help='날짜 (YYYYMMDD 형식, 예: 20250716)')
     parser.add_argument('--period', type=int, default=14, help='RSI 계산 기간 (기본값: 14)')
     parser.add_argument('--all', action='store_true', help='모든 종목 데이터 처리')
+    parser.add_argument('--carry_state', action='store_true',
+                        help='전일 RSI 평활 상태(rsi_state_<period>.json)에서 이어서 계산 (전일 파일 재파싱 없음)')
+    parser.add_argument('--rsi_periods', type=str,
+                        help='한 번에 계산해 함께 저장할 RSI 기간 (예: 6-30 또는 6,9,14)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='--all 처리 시 사용할 프로세스 수 (기본값: 1, 순차 처리)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='결과 파일에 기록된 입력과 달라진 (종목, 날짜)만 다시 계산')
+    parser.add_argument('--dry_run', action='store_true',
+                        help='다시 계산할 (종목, 날짜)만 출력하고 저장하지 않음')
     
     args = parser.parse_args()
     
     # 기본 RSI 기간
     RSI_PERIOD = args.period
+    RSI_PERIODS = parse_periods(args.rsi_periods) if args.rsi_periods else None
     
     print("전일자 데이터를 활용한 RSI 지표 계산을 시작합니다.")
     print(f"RSI 계산 기간: {RSI_PERIOD}")
@@ -360,17 +741,25 @@ if __name__ == "__main__":
     
     if args.stock_code and args.date:
         # 특정 종목과 날짜에 대한 RSI 계산
-        process_specific_stock_date(args.stock_code, args.date, RSI_PERIOD)
+        process_specific_stock_date(args.stock_code, args.date, RSI_PERIOD, args.carry_state, RSI_PERIODS,
+                                    args.incremental, args.dry_run)
     elif args.all:
         # 모든 주식 데이터 파일 처리
         # 날짜가 지정되면 해당 날짜만 처리
-        process_all_stock_data_with_previous(rsi_period=RSI_PERIOD, target_date=args.date)
+        process_all_stock_data_with_previous(rsi_period=RSI_PERIOD, target_date=args.date, carry_state=args.carry_state,
+                                             rsi_periods=RSI_PERIODS, workers=args.workers,
+                                             incremental=args.incremental, dry_run=args.dry_run)
     else:
         print("사용법:")
         print("  특정 종목 계산: python calculate_rsi_with_previous.py --stock_code 005930 --date 20250716")
         print("  모든 종목 계산: python calculate_rsi_with_previous.py --all")
         print("  특정 날짜 전체 종목 계산: python calculate_rsi_with_previous.py --all --date 20250716")
         print("  RSI 기간 변경: python calculate_rsi_with_previous.py --stock_code 005930 --date 20250716 --period 21")
+        print("  전일 RSI 상태에서 이어서 계산: python calculate_rsi_with_previous.py --all --date 20250716 --carry_state")
+        print("  여러 RSI 기간 함께 저장: python calculate_rsi_with_previous.py --all --date 20250716 --rsi_periods 6-30")
+        print("  프로세스 4개로 계산: python calculate_rsi_with_previous.py --all --date 20250716 --workers 4")
+        print("  입력이 바뀐 종목만 다시 계산: python calculate_rsi_with_previous.py --all --incremental")
+        print("  다시 계산할 대상 확인: python calculate_rsi_with_previous.py --all --dry_run")
     
     print("\nRSI 계산이 완료되었습니다!")
     print("결과 파일은 'data' 디렉토리에 저장되었습니다.") 
\ No newline at end of file
@@ -0,0 +1,513 @@
+import os
+import json
+import argparse
+import numpy as np
+from bar_store import load_stock_bars
+from price_matrix import MATRIX_FIELDS, load_price_matrix
+from rsi_engine import compact_rows, rsi_matrix
+from trading_calendar import load_trading_calendar
+from trade_records import TradeLog
+
+# 여러 거래일 연속 백테스트 (전 종목 일괄)
+#
+# 날짜마다 현금을 초기화하고 종가에 청산(FINAL_SELL)하는 하루 단위 시뮬레이션을 N번 반복하는 대신
+#   1. 기간의 10분봉을 날짜 순서로 이어 [종목 수, 봉 수] 행렬로 읽고 (가격 행렬 → 컬럼형 저장소 → stock_data_*.json)
+#   2. RSI를 붙임
+#      - rsi_source='rsi_data' (기본): 날짜별 rsi_data_*.json의 RSI와 봉을 그대로 사용 (하루 단위 시뮬레이션과 같은 입력,
+#        파일에 없는 봉(날짜 마지막 15:30 봉 등)은 제외하고 종가도 파일의 currentPrice 사용)
+#      - rsi_source='continuous': 기간 전체를 하나의 가격 흐름으로 표준 Wilder RSI 계산 (시작일 전 거래일 봉으로 워밍업,
+#        15:30 봉 포함) - rsi_data 파일(calculate_rsi_with_previous의 전일자 결합 방식, 마지막 봉 제외)과 값/봉이 달라
+#        하루 단위 시뮬레이션과 결과가 다름
+#   3. 종목마다 봉을 왼쪽으로 모은 뒤 봉 순서로 한 번만 진행하며 모든 종목의 현금/보유 주식을 함께 갱신
+# 현금은 기간 내내 이어지고, carry_positions=False이면 매일 마지막 봉 종가에 청산(하루 단위와 같은 규칙),
+# True이면 보유 주식을 다음 거래일로 넘기고 기간 마지막 봉에만 청산
+# 체결 규칙은 simulate_rsi_trading_final('next')과 같음 (신호 봉의 다음 봉 가격으로 체결, 체결할 다음 봉이 없으면 무시)
+# → rsi_source='rsi_data', carry_positions=False이면 날짜별 simulate_rsi_trading_final과 같은 거래
+# 청산하지 않는 날의 마지막 봉 신호는 다음 거래일 첫 봉에 체결
+
+RSI_SOURCES = ('rsi_data', 'continuous')
+RSI_SOURCE_NOTES = {
+    'rsi_data': "날짜별 rsi_data 파일의 RSI/봉 사용 (하루 단위 시뮬레이션과 같은 입력)",
+    'continuous': "기간 전체 가격으로 표준 Wilder RSI 직접 계산 (15:30 봉 포함, rsi_data 파일/하루 단위 시뮬레이션과 다름)"
+}
+
+# 체결 가격 타입 → 가격 필드 ('open'/'high'/'low' 외에는 종가)
+_PRICE_FIELDS = {'open': 'open', 'high': 'high', 'low': 'low'}
+
+def _execution_field(price_type):
+    return _PRICE_FIELDS.get(price_type, 'close')
+
+def load_day_prices(stock_codes, date, fields, data_dir='data'):
+    """
+    한 날짜의 종목별 가격을 [종목 수, 봉 수] 행렬로 읽는 함수 (봉이 없는 칸은 NaN)
+    가격 행렬이 있으면 행렬에서 한 번에 가져오고, 행렬에 없는 종목만 봉 데이터를 읽음
+
+    Args:
+        fields (list): open / high / low / close
+
+    Returns:
+        tuple: (열 순서 localDateTime 리스트, {필드: 가격 행렬})
+    """
+    price_matrix = load_price_matrix(date, data_dir)
+    matrix_rows = []
+    matrix_positions = []
+    other_bars = {}
+    for position, stock_code in enumerate(stock_codes):
+        if price_matrix is not None and stock_code in price_matrix:
+            matrix_rows.append(price_matrix.row_index[stock_code])
+            matrix_positions.append(position)
+            continue
+        bars = load_stock_bars(stock_code, date, data_dir)
+        if bars:
+            other_bars[position] = bars
+
+    timestamps = set(price_matrix.timestamps) if matrix_rows else set()
+    for bars in other_bars.values():
+        timestamps.update(item['localDateTime'] for item in bars)
+    timestamps = sorted(timestamps)
+    column_of = {timestamp: column for column, timestamp in enumerate(timestamps)}
+
+    prices = {field: np.full((len(stock_codes), len(timestamps)), np.nan) for field in fields}
+    if matrix_rows:
+        columns = np.array([column_of[timestamp] for timestamp in price_matrix.timestamps], dtype=np.int64)
+        for field in fields:
+            prices[field][np.ix_(matrix_positions, columns)] = price_matrix.matrix(field)[matrix_rows]
+    for position, bars in other_bars.items():
+        columns = [column_of[item['localDateTime']] for item in bars]
+        for field in fields:
+            source_field = MATRIX_FIELDS[field]
+            prices[field][position, columns] = [np.nan if item.get(source_field) is None else item[source_field]
+                                                for item in bars]
+    return timestamps, prices
+
+def load_session_prices(stock_codes, dates, fields, data_dir='data'):
+    """
+    여러 날짜의 가격 행렬을 날짜 순서로 이어 붙이는 함수 (데이터가 없는 날짜는 건너뜀)
+
+    Returns:
+        tuple: (열 localDateTime 리스트, 열별 날짜 번호 배열, {필드: [종목 수, 전체 봉 수] 행렬}, 사용한 날짜 리스트)
+    """
+    all_timestamps = []
+    day_numbers = []
+    blocks = {field: [] for field in fields}
+    used_dates = []
+    for date in dates:
+        timestamps, prices = load_day_prices(stock_codes, date, fields, data_dir)
+        if not timestamps:
+            continue
+        all_timestamps.extend(timestamps)
+        day_numbers.extend([len(used_dates)] * len(timestamps))
+        used_dates.append(date)
+        for field in fields:
+            blocks[field].append(prices[field])
+    matrices = {field: (np.hstack(blocks[field]) if blocks[field] else np.full((len(stock_codes), 0), np.nan))
+                for field in fields}
+    return all_timestamps, np.array(day_numbers, dtype=np.int64), matrices, used_dates
+
+def load_session_rsi(stock_codes, dates, timestamps, rsi_period=14, data_dir='data'):
+    """
+    날짜별 rsi_data_*.json의 RSI/종가를 load_session_prices의 열 순서에 맞춘 행렬로 읽는 함수
+    (파일이 없는 종목/날짜와 파일에 없는 봉은 NaN → 봉에서 제외)
+
+    Args:
+        rsi_period (int): 사용할 RSI 기간 (파일의 기본 기간이 아니면 rsi_by_period에서 선택)
+
+    Returns:
+        tuple: (RSI 행렬, 종가 행렬, {종목코드: 오류 메시지}) - 행렬은 [종목 수, 열 수]
+    """
+    column_of = {timestamp: column for column, timestamp in enumerate(timestamps)}
+    rsi = np.full((len(stock_codes), len(timestamps)), np.nan)
+    close = np.full((len(stock_codes), len(timestamps)), np.nan)
+    errors = {}
+    for date in dates:
+        for position, stock_code in enumerate(stock_codes):
+            file_path = os.path.join(data_dir, date, f"rsi_data_{stock_code}_{date}.json")
+            if not os.path.exists(file_path):
+                continue
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    rsi_data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                errors.setdefault(stock_code, f"RSI 데이터 파일을 읽을 수 없습니다: {file_path} ({str(e)})")
+                continue
+            items = rsi_data['data']
+            if rsi_period is None or rsi_period == rsi_data.get('rsi_period'):
+                values = [item['rsi'] for item in items]
+            else:
+                values = rsi_data.get('rsi_by_period', {}).get(str(rsi_period))
+                if values is None:
+                    errors.setdefault(stock_code, f"RSI 기간 {rsi_period} 데이터가 없습니다: {stock_code} ({date}) "
+                                                  f"- calculate_rsi_with_previous.py --rsi_periods로 다시 계산하세요")
+                    continue
+            for item, value in zip(items, values):
+                column = column_of.get(item['localDateTime'])
+                if column is None:
+                    continue
+                close[position, column] = np.nan if item.get('currentPrice') is None else item['currentPrice']
+                rsi[position, column] = np.nan if value is None else value
+    return rsi, close, errors
+
+class ContinuousResult:
+    """
+    연속 백테스트 결과
+
+    - result(i) / iter_results() : 종목별 요약 dict (오류 종목은 None, 사유는 errors[i])
+    - equity_curve(i) : (localDateTime 리스트, 포트폴리오 가치 배열) - 기간 전체의 봉별 가치 (체결 전 기준)
+    - trades(i) : TradeLog (BUY / SELL / FINAL_SELL)
+    - timestamps / columns : 이어 붙인 열의 localDateTime, 종목별 k번째 봉의 열 번호 [종목 수, 봉 수]
+    - rsi_source : RSI 출처 ('rsi_data' / 'continuous')
+    """
+
+    def __init__(self, stock_codes, dates, timestamps, columns, equity, summaries, errors, events, rsi_source='rsi_data'):
+        self.stock_codes = list(stock_codes)
+        self.dates = dates
+        self.rsi_source = rsi_source
+        self.errors = errors
+        self.timestamps = timestamps
+        self.columns = columns
+        self._equity = equity
+        self._summaries = summaries
+        self._events = events
+        self._trade_order = None
+
+    def result(self, i):
+        return self._summaries[i]
+
+    def iter_results(self):
+        for stock_code, summary in zip(self.stock_codes, self._summaries):
+            yield stock_code, summary
+
+    def equity_curve(self, i):
+        present = ~np.isnan(self._equity[i])
+        return [self.timestamps[column] for column in self.columns[i][present]], self._equity[i][present]
+
+    def equity_matrix(self):
+        """
+        [종목 수, 종목별 봉 순서] 포트폴리오 가치 행렬 (봉이 없는 칸은 NaN)
+        """
+        return self._equity
+
+    def trades(self, i):
+        rows, bars, actions, prices, quantities, amounts, rsi, capital, shares_held = self._events
+        if self._trade_order is None:
+            order = np.lexsort((np.arange(len(rows)), bars, rows))
+            self._trade_order = (order, np.searchsorted(rows[order], np.arange(len(self.stock_codes) + 1)))
+        order, bounds = self._trade_order
+        trade_log = TradeLog()
+        for event in order[bounds[i]:bounds[i + 1]]:
+            trade_log.add(self.timestamps[self.columns[i][bars[event]]], str(actions[event]), float(prices[event]),
+                          float(quantities[event]), float(amounts[event]),
+                          None if np.isnan(rsi[event]) else float(rsi[event]),
+                          float(capital[event]), float(shares_held[event]))
+        return trade_log
+
+def continuous_backtest(stock_codes, start_date, end_date, initial_capital=10000000, rsi_oversold=30,
+                        rsi_overbought=70, carry_positions=False, rsi_period=14, trade_settings=None,
+                        data_dir='data', warmup_days=1, rsi_source='rsi_data'):
+    """
+    기간 전체를 하나의 흐름으로 여러 종목을 한 번에 백테스트하는 함수
+
+    Args:
+        stock_codes (list): 종목코드 리스트
+        start_date (str): 시작일 (YYYYMMDD)
+        end_date (str): 종료일 (YYYYMMDD)
+        initial_capital (int): 종목별 초기 자본금
+        rsi_oversold (int): 과매도 기준
+        rsi_overbought (int): 과매수 기준
+        carry_positions (bool): True면 보유 주식을 다음 거래일로 넘김 (False면 매일 종가 청산)
+        rsi_period (int): RSI 계산 기간
+        trade_settings (dict): config.json의 trade_settings (체결 시점은 'next'만 지원)
+        data_dir (str): 데이터 디렉토리
+        warmup_days (int): RSI 워밍업에 쓸 시작일 이전 거래일 수 (rsi_source='continuous'에서만 사용)
+        rsi_source (str): 'rsi_data'면 날짜별 rsi_data_*.json의 RSI/봉 사용 (하루 단위 시뮬레이션과 같은 입력),
+                          'continuous'면 기간 전체 가격으로 표준 Wilder RSI를 직접 계산 (15:30 봉 포함, 결과가 다름)
+
+    Returns:
+        ContinuousResult: 종목별 결과
+    """
+    if rsi_source not in RSI_SOURCES:
+        raise ValueError(f"RSI 출처는 {', '.join(RSI_SOURCES)} 중 하나여야 합니다: {rsi_source}")
+    trade_settings = trade_settings or {}
+    if (trade_settings.get('buy_execution_timing', 'next') != 'next'
+            or trade_settings.get('sell_execution_timing', 'next') != 'next'):
+        raise ValueError("연속 백테스트는 체결 시점 'next'만 지원합니다")
+    buy_field = _execution_field(trade_settings.get('buy_price_type', 'open'))
+    sell_field = _execution_field(trade_settings.get('sell_price_type', 'close'))
+    slippage = trade_settings.get('slippage', 0.0)
+
+    calendar = load_trading_calendar()
+    dates = calendar.trading_days_between(start_date, end_date)
+    fields = list(dict.fromkeys(['close', buy_field, sell_field]))
+    rsi_errors = {}
+
+    if rsi_source == 'rsi_data':
+        # rsi_data 파일의 RSI와 봉만 사용 (파일에 없는 봉은 모든 필드를 비워 제외, 종가는 파일의 currentPrice)
+        timestamps, day_numbers, prices, used_dates = load_session_prices(stock_codes, dates, fields, data_dir)
+        rsi, rsi_close, rsi_errors = load_session_rsi(stock_codes, used_dates, timestamps, rsi_period, data_dir)
+        in_file = ~np.isnan(rsi_close)
+        prices = {field: np.where(in_file, matrix, np.nan) for field, matrix in prices.items()}
+        prices['close'] = rsi_close
+    else:
+        warmup_dates = []
+        for _ in range(warmup_days):
+            warmup_dates.insert(0, calendar.previous_trading_day(warmup_dates[0] if warmup_dates else start_date))
+
+        timestamps, day_numbers, prices, used_dates = load_session_prices(stock_codes, warmup_dates + dates, fields,
+                                                                          data_dir)
+        warmup_used = [date for date in used_dates if date in warmup_dates]
+
+        # 워밍업 날짜까지 이어서 RSI 계산 후 워밍업 열은 제외
+        rsi = rsi_matrix(prices['close'], rsi_period)
+        start_column = int(np.searchsorted(day_numbers, len(warmup_used)))
+        timestamps = timestamps[start_column:]
+        day_numbers = day_numbers[start_column:]
+        rsi = rsi[:, start_column:]
+        prices = {field: matrix[:, start_column:] for field, matrix in prices.items()}
+        used_dates = used_dates[len(warmup_used):]
+
+    # 종목마다 봉이 있는 칸을 왼쪽으로 모음 (k번째 열 = 그 종목의 k번째 봉)
+    shape = prices['close'].shape
+    close, lengths, buy_prices, sell_prices, rsi, columns, days = compact_rows(
+        prices['close'], prices[buy_field], prices[sell_field], rsi,
+        np.broadcast_to(np.arange(shape[1]), shape), np.broadcast_to(day_numbers, shape))
+    buy_prices = buy_prices * (1 + slippage)
+    sell_prices = sell_prices * (1 - slippage)
+
+    n_codes, n_bars = close.shape
+    rows = np.arange(n_codes)
+    in_range = np.arange(n_bars)[None, :] < lengths[:, None]
+    # 스트림 마지막 봉, 날짜 마지막 봉
+    stream_end = np.zeros((n_codes, n_bars), dtype=bool)
+    stream_end[rows[lengths > 0], lengths[lengths > 0] - 1] = True
+    session_end = stream_end.copy()
+    session_end[:, :-1] |= in_range[:, 1:] & (days[:, :-1] != days[:, 1:])
+    # 체결할 다음 봉이 없는 봉과 청산하는 봉 (기간 끝, 매일 청산하면 날짜 끝)
+    blocked = stream_end if carry_positions else session_end
+    liquidate = blocked
+    sessions = np.array([len(np.unique(days[i, :length])) for i, length in enumerate(lengths)], dtype=np.int64)
+
+    capital = np.full(n_codes, float(initial_capital))
+    shares = np.zeros(n_codes)
+    error = np.zeros(n_codes, dtype=bool)
+    error_bar = np.full(n_codes, -1)
+    max_value = np.full(n_codes, -np.inf)
+    min_value = np.full(n_codes, np.inf)
+    recorded = np.zeros(n_codes, dtype=bool)
+    buy_count = np.zeros(n_codes, dtype=np.int64)
+    sell_count = np.zeros(n_codes, dtype=np.int64)
+    buy_sum = np.zeros(n_codes)
+    sell_sum = np.zeros(n_codes)
+    equity = np.full((n_codes, n_bars), np.nan)
+    events = []
+
+    def add_events(mask, signal_bar, bar, action, price, quantity, amount):
+        # 거래 기록: 체결 봉, 신호 봉 RSI, 체결 후 현금/보유 주식
+        event_rows = np.flatnonzero(mask)
+        events.append((event_rows, np.full(len(event_rows), bar), np.full(len(event_rows), action),
+                       price[event_rows], quantity[event_rows], amount[event_rows], rsi[event_rows, signal_bar],
+                       capital[event_rows], shares[event_rows]))
+
+    with np.errstate(invalid='ignore'):
+        for k in range(n_bars):
+            current = in_range[:, k]
+            value = capital + shares * close[:, k]
+            equity[:, k] = np.where(current & ~error, value, np.nan)
+
+            rsi_k = rsi[:, k]
+            active = current & ~error & ~np.isnan(rsi_k)
+            buy = active & (rsi_k < rsi_oversold) & (capital > 0)
+            sell = active & ~buy & (rsi_k > rsi_overbought) & (shares > 0)
+
+            # 신호 봉이 아닌 봉만 최대/최소 가치 기록 (simulate_rsi_trading_final과 같은 기준)
+            record = active & ~(buy | sell)
+            new_max = record & (value > max_value)
+            new_min = record & (value < min_value)
+            max_value = np.where(new_max, value, max_value)
+            min_value = np.where(new_min, value, min_value)
+            recorded |= record
+
+            if k + 1 < n_bars:
+                do_buy = buy & ~blocked[:, k]
+                do_sell = sell & ~blocked[:, k]
+                buy_price = buy_prices[:, k + 1]
+                sell_price = sell_prices[:, k + 1]
+                # 체결 가격이 없으면 해당 종목 오류 (스칼라 시뮬레이터의 TypeError와 같은 경우)
+                failed = (do_buy & np.isnan(buy_price)) | (do_sell & np.isnan(sell_price))
+                error_bar = np.where(failed, k, error_bar)
+                error |= failed
+                do_buy &= ~failed
+                do_sell &= ~failed
+
+                if do_buy.any():
+                    quantity = np.floor_divide(capital, buy_price)
+                    bought = do_buy & (quantity > 0)
+                    cost = quantity * buy_price
+                    capital = np.where(bought, capital - cost, capital)
+                    shares = np.where(bought, shares + quantity, shares)
+                    buy_count += bought
+                    buy_sum = np.where(bought, buy_sum + buy_price, buy_sum)
+                    add_events(bought, k, k + 1, 'BUY', buy_price, quantity, cost)
+                if do_sell.any():
+                    revenue = shares * sell_price
+                    sold_shares = shares
+                    capital = np.where(do_sell, capital + revenue, capital)
+                    shares = np.where(do_sell, 0.0, shares)
+                    sell_count += do_sell
+                    sell_sum = np.where(do_sell, sell_sum + sell_price, sell_sum)
+                    add_events(do_sell, k, k + 1, 'SELL', sell_price, sold_shares, revenue)
+
+            # 날짜(또는 기간) 마지막 봉 종가로 청산
+            final_sell = liquidate[:, k] & (shares > 0) & ~error
+            if final_sell.any():
+                revenue = shares * close[:, k]
+                sold_shares = shares
+                capital = np.where(final_sell, capital + revenue, capital)
+                shares = np.where(final_sell, 0.0, shares)
+                sell_count += final_sell
+                sell_sum = np.where(final_sell, sell_sum + close[:, k], sell_sum)
+                add_events(final_sell, k, k, 'FINAL_SELL', close[:, k], sold_shares, revenue)
+
+    # 기간 최고점 대비 최대 낙폭 (봉별 가치 기준)
+    running_max = np.fmax.accumulate(equity, axis=1) if n_bars else equity
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown = (equity / running_max - 1) * 100
+    max_drawdown = np.array([np.nanmin(row) if (~np.isnan(row)).any() else 0.0 for row in drawdown])
+
+    summaries = []
+    errors = []
+    for i, stock_code in enumerate(stock_codes):
+        if stock_code in rsi_errors:
+            summaries.append(None)
+            errors.append(rsi_errors[stock_code])
+            continue
+        if lengths[i] == 0:
+            summaries.append(None)
+            errors.append("기간 내 10분봉 데이터가 없습니다")
+            continue
+        if error[i]:
+            summaries.append(None)
+            errors.append(f"{timestamps[columns[i][error_bar[i] + 1]]} 체결 가격이 없습니다")
+            continue
+        final_value = float(capital[i])
+        profit = final_value - initial_capital
+        max_portfolio_value = float(max_value[i]) if recorded[i] else initial_capital
+        min_portfolio_value = float(min_value[i]) if recorded[i] else initial_capital
+        summaries.append({
+            'stock_code': stock_code,
+            'start_date': start_date,
+            'end_date': end_date,
+            'sessions': int(sessions[i]),
+            'bars': int(lengths[i]),
+            'carry_positions': carry_positions,
+            'rsi_source': rsi_source,
+            'initial_capital': initial_capital,
+            'final_value': final_value,
+            'profit': profit,
+            'profit_rate': (profit / initial_capital) * 100,
+            'rsi_oversold': rsi_oversold,
+            'rsi_overbought': rsi_overbought,
+            'total_trades': int(buy_count[i] + sell_count[i]),
+            'buy_trades': int(buy_count[i]),
+            'sell_trades': int(sell_count[i]),
+            'avg_buy_price': float(buy_sum[i] / buy_count[i]) if buy_count[i] else 0,
+            'avg_sell_price': float(sell_sum[i] / sell_count[i]) if sell_count[i] else 0,
+            'max_portfolio_value': max_portfolio_value,
+            'min_portfolio_value': min_portfolio_value,
+            'max_profit_rate': ((max_portfolio_value - initial_capital) / initial_capital) * 100,
+            'max_loss_rate': ((min_portfolio_value - initial_capital) / initial_capital) * 100,
+            'max_drawdown_rate': float(max_drawdown[i])
+        })
+        errors.append(None)
+
+    if events:
+        event_arrays = tuple(np.concatenate([event[field] for event in events]) for field in range(9))
+    else:
+        event_arrays = tuple(np.zeros(0, dtype=np.int64) for _ in range(9))
+    return ContinuousResult(stock_codes, used_dates, timestamps, columns, equity, summaries, errors, event_arrays,
+                            rsi_source)
+
+def continuous_results_path(start_date, end_date, carry_positions=False, data_dir='data', extension='json'):
+    suffix = '_carry' if carry_positions else ''
+    return os.path.join(data_dir, f"continuous_backtest_{start_date}_{end_date}{suffix}.{extension}")
+
+def save_continuous_results(result, start_date, end_date, carry_positions=False, data_dir='data', save_curves=False):
+    """
+    연속 백테스트 결과를 수익률 순으로 JSON에 저장하는 함수 (save_curves이면 봉별 가치 행렬을 .npz로 함께 저장)
+
+    Returns:
+        tuple: (결과 JSON 경로, 수익률 순 요약 리스트)
+    """
+    summaries = sorted((summary for _, summary in result.iter_results() if summary),
+                       key=lambda x: x['profit_rate'], reverse=True)
+    failed = [{'stock_code': stock_code, 'error': error}
+              for stock_code, error in zip(result.stock_codes, result.errors) if error]
+    final_results = {
+        'simulation_period': {
+            'start_date': start_date,
+            'end_date': end_date,
+            'trading_days': result.dates
+        },
+        'summary': {
+            'total_stocks': len(result.stock_codes),
+            'successful_stocks': len(summaries),
+            'failed_stocks': len(failed),
+            'carry_positions': carry_positions,
+            'rsi_source': result.rsi_source,
+            'rsi_source_note': RSI_SOURCE_NOTES[result.rsi_source]
+        },
+        'results': summaries,
+        'failed': failed
+    }
+    result_filename = continuous_results_path(start_date, end_date, carry_positions, data_dir)
+    os.makedirs(os.path.dirname(result_filename) or '.', exist_ok=True)
+    temp_path = f"{result_filename}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(final_results, f, ensure_ascii=False, indent=4)
+    os.replace(temp_path, result_filename)
+
+    if save_curves:
+        np.savez_compressed(continuous_results_path(start_date, end_date, carry_positions, data_dir, 'npz'),
+                            codes=np.array(result.stock_codes), equity=result.equity_matrix(),
+                            timestamps=np.array(result.timestamps), columns=result.columns)
+    return result_filename, summaries
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='여러 거래일 연속 RSI 백테스트 (전 종목 일괄)')
+    parser.add_argument('--start_date', type=str, required=True, help='시작일 (YYYYMMDD)')
+    parser.add_argument('--end_date', type=str, required=True, help='종료일 (YYYYMMDD)')
+    parser.add_argument('--stock_codes', type=str, help='쉼표로 구분한 종목코드 (없으면 data/data_stock_all_fixed.csv 전체)')
+    parser.add_argument('--capital', type=int, default=10000000, help='종목별 초기 자본금 (기본값: 10,000,000원)')
+    parser.add_argument('--oversold', type=int, default=30, help='RSI 과매도 기준 (기본값: 30)')
+    parser.add_argument('--overbought', type=int, default=70, help='RSI 과매수 기준 (기본값: 70)')
+    parser.add_argument('--rsi_period', type=int, default=14, help='RSI 계산 기간 (기본값: 14)')
+    parser.add_argument('--carry_positions', action='store_true', help='보유 주식을 다음 거래일로 넘김 (기본: 매일 종가 청산)')
+    parser.add_argument('--rsi_source', choices=RSI_SOURCES, default='rsi_data',
+                        help='RSI 출처 (rsi_data: 날짜별 rsi_data 파일, continuous: 기간 전체 가격으로 직접 계산, 기본값: rsi_data)')
+    parser.add_argument('--save_curves', action='store_true', help='종목별 봉 단위 포트폴리오 가치 행렬을 .npz로 저장')
+    parser.add_argument('--data_dir', default='data', help='데이터 디렉토리 (기본값: data)')
+    args = parser.parse_args()
+
+    if args.stock_codes:
+        codes = [code.strip().zfill(6) for code in args.stock_codes.split(',') if code.strip()]
+    else:
+        from get_minute10 import load_all_stock_codes
+        codes = load_all_stock_codes() or []
+
+    trade_settings = {}
+    if os.path.exists('config.json'):
+        with open('config.json', 'r', encoding='utf-8') as f:
+            trade_settings = json.load(f).get('trade_settings', {})
+
+    result = continuous_backtest(codes, args.start_date, args.end_date, args.capital, args.oversold, args.overbought,
+                                 args.carry_positions, args.rsi_period, trade_settings, args.data_dir,
+                                 rsi_source=args.rsi_source)
+    result_filename, summaries = save_continuous_results(result, args.start_date, args.end_date,
+                                                         args.carry_positions, args.data_dir, args.save_curves)
+    print(f"연속 백테스트: {args.start_date} ~ {args.end_date} (거래일 {len(result.dates)}일), "
+          f"{'보유 주식 이월' if args.carry_positions else '매일 종가 청산'}, RSI 출처: {args.rsi_source}")
+    print(f"성공 {len(summaries)}개 종목, 실패 {len(codes) - len(summaries)}개 종목")
+    print(f"{'순위':<4} {'종목코드':<8} {'수익률':<8} {'최대낙폭':<8} {'거래횟수':<8}")
+    for i, summary in enumerate(summaries[:20], 1):
+        print(f"{i:<4} {summary['stock_code']:<8} {summary['profit_rate']:<8.2f}% "
+              f"{summary['max_drawdown_rate']:<8.2f}% {summary['total_trades']:<8}회")
+    print(f"결과 저장 완료: {result_filename}")
@@ -0,0 +1,361 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import argparse
+from datetime import datetime
+
+# data 디렉토리 파일 목록(카탈로그)
+#
+# data/catalog.sqlite3
+#   files   : 데이터 파일별 (종목코드, 날짜, 종류), 경로, 크기, 수정시각, 봉 개수,
+#             첫/마지막 localDateTime, sha256, 생성 단계(producer)
+#   folders : 카탈로그와 동기화된 폴더와 그 시점의 폴더 mtime
+# 파일을 쓰는 쪽(수집/RSI 계산/파일 이동)이 쓰기 직후 트랜잭션으로 갱신하고,
+# 쓰기 전 폴더 mtime(folder_mtimes)이 기록과 같았던 폴더만 기록된 mtime을 현재 값으로 옮김
+# 읽는 쪽은 glob/os.listdir 대신 카탈로그를 조회
+# 폴더 mtime이 기록과 다르면(카탈로그를 거치지 않고 파일이 바뀐 경우) 그 폴더만 다시 훑어서 맞춤
+
+CATALOG_FILENAME = 'catalog.sqlite3'
+
+_filename_pattern = re.compile(r'^(stock_data|rsi_data)_([0-9A-Za-z]+)_(\d{8})\.json$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    stock_code TEXT NOT NULL,
+    date TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER,
+    mtime REAL,
+    bar_count INTEGER,
+    first_ts TEXT,
+    last_ts TEXT,
+    sha256 TEXT,
+    producer TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_key ON files (stock_code, date, kind);
+CREATE INDEX IF NOT EXISTS idx_files_kind_date ON files (kind, date);
+CREATE INDEX IF NOT EXISTS idx_files_folder ON files (folder);
+CREATE TABLE IF NOT EXISTS folders (
+    folder TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    synced_at TEXT
+);
+"""
+
+_INSERT_SQL = (
+    'INSERT OR REPLACE INTO files (path, folder, stock_code, date, kind, size, mtime, bar_count, '
+    'first_ts, last_ts, sha256, producer, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+)
+
+def parse_data_filename(path):
+    """
+    stock_data_<code>_<date>.json / rsi_data_<code>_<date>.json 파일명에서 (종류, 종목코드, 날짜) 추출
+
+    Returns:
+        tuple: (kind, stock_code, date) (형식이 다르면 None)
+    """
+    match = _filename_pattern.match(os.path.basename(path))
+    if not match:
+        return None
+    return match.group(1), match.group(2), match.group(3)
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def describe_file(path, items=None):
+    """
+    카탈로그에 기록할 파일 정보 (종류/종목코드/날짜, 크기, 수정시각, sha256, 봉 개수, 첫/마지막 시간)
+
+    Args:
+        path (str): 데이터 파일 경로 (stock_data_*/rsi_data_* 파일명)
+        items (list): 파일의 'data' 리스트 (None이면 파일을 읽어서 확인)
+    """
+    kind, stock_code, date = parse_data_filename(path)
+    if items is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f).get('data', [])
+    stat = os.stat(path)
+    path = os.path.normpath(path)
+    return {
+        'path': path,
+        'folder': os.path.dirname(path),
+        'stock_code': stock_code,
+        'date': date,
+        'kind': kind,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'bar_count': len(items),
+        'first_ts': items[0]['localDateTime'] if items else None,
+        'last_ts': items[-1]['localDateTime'] if items else None,
+        'sha256': file_sha256(path),
+    }
+
+def _entry_rows(entries, producer):
+    updated_at = datetime.now().isoformat(timespec='seconds')
+    return [
+        (e['path'], e['folder'], e['stock_code'], e['date'], e['kind'], e['size'], e['mtime'],
+         e['bar_count'], e['first_ts'], e['last_ts'], e['sha256'], producer, updated_at)
+        for e in entries
+    ]
+
+def _folder_mtime_ns(folder):
+    try:
+        return os.stat(folder or '.').st_mtime_ns
+    except OSError:
+        return None
+
+def folder_mtimes(paths):
+    """
+    파일을 쓰기 전에 그 파일들이 들어갈 폴더의 현재 mtime을 확인하는 함수
+    (record_files / remove_path의 before로 전달)
+
+    Returns:
+        dict: {폴더: mtime_ns} (폴더가 없으면 제외)
+    """
+    result = {}
+    for folder in {os.path.dirname(os.path.normpath(path)) for path in paths}:
+        mtime_ns = _folder_mtime_ns(folder)
+        if mtime_ns is not None:
+            result[folder] = mtime_ns
+    return result
+
+class DataCatalog:
+    """
+    SQLite 기반 data 디렉토리 카탈로그 (스레드별 연결, 여러 프로세스가 동시에 써도 WAL로 직렬화)
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _touch_folders(self, conn, folders, before):
+        # 쓰기 전 mtime이 기록과 같았던(그때까지 동기화되어 있던) 폴더만 현재 mtime으로 갱신
+        # 기록과 달랐으면 카탈로그를 거치지 않은 변경이 있으므로 그대로 두어 읽을 때 sync_folder로 맞춤
+        # (한 번도 훑지 않은 폴더나 before가 없는 폴더도 읽을 때 동기화)
+        synced_at = datetime.now().isoformat(timespec='seconds')
+        for folder in folders:
+            mtime_ns = _folder_mtime_ns(folder)
+            if mtime_ns is not None and (before or {}).get(folder) is not None:
+                conn.execute('UPDATE folders SET mtime_ns = ?, synced_at = ? WHERE folder = ? AND mtime_ns = ?',
+                             (mtime_ns, synced_at, folder, before[folder]))
+
+    def record_files(self, entries, producer, before=None):
+        """
+        여러 파일 정보를 한 트랜잭션으로 기록 (같은 경로가 있으면 덮어씀)
+
+        Args:
+            entries (list): describe_file() 결과 리스트
+            producer (str): 파일을 만든 단계 (예: get_minute10, calculate_rsi_with_previous)
+            before (dict): 파일을 쓰기 전의 folder_mtimes() 결과
+        """
+        if not entries:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(_INSERT_SQL, _entry_rows(entries, producer))
+            self._touch_folders(conn, {e['folder'] for e in entries}, before)
+
+    def record_file(self, path, producer, items=None, before=None):
+        """
+        데이터 파일 하나를 기록 (종류/종목코드/날짜는 파일명에서 추출, 형식이 다르면 무시)
+        """
+        if parse_data_filename(path) is None:
+            return
+        self.record_files([describe_file(path, items)], producer, before)
+
+    def remove_path(self, path, before=None):
+        path = os.path.normpath(path)
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM files WHERE path = ?', (path,))
+            self._touch_folders(conn, {os.path.dirname(path)}, before)
+
+    def sync_folder(self, folder, producer='scan'):
+        """
+        폴더를 한 번 훑어 카탈로그를 맞추는 함수
+        (새로 생기거나 크기/수정시각이 바뀐 파일은 다시 기록, 사라진 파일은 삭제)
+
+        Returns:
+            int: 새로 기록/삭제된 파일 수
+        """
+        folder = os.path.normpath(folder)
+        mtime_ns = _folder_mtime_ns(folder)
+        conn = self._connect()
+        known = {row['path']: (row['size'], row['mtime']) for row in
+                 conn.execute('SELECT path, size, mtime FROM files WHERE folder = ?', (folder,))}
+
+        entries = []
+        present = set()
+        for filename in (os.listdir(folder) if mtime_ns is not None else []):
+            if parse_data_filename(filename) is None:
+                continue
+            path = os.path.join(folder, filename)
+            present.add(path)
+            try:
+                stat = os.stat(path)
+                if known.get(path) == (stat.st_size, stat.st_mtime):
+                    continue
+                entries.append(describe_file(path))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"카탈로그 기록 실패: {path} ({str(e)})")
+        removed = [path for path in known if path not in present]
+
+        with conn:
+            conn.executemany(_INSERT_SQL, _entry_rows(entries, producer))
+            conn.executemany('DELETE FROM files WHERE path = ?', [(path,) for path in removed])
+            if mtime_ns is None:
+                conn.execute('DELETE FROM folders WHERE folder = ?', (folder,))
+            else:
+                conn.execute('INSERT OR REPLACE INTO folders (folder, mtime_ns, synced_at) VALUES (?, ?, ?)',
+                             (folder, mtime_ns, datetime.now().isoformat(timespec='seconds')))
+        return len(entries) + len(removed)
+
+    def ensure_folder(self, folder):
+        """
+        폴더 mtime이 카탈로그 기록과 같으면 그대로 사용하고, 다르면 sync_folder로 다시 맞춤
+        """
+        folder = os.path.normpath(folder)
+        row = self._connect().execute('SELECT mtime_ns FROM folders WHERE folder = ?', (folder,)).fetchone()
+        mtime_ns = _folder_mtime_ns(folder)
+        if row is None and mtime_ns is None:
+            return
+        if row is None or row['mtime_ns'] != mtime_ns:
+            self.sync_folder(folder)
+
+    def refresh(self, data_dir='data'):
+        """
+        data 디렉토리 바로 아래 폴더들(날짜별 data/<date>/, 종목별 data/<code>/)을 모두 ensure_folder
+        """
+        for item in os.listdir(data_dir):
+            folder = os.path.join(data_dir, item)
+            if os.path.isdir(folder):
+                self.ensure_folder(folder)
+
+    def has_path(self, path):
+        row = self._connect().execute('SELECT 1 FROM files WHERE path = ?', (os.path.normpath(path),)).fetchone()
+        return row is not None
+
+    def lookup(self, stock_code, date, kind):
+        """
+        (종목코드, 날짜, 종류)의 기록을 dict로 반환 (날짜별 폴더의 파일 우선, 없으면 None)
+        """
+        rows = self._connect().execute(
+            'SELECT * FROM files WHERE stock_code = ? AND date = ? AND kind = ?',
+            (stock_code, date, kind)).fetchall()
+        if not rows:
+            return None
+        rows.sort(key=lambda row: os.path.basename(row['folder']) != date)
+        return dict(rows[0])
+
+    def list_entries(self, kind, date=None, folder=None):
+        """
+        종류(와 날짜/폴더)별 기록 리스트 (날짜, 종목코드 순)
+        """
+        query = 'SELECT * FROM files WHERE kind = ?'
+        params = [kind]
+        if date is not None:
+            query += ' AND date = ?'
+            params.append(date)
+        if folder is not None:
+            query += ' AND folder = ?'
+            params.append(os.path.normpath(folder))
+        rows = self._connect().execute(query + ' ORDER BY date, stock_code, path', params).fetchall()
+        return [dict(row) for row in rows]
+
+    def summary(self):
+        rows = self._connect().execute(
+            'SELECT kind, COUNT(*) AS files, COUNT(DISTINCT date) AS dates, SUM(size) AS size '
+            'FROM files GROUP BY kind ORDER BY kind').fetchall()
+        return [dict(row) for row in rows]
+
+    def rebuild(self, data_dir='data'):
+        """
+        카탈로그를 비우고 data 디렉토리 아래 모든 폴더를 다시 훑어 만드는 함수
+
+        Returns:
+            int: 기록된 파일 수
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM files')
+            conn.execute('DELETE FROM folders')
+        for root, _, _ in os.walk(data_dir):
+            self.sync_folder(root, 'rebuild')
+        return conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_catalog(data_dir='data'):
+    """
+    data_dir/catalog.sqlite3 카탈로그를 반환하는 함수 (프로세스 내에서 하나를 공유)
+    """
+    db_path = os.path.join(data_dir, CATALOG_FILENAME)
+    with _catalogs_lock:
+        if db_path not in _catalogs:
+            _catalogs[db_path] = DataCatalog(db_path)
+        return _catalogs[db_path]
+
+def find_data_files(kind, date=None, data_dir='data', folder=None):
+    """
+    종류(와 날짜)에 해당하는 데이터 파일 경로 리스트를 카탈로그에서 조회
+    - folder가 있으면 그 폴더만 (예: data 디렉토리 자체)
+    - date가 있으면 data/<date>/ 폴더만
+    - date가 없으면 data 바로 아래 모든 폴더
+    """
+    catalog = get_catalog(data_dir)
+    if folder:
+        catalog.ensure_folder(folder)
+        return [entry['path'] for entry in catalog.list_entries(kind, date, folder)]
+    if date:
+        folder = os.path.join(data_dir, date)
+        catalog.ensure_folder(folder)
+        return [entry['path'] for entry in catalog.list_entries(kind, date, folder)]
+    catalog.refresh(data_dir)
+    data_root = os.path.normpath(data_dir)
+    return [entry['path'] for entry in catalog.list_entries(kind)
+            if os.path.dirname(entry['folder']) == data_root]
+
+def data_file_exists(path, data_dir='data'):
+    """
+    데이터 파일 존재 여부를 카탈로그로 확인
+    """
+    catalog = get_catalog(data_dir)
+    catalog.ensure_folder(os.path.dirname(path))
+    return catalog.has_path(path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='data 디렉토리 카탈로그 관리')
+    parser.add_argument('--rebuild', action='store_true', help='data 디렉토리를 훑어 카탈로그를 다시 생성')
+    parser.add_argument('--data_dir', default='data', help='데이터 디렉토리 (기본값: data)')
+    args = parser.parse_args()
+
+    catalog = get_catalog(args.data_dir)
+    if args.rebuild:
+        count = catalog.rebuild(args.data_dir)
+        print(f"카탈로그 재생성 완료: {count}개 파일 ({catalog.db_path})")
+    for row in catalog.summary():
+        print(f"{row['kind']}: {row['files']}개 파일, {row['dates']}개 날짜, {(row['size'] or 0) / 1024 / 1024:.1f}MB")
@@ -0,0 +1,214 @@
+import asyncio
+import argparse
+from bar_store import has_stock_bars
+from data_catalog import data_file_exists
+from get_minute10 import load_config, collect_all_stocks_async, flush_bar_store
+from calculate_rsi_with_previous import (rsi_output_path, rsi_stale_reason, load_rsi_output, PREVIOUS_WINDOW_METHOD,
+                                         process_date_with_previous, process_date_with_state)
+from calculate_rsi import PREVIOUS_WINDOW
+
+# 시뮬레이션 입력 준비 (10분봉 수집 + RSI 계산)
+#
+# get_minute10.py / calculate_rsi_with_previous.py를 종목마다 subprocess로 실행하는 대신
+# 같은 프로세스에서 한 날짜의 부족한 종목을 모아 한 번에 수집하고, RSI도 한 번의 일괄 계산으로 다시 만듦
+# 종목별 오류는 출력 로그가 아니라 수집 요약(summary['stocks'])과 RSI 계산의 errors 기록에서 가져옴
+# 결과는 종목별 dict로 반환:
+#   {"stock_code", "date", "ok", "bars": present/collected/missing,
+#    "rsi": present/created/rebuilt/failed/None, "rsi_reason", "error"}
+
+_config = None
+
+def get_pipeline_config(config_file='config.json'):
+    """
+    수집 설정을 한 번만 읽어 재사용하는 함수
+    """
+    global _config
+    if _config is None:
+        _config = load_config(config_file)
+    return _config
+
+def collect_missing_bars(stock_codes, date, config=None, max_concurrency=8):
+    """
+    10분봉 데이터가 없는 종목만 한 번에 수집하는 함수 (비동기 동시 수집)
+
+    Returns:
+        dict: {종목코드: (상태, 오류 메시지)} - 상태는 present / collected / missing
+    """
+    statuses = {}
+    missing = []
+    for stock_code in stock_codes:
+        if has_stock_bars(stock_code, date):
+            statuses[stock_code] = ('present', None)
+        else:
+            missing.append(stock_code)
+    if not missing:
+        return statuses
+
+    config = config or get_pipeline_config()
+    if not config:
+        return dict(statuses, **{stock_code: ('missing', "설정 파일을 로드할 수 없습니다") for stock_code in missing})
+
+    stock_summaries = {}
+    error = None
+    try:
+        summary = asyncio.run(collect_all_stocks_async(missing, date, date, config, max_concurrency))
+        flush_bar_store(config)
+        stock_summaries = summary['stocks']
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    for stock_code in missing:
+        if has_stock_bars(stock_code, date):
+            statuses[stock_code] = ('collected', None)
+        else:
+            stock_error = stock_summaries.get(stock_code, {}).get('error')
+            statuses[stock_code] = ('missing', error or stock_error or "10분가격 데이터를 받지 못했습니다")
+    return statuses
+
+def recorded_rsi_settings(stock_code, date, rsi_period=14):
+    """
+    기존 RSI 파일에 기록된 계산 설정 (파일을 다시 만들 때 같은 방식/기간으로 계산하기 위함)
+    입력 기록이 없거나 전일 가격 사용 개수가 기록되기 전의 calculate_rsi.py 결과(previous_data_count가 있는 파일)는
+    calculate_rsi.py 방식(전일 마지막 PREVIOUS_WINDOW개 가격, 전일 데이터를 쓰지 않은 파일은 당일 가격만)으로 봄
+
+    Returns:
+        tuple: (calculation_method, rsi_period, rsi_periods, previous_window) - 파일이 없으면 기본 설정
+    """
+    existing_output = load_rsi_output(stock_code, date)
+    if existing_output is None:
+        return 'exponential_moving_average', rsi_period, None, None
+    settings = existing_output.get('calculation_settings', {})
+    recorded = settings.get('inputs') or {}
+    rsi_periods = recorded.get('rsi_periods', existing_output.get('rsi_periods'))
+    calculation_method = recorded.get('calculation_method', settings.get('calculation_method', 'exponential_moving_average'))
+    previous_window = recorded.get('previous_window')
+    if 'previous_data_count' in settings and previous_window is None:
+        calculation_method = PREVIOUS_WINDOW_METHOD
+        previous_window = PREVIOUS_WINDOW if settings.get('used_previous_data') else 0
+    return (calculation_method, recorded.get('rsi_period', settings.get('rsi_period', rsi_period)),
+            tuple(rsi_periods) if rsi_periods else None, previous_window)
+
+def rebuild_rsi(stock_codes, date, rsi_period=14):
+    """
+    여러 종목의 RSI 파일을 일괄 계산으로 다시 만드는 함수
+    기존 파일이 있으면 기록된 계산 방식/기간(wilder_carry_forward, rsi_periods, calculate_rsi.py의 전일 가격 개수 등)을
+    그대로 사용하고, 같은 설정끼리 묶어 한 번씩 계산 (없으면 전일자 데이터를 활용한 기본 방식)
+    기록된 계산 방식을 다시 만들 수 없으면 다른 방식으로 바꾸지 않고 실패로 반환
+
+    Returns:
+        dict: {종목코드: 오류 메시지 또는 None}
+    """
+    groups = {}
+    for stock_code in stock_codes:
+        groups.setdefault(recorded_rsi_settings(stock_code, date, rsi_period), []).append(stock_code)
+
+    errors = {}
+    for (calculation_method, group_period, rsi_periods, previous_window), codes in groups.items():
+        group_errors = {}
+        periods = list(rsi_periods) if rsi_periods else None
+        try:
+            if calculation_method == 'wilder_carry_forward':
+                saved = process_date_with_state(codes, date, group_period, periods, errors=group_errors)
+            elif calculation_method == PREVIOUS_WINDOW_METHOD and previous_window is not None:
+                saved = process_date_with_previous(codes, date, group_period, periods, errors=group_errors,
+                                                   previous_window=previous_window)
+            elif calculation_method == 'exponential_moving_average' and previous_window is None:
+                saved = process_date_with_previous(codes, date, group_period, periods, errors=group_errors)
+            else:
+                saved = [None] * len(codes)
+                group_errors = {stock_code: f"기록된 RSI 계산 방식을 다시 만들 수 없습니다: {calculation_method} "
+                                            f"(전일 가격 개수: {previous_window})" for stock_code in codes}
+        except Exception as e:
+            saved = [None] * len(codes)
+            group_errors = {stock_code: f"{type(e).__name__}: {e}" for stock_code in codes}
+        for stock_code, output in zip(codes, saved):
+            if output is not None:
+                errors[stock_code] = None
+            else:
+                errors[stock_code] = group_errors.get(stock_code) or "RSI 입력 데이터를 읽을 수 없습니다"
+    return errors
+
+def prepare_simulation_inputs(stock_codes, date, config=None, max_concurrency=8, rsi_period=14):
+    """
+    시뮬레이션에 필요한 10분봉/RSI 데이터를 확인하고, 없거나 입력과 맞지 않는 것만 한 번에 준비하는 함수
+
+    Args:
+        stock_codes (list): 종목코드 리스트
+        date (str): 날짜 (YYYYMMDD)
+        config (dict): get_minute10 수집 설정 (None이면 config.json)
+        max_concurrency (int): 10분봉 동시 수집 요청 수
+        rsi_period (int): RSI 계산 기간
+
+    Returns:
+        dict: {종목코드: 준비 결과 dict}
+    """
+    results = {}
+    bar_statuses = collect_missing_bars(stock_codes, date, config, max_concurrency)
+
+    to_rebuild = []
+    for stock_code in stock_codes:
+        bars_status, error = bar_statuses[stock_code]
+        result = {
+            'stock_code': stock_code,
+            'date': date,
+            'ok': False,
+            'bars': bars_status,
+            'rsi': None,
+            'rsi_reason': None,
+            'error': error
+        }
+        results[stock_code] = result
+        if bars_status == 'missing':
+            continue
+
+        # RSI 파일이 있어도 기록된 입력과 현재 봉 데이터가 다르면 다시 생성
+        if data_file_exists(rsi_output_path(stock_code, date)):
+            result['rsi_reason'] = rsi_stale_reason(stock_code, date)
+            if not result['rsi_reason']:
+                result['rsi'] = 'present'
+                result['ok'] = True
+                continue
+        else:
+            result['rsi_reason'] = '결과 없음'
+        to_rebuild.append(stock_code)
+
+    for stock_code, error in rebuild_rsi(to_rebuild, date, rsi_period).items():
+        result = results[stock_code]
+        if error:
+            result['rsi'] = 'failed'
+            result['error'] = error
+        else:
+            result['rsi'] = 'created' if result['rsi_reason'] == '결과 없음' else 'rebuilt'
+            result['ok'] = True
+    return results
+
+def summarize_preparation(results):
+    """
+    준비 결과를 상태별 개수로 요약하는 함수
+    """
+    summary = {'total': len(results), 'ready': 0, 'failed': 0, 'bars_collected': 0, 'rsi_built': 0}
+    for result in results.values():
+        summary['ready' if result['ok'] else 'failed'] += 1
+        summary['bars_collected'] += result['bars'] == 'collected'
+        summary['rsi_built'] += result['rsi'] in ('created', 'rebuilt')
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='시뮬레이션 입력(10분봉, RSI) 일괄 준비')
+    parser.add_argument('--date', type=str, required=True, help='날짜 (YYYYMMDD)')
+    parser.add_argument('--stock_codes', type=str, help='쉼표로 구분한 종목코드 (없으면 data/data_stock_all_fixed.csv 전체)')
+    parser.add_argument('--max_concurrency', type=int, default=8, help='10분봉 동시 수집 요청 수 (기본값: 8)')
+    args = parser.parse_args()
+
+    if args.stock_codes:
+        codes = [code.strip().zfill(6) for code in args.stock_codes.split(',') if code.strip()]
+    else:
+        from get_minute10 import load_all_stock_codes
+        codes = load_all_stock_codes() or []
+
+    results = prepare_simulation_inputs(codes, args.date, max_concurrency=args.max_concurrency)
+    summary = summarize_preparation(results)
+    print(f"{args.date}: 준비 완료 {summary['ready']}개, 실패 {summary['failed']}개 "
+          f"(10분봉 수집 {summary['bars_collected']}개, RSI 생성 {summary['rsi_built']}개)")
+    for result in results.values():
+        if not result['ok']:
+            print(f"  ❌ {result['stock_code']}: {result['error']}")
@@ -0,0 +1,231 @@
+from bisect import bisect_left
+from trade_records import TradeLog, EquityCurve, SELL_ACTIONS
+
+# 신호 이벤트 기반 RSI 매매 시뮬레이션 커널
+#
+# simulate_rsi_trading_final의 봉 단위 while 루프 대신
+#   1. RSI < oversold / RSI > overbought인 봉 인덱스를 미리 구하고 (기준값별로 캐시)
+#   2. 현재 위치 이후 첫 매수/매도 후보로 바로 이동하며 이벤트(신호 봉)만 처리
+#   3. 이벤트 사이 봉의 포트폴리오 가치는 구간별 현금/보유 주식으로 한 번에 계산
+# 체결 시점이 'next'일 때 거래 기록과 지표가 스칼라 루프와 같음 (체결/청산 계산은 같은 Python 연산 사용)
+# 기준값 조합 sweep도 같은 EventSeries를 조합마다 재사용하여 이 커널로 계산
+
+def execution_price(item, open_price_map, price_type):
+    """
+    simulate_rsi_trading_final과 같은 규칙으로 봉의 체결 가격을 고르는 함수 (슬리피지 적용 전)
+    """
+    if price_type == 'open':
+        return open_price_map.get(item['localDateTime'], item.get('currentPrice'))
+    if price_type == 'close':
+        return item.get('currentPrice')
+    if price_type == 'high':
+        return item.get('highPrice', item.get('currentPrice'))
+    if price_type == 'low':
+        return item.get('lowPrice', item.get('currentPrice'))
+    return item.get('currentPrice')
+
+class EventSeries:
+    """
+    한 종목/날짜의 시뮬레이션 입력 (기준값 조합이 바뀌어도 재사용)
+
+    - valid_bars / valid_close : RSI가 있는 봉 인덱스와 그 봉의 currentPrice (포트폴리오 기록 후보)
+    - below(x) / above(x) : RSI < x / RSI > x 인 봉 인덱스 (기준값별로 한 번만 계산)
+    - not_below(x) : RSI >= x 인 (봉 인덱스, currentPrice) - 현금이 남아 있는 동안의 포트폴리오 기록 후보
+    - buy_price(t) / sell_price(t) : 신호 봉 t의 체결 가격 (다음 봉 가격에 슬리피지 적용)
+    """
+
+    def __init__(self, rsi_data, open_price_map, trade_settings=None):
+        trade_settings = trade_settings or {}
+        self.data = rsi_data['data']
+        self.stock_code = rsi_data.get('stock_code')
+        self.date = rsi_data.get('date')
+        self.open_price_map = open_price_map
+        self.buy_price_type = trade_settings.get('buy_price_type', 'open')
+        self.sell_price_type = trade_settings.get('sell_price_type', 'close')
+        self.slippage = trade_settings.get('slippage', 0.0)
+        self.n_bars = len(self.data)
+        self.valid_bars = []
+        self.valid_rsi = []
+        self.valid_close = []
+        for i, item in enumerate(self.data):
+            if item['rsi'] is not None:
+                self.valid_bars.append(i)
+                self.valid_rsi.append(item['rsi'])
+                self.valid_close.append(item['currentPrice'])
+        self._below = {}
+        self._above = {}
+        self._not_below = {}
+        self._buy_prices = [None] * self.n_bars
+
+    def below(self, threshold):
+        if threshold not in self._below:
+            self._below[threshold] = [i for i, rsi in zip(self.valid_bars, self.valid_rsi) if rsi < threshold]
+        return self._below[threshold]
+
+    def above(self, threshold):
+        if threshold not in self._above:
+            self._above[threshold] = [i for i, rsi in zip(self.valid_bars, self.valid_rsi) if rsi > threshold]
+        return self._above[threshold]
+
+    def not_below(self, threshold):
+        if threshold not in self._not_below:
+            rows = [(i, price) for i, rsi, price in zip(self.valid_bars, self.valid_rsi, self.valid_close)
+                    if rsi >= threshold]
+            self._not_below[threshold] = ([i for i, _ in rows], [price for _, price in rows])
+        return self._not_below[threshold]
+
+    def buy_price(self, t):
+        # 살 수 없는 매수 신호 봉은 기준값 조합마다 다시 확인하므로 계산한 가격을 봉별로 보관
+        price = self._buy_prices[t]
+        if price is None:
+            price = execution_price(self.data[t + 1], self.open_price_map, self.buy_price_type) * (1 + self.slippage)
+            self._buy_prices[t] = price
+        return price
+
+    def sell_price(self, t):
+        return execution_price(self.data[t + 1], self.open_price_map, self.sell_price_type) * (1 - self.slippage)
+
+def simulate_rsi_events(series, initial_capital=10000000, rsi_oversold=40, rsi_overbought=60):
+    """
+    이벤트 기반으로 RSI 매매를 시뮬레이션하는 함수 (체결 시점 'next')
+
+    Args:
+        series (EventSeries): 시뮬레이션 입력 배열
+        initial_capital (int): 초기 자본금 (원)
+        rsi_oversold (int): 과매도 기준
+        rsi_overbought (int): 과매수 기준
+
+    Returns:
+        dict: simulate_rsi_trading_final과 같은 형식의 결과 (trades는 TradeLog, portfolio_values는 EquityCurve)
+    """
+    n_bars = series.n_bars
+    data = series.data
+    buy_candidates = series.below(rsi_oversold)
+    sell_candidates = series.above(rsi_overbought)
+
+    capital = initial_capital
+    shares = 0
+    trades = TradeLog()
+    # 이벤트 사이 구간 [시작 봉, 이벤트 봉)과 그 구간의 (현금, 보유 주식) - 포트폴리오 기록용
+    segments = []
+
+    t = 0
+    while True:
+        # 다음 매도 신호 (현금이 있으면 RSI < oversold 봉은 매수 신호가 우선)
+        event = n_bars
+        is_buy = False
+        if shares > 0:
+            k = bisect_left(sell_candidates, t)
+            while k < len(sell_candidates) and capital > 0 and data[sell_candidates[k]]['rsi'] < rsi_oversold:
+                k += 1
+            if k < len(sell_candidates):
+                event = sell_candidates[k]
+        # 매도 신호 전의 매수 신호 중 실제로 1주 이상 살 수 있는 첫 봉
+        # (살 수 없는 매수 신호 봉은 거래 없이 지나가고 포트폴리오 기록에서도 빠짐)
+        if capital > 0:
+            k = bisect_left(buy_candidates, t)
+            while k < len(buy_candidates) and buy_candidates[k] < event:
+                candidate = buy_candidates[k]
+                if candidate + 1 >= n_bars:
+                    event = candidate
+                    break
+                buy_price = series.buy_price(candidate)
+                shares_to_buy = capital // buy_price
+                if shares_to_buy > 0:
+                    event = candidate
+                    is_buy = True
+                    break
+                k += 1
+        segments.append((t, event, capital, shares))
+        if event + 1 >= n_bars:
+            # 신호가 없거나 마지막 봉 신호(체결할 봉이 없음)면 중단
+            break
+
+        rsi = data[event]['rsi']
+        timestamp = data[event + 1]['localDateTime']
+        if is_buy:
+            cost = shares_to_buy * buy_price
+            capital -= cost
+            shares += shares_to_buy
+            trades.add(timestamp, 'BUY', buy_price, shares_to_buy, cost, rsi, capital, shares)
+        else:
+            sell_price = series.sell_price(event)
+            revenue = shares * sell_price
+            capital += revenue
+            trades.add(timestamp, 'SELL', sell_price, shares, revenue, rsi, capital, 0)
+            shares = 0
+        t = event + 1
+
+    # 구간별 포트폴리오 가치: 구간 안에서 현금/보유 주식이 같으므로 (보유 주식 >= 0)
+    # 최대/최소 가치는 최고가/최저가 봉의 가치, 보유 주식이 0이면 모든 봉의 가치가 현금과 같음
+    # (스칼라 루프의 max()/min()처럼 같은 값이면 먼저 나온 기록의 값을 사용)
+    max_portfolio_value = None
+    min_portfolio_value = None
+    portfolio_values = EquityCurve(data)
+    for start, end, segment_capital, segment_shares in segments:
+        # 현금이 있는 구간의 RSI < oversold 봉은 매수 신호 봉이라 기록하지 않음
+        if segment_capital > 0:
+            bars, closes = series.not_below(rsi_oversold)
+        else:
+            bars, closes = series.valid_bars, series.valid_close
+        first = bisect_left(bars, start)
+        last = bisect_left(bars, end)
+        if first == last:
+            continue
+        prices = closes[first:last]
+        if None in prices:
+            # 스칼라 루프에서는 현재가 None으로 포트폴리오 가치를 계산하다 TypeError 발생
+            raise TypeError("현재가가 없는 봉이 있어 포트폴리오 가치를 계산할 수 없습니다")
+        if segment_shares > 0:
+            high = segment_capital + (segment_shares * max(prices))
+            low = segment_capital + (segment_shares * min(prices))
+        else:
+            high = low = segment_capital + (segment_shares * prices[0])
+        if max_portfolio_value is None or high > max_portfolio_value:
+            max_portfolio_value = high
+        if min_portfolio_value is None or low < min_portfolio_value:
+            min_portfolio_value = low
+        portfolio_values.add_segment(bars[first:last], segment_capital, segment_shares)
+    if max_portfolio_value is None:
+        max_portfolio_value = min_portfolio_value = initial_capital
+
+    # 마지막 거래일 종가로 모든 주식 매도 (청산)
+    if shares > 0:
+        final_price = data[-1]['currentPrice']
+        final_revenue = shares * final_price
+        capital += final_revenue
+        trades.add(data[-1]['localDateTime'], 'FINAL_SELL', final_price, shares, final_revenue,
+                   data[-1]['rsi'], capital, 0)
+
+    # 수익률 계산
+    final_value = capital
+    profit = final_value - initial_capital
+    profit_rate = (profit / initial_capital) * 100
+
+    # 거래 통계
+    buy_trades = trades.count('BUY')
+    sell_trades = trades.count(*SELL_ACTIONS)
+    avg_buy_price = trades.mean_price('BUY')
+    avg_sell_price = trades.mean_price(*SELL_ACTIONS)
+
+    return {
+        'stock_code': series.stock_code,
+        'date': series.date,
+        'initial_capital': initial_capital,
+        'final_value': final_value,
+        'profit': profit,
+        'profit_rate': profit_rate,
+        'rsi_oversold': rsi_oversold,
+        'rsi_overbought': rsi_overbought,
+        'total_trades': len(trades),
+        'buy_trades': buy_trades,
+        'sell_trades': sell_trades,
+        'avg_buy_price': avg_buy_price,
+        'avg_sell_price': avg_sell_price,
+        'max_portfolio_value': max_portfolio_value,
+        'min_portfolio_value': min_portfolio_value,
+        'max_profit_rate': ((max_portfolio_value - initial_capital) / initial_capital) * 100,
+        'max_loss_rate': ((min_portfolio_value - initial_capital) / initial_capital) * 100,
+        'trades': trades,
+        'portfolio_values': portfolio_values
+    }
@@ -2,8 +2,24 @@ import requests
 import json
 import sys
 import os
-from datetime import datetime, timedelta
+import time
+import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from datetime import datetime
 import argparse
+import re
+import random
+import glob
+import subprocess
+import zlib
+from trading_calendar import load_trading_calendar
+from response_cache import CACHE_MODES, get_response_cache
+from bar_store import BarStoreWriter, stock_bar_count
+from price_matrix import remove_price_matrix
+from data_catalog import get_catalog, describe_file, folder_mtimes
 
 def load_config(config_file='config.json'):
     """
@@ -19,12 +35,248 @@ def load_config(config_file='config.json'):
         print(f"설정 파일 형식이 올바르지 않습니다: {e}")
         return None
 
-def get_stock_data(start_date, end_date, stock_code, config):
+def create_session(config, pool_maxsize=10):
+    """
+    config.json의 headers로 한 번만 설정되는 requests.Session을 생성하는 함수
+    (keep-alive 커넥션 풀을 재사용하여 요청마다 TCP/TLS 연결을 새로 맺지 않음)
+    """
+    session = requests.Session()
+    session.headers.update(config['headers'])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+_session = None
+
+def get_session(config):
+    """
+    프로세스 전체에서 공유하는 기본 세션을 반환하는 함수
+    """
+    global _session
+    if _session is None:
+        _session = create_session(config)
+    return _session
+
+def get_connection_stats(session):
+    """
+    세션의 커넥션 풀에서 새로 연 연결 수와 재사용된 요청 수를 집계하는 함수
+
+    Returns:
+        dict: {'requests': 전체 요청 수, 'connections_opened': 새 연결 수,
+               'connections_reused': 기존 연결 재사용 수}
+    """
+    opened = sent = 0
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            opened += pool.num_connections
+            sent += pool.num_requests
+    return {
+        'requests': sent,
+        'connections_opened': opened,
+        'connections_reused': max(sent - opened, 0)
+    }
+
+def print_connection_stats(stats):
+    """
+    get_connection_stats 결과를 수집 요약으로 출력하는 함수
+    """
+    print(f"HTTP 요청: {stats['requests']}회, "
+          f"새 연결: {stats['connections_opened']}회, "
+          f"연결 재사용: {stats['connections_reused']}회")
+
+class HostRateLimiter:
+    """
+    호스트별 요청 시작 간격을 조절하는 적응형 rate limiter (스레드 안전)
+
+    - 기본 간격은 api_settings.request_delay_seconds
+    - 429/5xx 응답을 받으면 간격을 두 배로 넓힘 (최대 api_settings.max_delay_seconds)
+    - 연속 성공이 api_settings.adaptive_success_window회 이어지면 간격을 다시 좁힘
+
+    reserve()는 다음 요청 슬롯을 예약하고 대기해야 할 시간(초)을 반환하므로
+    동기(time.sleep) / 비동기(asyncio.sleep) 호출 측 모두에서 사용할 수 있음
+    """
+
+    def __init__(self, delay_seconds, max_delay_seconds=5.0, success_window=20):
+        self.min_delay_seconds = delay_seconds
+        self.max_delay_seconds = max(max_delay_seconds, delay_seconds)
+        self.success_window = success_window
+        self.delay_seconds = delay_seconds
+        self._success_streak = 0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.delay_seconds
+            return start - now
+
+    def on_throttle(self):
+        with self._lock:
+            self._success_streak = 0
+            self.delay_seconds = min(max(self.delay_seconds * 2, 0.1), self.max_delay_seconds)
+
+    def on_success(self):
+        with self._lock:
+            self._success_streak += 1
+            if self._success_streak >= self.success_window and self.delay_seconds > self.min_delay_seconds:
+                self._success_streak = 0
+                self.delay_seconds = max(self.delay_seconds * 0.75, self.min_delay_seconds)
+
+_host_limiters = {}
+_host_limiters_lock = threading.Lock()
+
+def get_host_limiter(config):
+    """
+    API 호스트에 대한 rate limiter를 반환하는 함수 (호스트당 1개 공유)
+    """
+    api_settings = config['api_settings']
+    host = urlparse(api_settings['base_url']).netloc
+    with _host_limiters_lock:
+        if host not in _host_limiters:
+            _host_limiters[host] = HostRateLimiter(
+                api_settings.get('request_delay_seconds', 0),
+                api_settings.get('max_delay_seconds', 5.0),
+                api_settings.get('adaptive_success_window', 20))
+        return _host_limiters[host]
+
+retry_stats = {
+    'requests': 0,
+    'retries': 0,
+    'throttled': 0,
+    'server_errors': 0,
+    'network_errors': 0,
+    'failed': 0
+}
+_retry_stats_lock = threading.Lock()
+
+def _count(key):
+    with _retry_stats_lock:
+        retry_stats[key] += 1
+
+def compute_backoff(attempt, config, response=None):
+    """
+    재시도 대기 시간(초) 계산: 지수 백오프 + full jitter, backoff_max_seconds로 상한
+    429 응답에 Retry-After(초)가 있으면 그 값을 하한으로 사용
+    """
+    base = config['api_settings'].get('backoff_base_seconds', 1.0)
+    cap = config['api_settings'].get('backoff_max_seconds', 30.0)
+    wait = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            wait = max(wait, min(float(retry_after), cap))
+    return wait
+
+def print_retry_stats(config=None):
+    """
+    실행 중 누적된 요청/재시도 통계를 출력하는 함수
+    """
+    print(f"재시도 통계: 요청 {retry_stats['requests']}회, 재시도 {retry_stats['retries']}회, "
+          f"429 {retry_stats['throttled']}회, 5xx {retry_stats['server_errors']}회, "
+          f"네트워크 오류 {retry_stats['network_errors']}회, 최종 실패 {retry_stats['failed']}회")
+    if config is not None:
+        print(f"최종 요청 간격: {get_host_limiter(config).delay_seconds:.2f}초")
+
+def request_with_retry(session, url, params, headers, config, limiter):
+    """
+    429/5xx/네트워크 오류에 대해 지터가 있는 지수 백오프로 재시도하며 요청하는 함수
+    (api_settings.max_retries회까지 재시도, 그 외 4xx는 바로 실패)
+
+    Returns:
+        requests.Response: 마지막 응답 (재시도를 모두 소진한 경우 raise_for_status에서 예외 발생)
+    """
+    max_retries = config['api_settings'].get('max_retries', 3)
+    timeout = config['api_settings'].get('request_timeout_seconds', 10)
+
+    attempt = 0
+    while True:
+        time.sleep(limiter.reserve())
+        _count('requests')
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            _count('network_errors')
+            limiter.on_throttle()
+            if attempt >= max_retries:
+                raise
+            wait = compute_backoff(attempt, config)
+            print(f"    네트워크 오류로 {wait:.2f}초 후 재시도 ({attempt + 1}/{max_retries}): {e}")
+        else:
+            print(f"    HTTP 상태 코드: {response.status_code}")
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if not retryable:
+                if response.ok:
+                    limiter.on_success()
+                response.raise_for_status()
+                return response
+            _count('throttled' if response.status_code == 429 else 'server_errors')
+            limiter.on_throttle()
+            if attempt >= max_retries:
+                response.raise_for_status()
+            wait = compute_backoff(attempt, config, response)
+            print(f"    {wait:.2f}초 후 재시도 ({attempt + 1}/{max_retries})")
+        _count('retries')
+        time.sleep(wait)
+        attempt += 1
+
+def parse_stock_response(response_data, config):
+    """
+    API 응답 JSON을 {'chartDomesticList': [...]} 형태로 정리하는 함수
+    (기존 dict 구조와 직접 배열 구조를 모두 처리, 예상하지 못한 형태면 None)
+    """
+    if config['log_settings']['show_response_structure']:
+        print(f"    응답 데이터 타입: {type(response_data)}")
+        if isinstance(response_data, dict):
+            print(f"    응답 데이터 키: {list(response_data.keys())}")
+        elif isinstance(response_data, list):
+            print(f"    응답 데이터는 리스트 형태, 길이: {len(response_data)}")
+    
+    # 응답 데이터 처리
+    if isinstance(response_data, dict) and 'chartDomesticList' in response_data:
+        # 기존 구조: {'chartDomesticList': [...]}
+        data_list = response_data['chartDomesticList']
+        print(f"    chartDomesticList 개수: {len(data_list)}")
+        if data_list and config['log_settings']['show_sample_data']:
+            print(f"    첫 번째 데이터 샘플: {data_list[0]}")
+        return response_data
+    elif isinstance(response_data, list):
+        # 새로운 구조: [...] (직접 배열)
+        print(f"    직접 배열 형태, 데이터 개수: {len(response_data)}")
+        if response_data and config['log_settings']['show_sample_data']:
+            print(f"    첫 번째 데이터 샘플: {response_data[0]}")
+        # chartDomesticList 형태로 변환하여 반환
+        return {'chartDomesticList': response_data}
+    else:
+        if config['log_settings']['show_response_structure']:
+            print(f"    예상하지 못한 응답 형태: {response_data}")
+        return None
+
+def get_stock_data(start_date, end_date, stock_code, config, session=None, limiter=None):
     """
     네이버 주식 API에서 10분종가 데이터를 가져오는 함수
+    session이 없으면 프로세스 공유 세션(get_session)을 사용하며, 요청별로는 referer만 설정
+    일시적인 오류(429/5xx/네트워크)는 request_with_retry에서 재시도
+    cache_settings.mode가 replay면 API 대신 저장된 응답을, record면 받은 응답을 캐시에 저장
     """
-    headers = config['headers'].copy()
-    headers['referer'] = f'https://finance.naver.com/item/fchart.naver?code={stock_code}'
+    cache = get_response_cache(config)
+    if cache.mode == 'replay':
+        response_data = cache.load(stock_code, start_date, end_date)
+        if response_data is None:
+            print(f"    캐시된 응답 없음: {cache.path_for(stock_code, start_date, end_date)}")
+            return None
+        return parse_stock_response(response_data, config)
+
+    if session is None:
+        session = get_session(config)
+    if limiter is None:
+        limiter = get_host_limiter(config)
+    headers = {'referer': f'https://finance.naver.com/item/fchart.naver?code={stock_code}'}
 
     params = {
         'startDateTime': start_date,
@@ -40,48 +292,23 @@ def get_stock_data(start_date, end_date, stock_code, config):
         print(f"    요청 파라미터: {params}")
     
     try:
-        response = requests.get(url, params=params, headers=headers)
-        print(f"    HTTP 상태 코드: {response.status_code}")
-        
-        response.raise_for_status()
+        response = request_with_retry(session, url, params, headers, config, limiter)
         
         # 응답 데이터 로그 출력
         response_data = response.json()
         
-        if config['log_settings']['show_response_structure']:
-            print(f"    응답 데이터 타입: {type(response_data)}")
-            if isinstance(response_data, dict):
-                print(f"    응답 데이터 키: {list(response_data.keys())}")
-            elif isinstance(response_data, list):
-                print(f"    응답 데이터는 리스트 형태, 길이: {len(response_data)}")
-        
-        # 응답 데이터 처리
-        if isinstance(response_data, dict) and 'chartDomesticList' in response_data:
-            # 기존 구조: {'chartDomesticList': [...]}
-            data_list = response_data['chartDomesticList']
-            print(f"    chartDomesticList 개수: {len(data_list)}")
-            if data_list and config['log_settings']['show_sample_data']:
-                print(f"    첫 번째 데이터 샘플: {data_list[0]}")
-            return response_data
-        elif isinstance(response_data, list):
-            # 새로운 구조: [...] (직접 배열)
-            print(f"    직접 배열 형태, 데이터 개수: {len(response_data)}")
-            if response_data and config['log_settings']['show_sample_data']:
-                print(f"    첫 번째 데이터 샘플: {response_data[0]}")
-            # chartDomesticList 형태로 변환하여 반환
-            return {'chartDomesticList': response_data}
-        else:
-            if config['log_settings']['show_response_structure']:
-                print(f"    예상하지 못한 응답 형태: {response_data}")
-            return None
-        
     except requests.exceptions.RequestException as e:
+        _count('failed')
         print(f"    API 요청 중 오류 발생: {e}")
         if hasattr(e, 'response') and e.response is not None and config['log_settings']['show_error_details']:
             print(f"    오류 응답 상태 코드: {e.response.status_code}")
             print(f"    오류 응답 내용: {e.response.text}")
         return None
 
+    if cache.mode == 'record':
+        cache.save(stock_code, start_date, end_date, response_data)
+    return parse_stock_response(response_data, config)
+
 # def generate_time_slots(config):
 #     """
 #     설정에 따라 시간 슬롯을 생성하는 함수 (현재 사용하지 않음)
@@ -98,49 +325,116 @@ def get_stock_data(start_date, end_date, stock_code, config):
 #     
 #     return time_slots
 
-def collect_data_for_date_range(start_date, end_date, stock_code, config):
+def build_request_range(date_str, config):
+    """
+    설정의 시작/종료시간으로 해당 날짜의 요청 시간 범위를 생성하는 함수
+    """
+    start_datetime = f"{date_str}{config['time_settings']['start_time'].replace(':', '')}"
+    end_datetime = f"{date_str}{config['time_settings']['end_time'].replace(':', '')}"
+    return start_datetime, end_datetime
+
+def build_fetch_windows(date_list, config, range_fetch=False):
+    """
+    API 요청 단위(시간 범위)를 만드는 함수
+
+    Args:
+        date_list (list): 수집할 거래일 리스트 (YYYYMMDD)
+        config (dict): 설정
+        range_fetch (bool): True면 api_settings.range_chunk_days일씩 묶어 한 번에 요청
+
+    Returns:
+        list: (startDateTime, endDateTime, 해당 구간의 날짜 리스트) 튜플 리스트
+    """
+    if not range_fetch:
+        return [(*build_request_range(date_str, config), [date_str]) for date_str in date_list]
+
+    chunk_days = max(int(config['api_settings'].get('range_chunk_days', 10)), 1)
+    windows = []
+    for i in range(0, len(date_list), chunk_days):
+        chunk = date_list[i:i + chunk_days]
+        start_datetime, _ = build_request_range(chunk[0], config)
+        _, end_datetime = build_request_range(chunk[-1], config)
+        windows.append((start_datetime, end_datetime, chunk))
+    return windows
+
+def split_bars_by_date(bars, window_dates, config):
+    """
+    구간 요청으로 받은 봉 데이터를 localDateTime의 날짜별로 나누는 함수
+    (수집 대상 날짜와 설정된 시작/종료시간 안의 봉만 남김)
+
+    Returns:
+        dict: {날짜: 봉 리스트}
+    """
+    if not bars:
+        return {}
+    if len(window_dates) == 1:
+        return {window_dates[0]: bars}
+
+    start_hhmm = config['time_settings']['start_time'].replace(':', '')
+    end_hhmm = config['time_settings']['end_time'].replace(':', '')
+    wanted = set(window_dates)
+
+    by_date = {}
+    for bar in bars:
+        timestamp = str(bar['localDateTime'])
+        date_str, hhmm = timestamp[:8], timestamp[8:12]
+        if date_str in wanted and start_hhmm <= hhmm <= end_hhmm:
+            by_date.setdefault(date_str, []).append(bar)
+    return by_date
+
+def collect_data_for_date_range(start_date, end_date, stock_code, config, range_fetch=False,
+                                date_list=None, completed_dates=None):
     """
     지정된 날짜 범위에 대해 설정에 따라 데이터를 수집하는 함수
+    range_fetch=True면 여러 날짜를 한 번(또는 몇 번)의 구간 요청으로 받아 날짜별로 나눔
+
+    Args:
+        date_list (list): 수집할 거래일 리스트 (None이면 시작일~종료일의 전체 거래일)
+        completed_dates (list): 주어지면 API 응답을 정상적으로 받은 날짜를 추가
+                                (요청 실패 날짜는 제외되어 재실행 시 다시 수집됨)
     """
-    # 날짜 범위 생성
-    start_dt = datetime.strptime(start_date, '%Y%m%d')
-    end_dt = datetime.strptime(end_date, '%Y%m%d')
-    
     print(f"시간 설정: {config['time_settings']['start_time']} ~ {config['time_settings']['end_time']}")
-    print(f"수집 방식: 시작시간부터 종료시간까지 1회 수집")
+    if range_fetch:
+        print(f"수집 방식: {config['api_settings'].get('range_chunk_days', 10)}일 단위 구간 수집")
+    else:
+        print(f"수집 방식: 시작시간부터 종료시간까지 1회 수집")
     print(f"종목코드: {stock_code}")
     print(f"날짜 범위: {start_date} ~ {end_date}")
     print("=" * 50)
     
-    # 날짜 리스트 생성
-    date_list = []
-    current_dt = start_dt
-    while current_dt <= end_dt:
-        date_list.append(current_dt.strftime('%Y%m%d'))
-        current_dt += timedelta(days=1)
-    total_dates = len(date_list)
+    # 거래일 리스트 생성 (주말/휴장일 제외)
+    if date_list is None:
+        date_list = load_trading_calendar(config).trading_days_between(start_date, end_date)
+    if not date_list:
+        print("해당 기간에 거래일이 없습니다.")
+        return {}
+    windows = build_fetch_windows(date_list, config, range_fetch)
+    total_windows = len(windows)
 
     all_data = {}
 
-    for idx, date_str in enumerate(date_list, 1):
-        print(f"[{idx}/{total_dates}] 날짜 {date_str} 처리 중...")
-        
-        # 시작시간과 종료시간 설정
-        start_datetime = f"{date_str}{config['time_settings']['start_time'].replace(':', '')}"
-        end_datetime = f"{date_str}{config['time_settings']['end_time'].replace(':', '')}"
+    for idx, (start_datetime, end_datetime, window_dates) in enumerate(windows, 1):
+        if len(window_dates) == 1:
+            print(f"[{idx}/{total_windows}] 날짜 {window_dates[0]} 처리 중...")
+        else:
+            print(f"[{idx}/{total_windows}] 날짜 {window_dates[0]} ~ {window_dates[-1]} 처리 중...")
         
         print(f"  전체 시간대 {config['time_settings']['start_time']}~{config['time_settings']['end_time']} 데이터 수집 중...")
         print(f"    요청 시간 범위: {start_datetime} ~ {end_datetime}")
         
-        # API 호출 (1회만)
+        # API 호출 (구간당 1회)
         data = get_stock_data(start_datetime, end_datetime, stock_code, config)
+        bars = data['chartDomesticList'] if data and 'chartDomesticList' in data else []
+        if data is not None and completed_dates is not None:
+            completed_dates.extend(window_dates)
         
-        if data and 'chartDomesticList' in data and data['chartDomesticList']:
-            daily_data = data['chartDomesticList']
-            all_data[date_str] = daily_data
-            print(f"    데이터 {len(daily_data)}개 수집 완료")
-        else:
-            print(f"    데이터 없음")
+        window_data = split_bars_by_date(bars, window_dates, config)
+        for date_str in window_dates:
+            if window_data.get(date_str):
+                all_data[date_str] = window_data[date_str]
+                print(f"    {date_str} 데이터 {len(window_data[date_str])}개 수집 완료")
+            else:
+                print(f"    {date_str} 데이터 없음")
         
         print("=" * 50)
     
@@ -157,9 +451,19 @@ def save_data_by_date_and_stock(all_data, stock_code, start_date, end_date, conf
     # data 폴더 생성
     data_dir = config['output_settings']['data_directory']
     if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+        os.makedirs(data_dir, exist_ok=True)
         print(f"'{data_dir}' 폴더를 생성했습니다.")
     
+    writer = get_bar_writer(config)
+    if writer is not None:
+        # 컬럼형 저장소는 여러 종목을 모아 날짜별 part 파일로 기록 (flush_bar_store)
+        writer.add(stock_code, all_data)
+        if get_storage_mode(config) == 'columnar':
+            print(f"컬럼형 저장소 버퍼에 추가: {stock_code} ({len(all_data)}일)")
+            return
+    
+    catalog_entries = []
+    before = {}
     for date_str, day_data in all_data.items():
         filename = f"{config['output_settings']['file_prefix']}_{stock_code}_{date_str}.json"
         
@@ -184,10 +488,409 @@ def save_data_by_date_and_stock(all_data, stock_code, start_date, end_date, conf
             'data': day_data
         }
         
-        with open(filepath, 'w', encoding=config['output_settings']['encoding']) as f:
+        # 카탈로그 갱신 기준이 되는 쓰기 전 폴더 mtime (가격 행렬 삭제도 폴더 mtime을 바꿈)
+        before.update(folder_mtimes([filepath]))
+        # 임시 파일에 쓴 뒤 교체하여 중단/동시 실행 시에도 불완전한 파일이 남지 않도록 함
+        temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding=config['output_settings']['encoding']) as f:
             json.dump(save_data, f, ensure_ascii=False, indent=config['output_settings']['indent'])
+        os.replace(temp_path, filepath)
+        catalog_entries.append(describe_file(filepath, day_data))
+        # 봉 데이터가 바뀌었으므로 해당 날짜의 가격 행렬은 더 이상 사용하지 않음
+        remove_price_matrix(date_str, data_dir)
         
         print(f"파일 저장 완료: {filepath} (데이터 {len(day_data)}개)")
+    
+    # 저장한 파일들을 카탈로그에 한 번에 기록
+    get_catalog(data_dir).record_files(catalog_entries, 'get_minute10', before)
+
+STORAGE_MODES = ('json', 'columnar', 'both')
+
+_bar_writers = {}
+_bar_writers_lock = threading.Lock()
+_pending_checkpoints = []
+
+def get_storage_mode(config):
+    """
+    봉 데이터 저장 방식 (output_settings.storage)
+    - json: 종목/날짜별 stock_data_*.json (기본값)
+    - columnar: 날짜별 컬럼형 저장소 data/<date>/bars/ (bar_store.py)
+    - both: 둘 다 저장
+    """
+    storage = config['output_settings'].get('storage', 'json')
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"지원하지 않는 저장 방식입니다: {storage} ({', '.join(STORAGE_MODES)})")
+    return storage
+
+def get_bar_writer(config):
+    """
+    컬럼형 저장소 writer를 반환하는 함수 (storage가 json이면 None)
+    """
+    if get_storage_mode(config) == 'json':
+        return None
+    data_dir = config['output_settings']['data_directory']
+    with _bar_writers_lock:
+        if data_dir not in _bar_writers:
+            shard_settings = config.get('shard_settings')
+            part_prefix = None
+            if shard_settings and shard_settings['shards'] > 1:
+                part_prefix = f"shard{shard_settings['shard_index']}"
+            _bar_writers[data_dir] = BarStoreWriter(data_dir, part_prefix)
+        return _bar_writers[data_dir]
+
+def record_completion(config, stock_code, completed_dates, all_data):
+    """
+    종목 수집 완료를 체크포인트 저널에 기록하는 함수
+    storage가 columnar이면 데이터가 part 파일로 저장된 뒤(flush_bar_store)에 기록하고,
+    버퍼에 output_settings.columnar_flush_stocks개 종목이 모이면 flush
+    """
+    if get_storage_mode(config) != 'columnar':
+        append_checkpoint(get_checkpoint_path(config), stock_code, completed_dates, all_data)
+        return
+    with _bar_writers_lock:
+        _pending_checkpoints.append((stock_code, completed_dates, all_data))
+    flush_every = config['output_settings'].get('columnar_flush_stocks', 200)
+    if get_bar_writer(config).pending_stocks() >= flush_every:
+        flush_bar_store(config)
+
+def flush_bar_store(config):
+    """
+    컬럼형 저장소 버퍼를 part 파일로 저장하고 보류 중인 체크포인트를 기록하는 함수
+    """
+    writer = get_bar_writer(config)
+    if writer is None:
+        return
+    # 저널 항목을 먼저 가져온 뒤 flush하여, 기록되는 항목의 데이터는 항상 저장된 상태가 되도록 함
+    with _bar_writers_lock:
+        pending = list(_pending_checkpoints)
+        del _pending_checkpoints[:]
+    written = writer.flush()
+    # part 파일을 쓴 날짜의 가격 행렬은 더 이상 사용하지 않음 (data/<date>/bars/part-*.npz)
+    for path in written:
+        remove_price_matrix(os.path.basename(os.path.dirname(os.path.dirname(path))), writer.data_dir)
+    journal_path = get_checkpoint_path(config)
+    for stock_code, completed_dates, all_data in pending:
+        append_checkpoint(journal_path, stock_code, completed_dates, all_data)
+    if written:
+        print(f"컬럼형 저장소 저장 완료: {len(written)}개 파일")
+
+def get_checkpoint_path(config):
+    """
+    수집 체크포인트 저널 경로 (output_settings.checkpoint_file)
+    샤드 실행 시에는 샤드별 파일(<이름>.shard-<i>-of-<N>.jsonl)에 기록하여 프로세스 간 충돌을 피함
+    """
+    default_path = os.path.join(config['output_settings']['data_directory'], 'collection_journal.jsonl')
+    journal_path = config['output_settings'].get('checkpoint_file', default_path)
+    shard_settings = config.get('shard_settings')
+    if shard_settings and shard_settings['shards'] > 1:
+        stem, ext = os.path.splitext(journal_path)
+        journal_path = f"{stem}.shard-{shard_settings['shard_index']}-of-{shard_settings['shards']}{ext}"
+    return journal_path
+
+def load_checkpoint(journal_path):
+    """
+    체크포인트 저널에서 수집 완료된 (종목코드, 날짜) 집합을 읽는 함수
+    기본 저널과 샤드별 저널을 모두 읽으므로 샤드 수를 바꿔 재개해도 완료 기록이 유지됨
+    (중단 시 마지막 줄이 잘려 있을 수 있으므로 해석할 수 없는 줄은 무시)
+    """
+    completed = set()
+    stem, ext = os.path.splitext(journal_path)
+    stem = stem.split('.shard-')[0]
+    journal_files = [f"{stem}{ext}"] + sorted(glob.glob(f"{stem}.shard-*{ext}"))
+    for path in journal_files:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                completed.add((entry['stock_code'], entry['date']))
+    return completed
+
+def append_checkpoint(journal_path, stock_code, completed_dates, all_data):
+    """
+    수집/저장이 끝난 (종목코드, 날짜)를 체크포인트 저널 끝에 추가하는 함수
+    """
+    if not completed_dates:
+        return
+    journal_dir = os.path.dirname(journal_path)
+    if journal_dir:
+        os.makedirs(journal_dir, exist_ok=True)
+    with open(journal_path, 'a', encoding='utf-8') as f:
+        for date_str in completed_dates:
+            entry = {
+                'stock_code': stock_code,
+                'date': date_str,
+                'data_count': len(all_data.get(date_str, []))
+            }
+            f.write(json.dumps(entry) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+_data_count_pattern = re.compile(r'"data_count":\s*(\d+)')
+
+def read_saved_data_count(filepath):
+    """
+    저장된 stock_data 파일의 data_count를 읽는 함수
+    (data_count는 파일 앞부분에 저장되므로 전체 JSON을 파싱하지 않고 앞부분만 확인)
+
+    Returns:
+        int: data_count (파일이 없거나 읽을 수 없으면 None)
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            head = f.read(1024)
+            match = _data_count_pattern.search(head)
+            if match:
+                return int(match.group(1))
+            f.seek(0)
+            return json.load(f).get('data_count')
+    except (OSError, ValueError):
+        return None
+
+def pending_dates_for_stock(stock_code, date_list, completed, config):
+    """
+    재실행(--resume) 시 아직 수집하지 않은 날짜만 골라내는 함수
+
+    - 체크포인트 저널에 완료로 기록된 날짜 제외
+    - data/<date>/stock_data_<code>_<date>.json(또는 컬럼형 저장소)에 이미 있고
+      data_count가 output_settings.resume_min_data_count 이상인 날짜 제외
+    """
+    data_dir = config['output_settings']['data_directory']
+    prefix = config['output_settings']['file_prefix']
+    min_count = config['output_settings'].get('resume_min_data_count', 30)
+    storage = get_storage_mode(config)
+
+    pending = []
+    for date_str in date_list:
+        if (stock_code, date_str) in completed:
+            continue
+        filepath = os.path.join(data_dir, date_str, f"{prefix}_{stock_code}_{date_str}.json")
+        data_count = read_saved_data_count(filepath)
+        if data_count is None and storage != 'json':
+            data_count = stock_bar_count(stock_code, date_str, data_dir)
+        if data_count is not None and data_count >= min_count:
+            continue
+        pending.append(date_str)
+    return pending
+
+def collect_and_save_stock(stock_code, start_date, end_date, config, range_fetch=False, completed=None):
+    """
+    한 종목의 데이터를 수집/저장하고 완료된 날짜를 체크포인트 저널에 기록하는 함수
+
+    Args:
+        completed (set): --resume 시 이미 완료된 (종목코드, 날짜) 집합 (None이면 전체 수집)
+
+    Returns:
+        str: 'saved' / 'empty' / 'skipped'
+    """
+    date_list = load_trading_calendar(config).trading_days_between(start_date, end_date)
+    if completed is not None:
+        date_list = pending_dates_for_stock(stock_code, date_list, completed, config)
+        if not date_list:
+            print(f"  {stock_code} 이미 수집 완료 (건너뜀)")
+            return 'skipped'
+
+    completed_dates = []
+    all_data = collect_data_for_date_range(start_date, end_date, stock_code, config, range_fetch,
+                                           date_list, completed_dates)
+    if all_data:
+        save_data_by_date_and_stock(all_data, stock_code, start_date, end_date, config)
+    record_completion(config, stock_code, completed_dates, all_data)
+    return 'saved' if all_data else 'empty'
+
+def load_all_stock_codes(stock_list_path=os.path.join('data', 'data_stock_all_fixed.csv')):
+    """
+    전체 종목 코드 리스트를 읽는 함수 (data/data_stock_all_fixed.csv)
+
+    Returns:
+        list: 6자리 종목코드 리스트 (파일/컬럼이 없으면 None)
+    """
+    import pandas as pd
+    if not os.path.exists(stock_list_path):
+        print(f"전체 종목 코드 파일이 존재하지 않습니다: {stock_list_path}")
+        return None
+    df = pd.read_csv(stock_list_path)
+    # 'code' 또는 '종목코드' 컬럼 자동 인식
+    code_col = 'code' if 'code' in df.columns else ('종목코드' if '종목코드' in df.columns else None)
+    if code_col is None:
+        print('CSV 파일에 종목코드 컬럼이 없습니다. (code 또는 종목코드)')
+        return None
+    return df[code_col].astype(str).str.zfill(6).tolist()
+
+def partition_codes(codes, shards, shard_index):
+    """
+    종목코드를 샤드별로 결정적으로 나누는 함수 (CRC32 해시 기준)
+    CSV의 순서나 종목 추가/삭제와 관계없이 같은 종목은 항상 같은 샤드에 배정됨
+    """
+    return [code for code in codes if zlib.crc32(code.encode('utf-8')) % shards == shard_index]
+
+def apply_shard_settings(config, shards, shard_index):
+    """
+    샤드 정보를 config에 기록하고 전체 요청 예산을 샤드 수로 나누는 함수
+    (각 샤드의 요청 간격을 샤드 수만큼 늘려 전체 요청 속도가 request_delay_seconds 기준을 넘지 않게 함)
+    """
+    config['shard_settings'] = {'shards': shards, 'shard_index': shard_index}
+    if shards > 1:
+        api_settings = config['api_settings']
+        api_settings['request_delay_seconds'] = api_settings.get('request_delay_seconds', 0) * shards
+        api_settings['max_delay_seconds'] = api_settings.get('max_delay_seconds', 5.0) * shards
+    return config
+
+def launch_shards(shards, argv):
+    """
+    현재 명령을 --shards/--shard_index를 붙여 로컬 프로세스 shards개로 실행하는 함수
+    각 샤드의 출력은 logs/get_minute10_shard<i>.log에 저장
+
+    Returns:
+        int: 실패한 샤드 수
+    """
+    base_argv = []
+    skip_next = False
+    for token in argv:
+        if skip_next:
+            skip_next = False
+            continue
+        if token == '--launch_shards':
+            skip_next = True
+            continue
+        if token.startswith('--launch_shards='):
+            continue
+        base_argv.append(token)
+
+    os.makedirs('logs', exist_ok=True)
+    processes = []
+    for shard_index in range(shards):
+        cmd = [sys.executable, os.path.abspath(__file__)] + base_argv + [
+            '--shards', str(shards), '--shard_index', str(shard_index)]
+        log_path = os.path.join('logs', f'get_minute10_shard{shard_index}.log')
+        log_file = open(log_path, 'w', encoding='utf-8')
+        print(f"샤드 {shard_index + 1}/{shards} 시작: {log_path}")
+        processes.append((shard_index, subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT), log_file))
+
+    failed = 0
+    for shard_index, process, log_file in processes:
+        returncode = process.wait()
+        log_file.close()
+        if returncode == 0:
+            print(f"샤드 {shard_index + 1}/{shards} 완료")
+        else:
+            failed += 1
+            print(f"샤드 {shard_index + 1}/{shards} 실패 (종료 코드 {returncode})")
+    return failed
+
+async def fetch_stock_data_async(start_datetime, end_datetime, stock_code, config, session,
+                                 semaphore, limiter, executor):
+    """
+    동시 요청 수(semaphore)를 지키며 get_stock_data를 실행
+    (호스트별 요청 간격과 재시도는 get_stock_data 안에서 limiter로 처리)
+    """
+    async with semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, get_stock_data, start_datetime, end_datetime, stock_code, config, session, limiter)
+
+async def collect_stock_async(stock_code, windows, start_date, end_date, config, session,
+                              semaphore, limiter, executor):
+    """
+    한 종목의 요청 구간(windows)별 데이터를 비동기로 수집하고 기존 data/<date>/ 구조로 저장
+
+    Returns:
+        tuple: (종목코드, 날짜별 데이터, 응답을 정상적으로 받은 날짜 리스트, 오류 메시지 또는 None)
+    """
+    requests_for_windows = [
+        fetch_stock_data_async(start_datetime, end_datetime, stock_code, config, session,
+                               semaphore, limiter, executor)
+        for start_datetime, end_datetime, _ in windows
+    ]
+    responses = await asyncio.gather(*requests_for_windows)
+
+    all_data = {}
+    completed_dates = []
+    for (_, _, window_dates), data in zip(windows, responses):
+        if data is not None:
+            completed_dates.extend(window_dates)
+        bars = data['chartDomesticList'] if data and 'chartDomesticList' in data else []
+        for date_str, day_data in split_bars_by_date(bars, window_dates, config).items():
+            if day_data:
+                all_data[date_str] = day_data
+
+    error = None
+    failed_windows = sum(1 for data in responses if data is None)
+    if failed_windows:
+        error = f"10분가격 API 응답을 받지 못했습니다 ({failed_windows}/{len(windows)}개 구간)"
+    if all_data:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                executor, save_data_by_date_and_stock, all_data, stock_code, start_date, end_date, config)
+        except Exception as e:
+            # 저장하지 못한 날짜는 완료로 기록하지 않음
+            print(f"  {stock_code} 저장 실패: {e}")
+            return stock_code, {}, [], f"10분가격 데이터 저장 실패: {e}"
+    return stock_code, all_data, completed_dates, error
+
+async def collect_all_stocks_async(codes, start_date, end_date, config, max_concurrency=8, range_fetch=False,
+                                   completed=None):
+    """
+    여러 종목의 데이터를 asyncio로 동시에 수집하는 함수
+
+    - 동시 요청 수는 max_concurrency로 제한
+    - 하나의 requests.Session(커넥션 풀)을 모든 요청이 공유
+    - api_settings.request_delay_seconds 간격으로 호스트별 요청 시작을 제한
+    - completed(--resume)가 주어지면 이미 수집된 (종목, 날짜)는 건너뜀
+
+    Returns:
+        dict: 수집 요약 (종목 수, 데이터 있는/없는/건너뛴 종목 수, 커넥션 통계, 소요 시간)
+              stocks에는 종목별 {'status': collected/empty/failed/skipped, 'dates': 수집한 날짜 수, 'error'}
+    """
+    date_list = load_trading_calendar(config).trading_days_between(start_date, end_date)
+    limiter = get_host_limiter(config)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    session = create_session(config, pool_maxsize=max_concurrency)
+
+    started = time.monotonic()
+    summary = {'total_stocks': len(codes), 'stocks_with_data': 0, 'stocks_without_data': 0,
+               'stocks_skipped': 0, 'stocks': {}}
+
+    with session, ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        tasks = []
+        for code in codes:
+            stock_dates = date_list
+            if completed is not None:
+                stock_dates = pending_dates_for_stock(code, date_list, completed, config)
+                if not stock_dates:
+                    summary['stocks_skipped'] += 1
+                    summary['stocks'][code] = {'status': 'skipped', 'dates': 0, 'error': None}
+                    continue
+            windows = build_fetch_windows(stock_dates, config, range_fetch)
+            tasks.append(asyncio.ensure_future(collect_stock_async(code, windows, start_date, end_date, config,
+                                                                   session, semaphore, limiter, executor)))
+        if summary['stocks_skipped']:
+            print(f"이미 수집 완료된 {summary['stocks_skipped']}개 종목은 건너뜁니다.")
+
+        for done_count, task in enumerate(asyncio.as_completed(tasks), 1):
+            stock_code, all_data, completed_dates, error = await task
+            record_completion(config, stock_code, completed_dates, all_data)
+            date_count = len(all_data)
+            if date_count:
+                summary['stocks_with_data'] += 1
+            else:
+                summary['stocks_without_data'] += 1
+                print(f"  {stock_code} 데이터 없음")
+            status = 'failed' if error and not date_count else ('collected' if date_count else 'empty')
+            summary['stocks'][stock_code] = {'status': status, 'dates': date_count, 'error': error}
+            if config['log_settings'].get('show_progress', True):
+                print(f"[{done_count}/{len(tasks)}] 종목코드 {stock_code} 완료 ({date_count}일)")
+
+        flush_bar_store(config)
+        summary['connection_stats'] = get_connection_stats(session)
+
+    summary['elapsed_seconds'] = time.monotonic() - started
+    return summary
 
 def main():
     parser = argparse.ArgumentParser(description='네이버 주식 10분종가 데이터 수집')
@@ -196,6 +899,17 @@ def main():
     parser.add_argument('stock_code', nargs='?', help='종목코드 (예: 005930)')
     parser.add_argument('--all_stock', action='store_true', help='전체 종목 데이터 수집')
     parser.add_argument('--config', default='config.json', help='설정 파일 경로 (기본값: config.json)')
+    parser.add_argument('--async_mode', action='store_true', help='asyncio 기반 동시 수집 (--all_stock과 함께 사용)')
+    parser.add_argument('--max_concurrency', type=int, default=8, help='비동기 수집 시 최대 동시 요청 수 (기본값: 8)')
+    parser.add_argument('--range_fetch', action='store_true', help='여러 날짜를 구간 단위로 한 번에 요청 (api_settings.range_chunk_days)')
+    parser.add_argument('--resume', action='store_true', help='체크포인트 저널/기존 파일 기준으로 이미 수집된 (종목, 날짜) 건너뜀')
+    parser.add_argument('--shards', type=int, default=1, help='전체 종목을 나눌 샤드 수 (--all_stock과 함께 사용)')
+    parser.add_argument('--shard_index', '--shard-index', dest='shard_index', type=int, default=0,
+                        help='이 프로세스가 처리할 샤드 번호 (0부터 시작)')
+    parser.add_argument('--launch_shards', type=int, default=0, help='로컬에서 N개 샤드 프로세스를 실행')
+    parser.add_argument('--cache_mode', choices=CACHE_MODES, help='API 응답 캐시 모드 (기본값: cache_settings.mode)')
+    parser.add_argument('--cache_dir', help='API 응답 캐시 디렉토리 (기본값: cache_settings.directory)')
+    parser.add_argument('--storage', choices=STORAGE_MODES, help='봉 데이터 저장 방식 (기본값: output_settings.storage)')
     
     args = parser.parse_args()
     
@@ -205,6 +919,16 @@ def main():
         print("설정 파일을 로드할 수 없어 프로그램을 종료합니다.")
         return
     
+    # 명령행으로 지정한 캐시 설정 반영
+    cache_settings = config.setdefault('cache_settings', {})
+    if args.cache_mode:
+        cache_settings['mode'] = args.cache_mode
+    if args.cache_dir:
+        cache_settings['directory'] = args.cache_dir
+    
+    if args.storage:
+        config['output_settings']['storage'] = args.storage
+    
     # 입력값 검증
     try:
         datetime.strptime(args.start_date, '%Y%m%d')
@@ -213,28 +937,57 @@ def main():
         print("날짜 형식이 올바르지 않습니다. YYYYMMDD 형식으로 입력해주세요.")
         return
     
+    if args.launch_shards > 1:
+        if not args.all_stock:
+            print("--launch_shards는 --all_stock과 함께 사용하세요.")
+            return
+        failed = launch_shards(args.launch_shards, sys.argv[1:])
+        print(f"샤드 수집 완료: 성공 {args.launch_shards - failed}개, 실패 {failed}개")
+        if failed:
+            sys.exit(1)
+        return
+    
+    if not 0 <= args.shard_index < max(args.shards, 1):
+        print(f"샤드 번호가 올바르지 않습니다: {args.shard_index} (샤드 수 {args.shards})")
+        return
+    apply_shard_settings(config, max(args.shards, 1), args.shard_index)
+    
     if args.all_stock:
         # 전체 종목 코드 읽기 (data/data_stock_all_fixed.csv)
-        import pandas as pd
-        stock_list_path = os.path.join('data', 'data_stock_all_fixed.csv')
-        if not os.path.exists(stock_list_path):
-            print(f"전체 종목 코드 파일이 존재하지 않습니다: {stock_list_path}")
-            return
-        df = pd.read_csv(stock_list_path)
-        # 'code' 또는 '종목코드' 컬럼 자동 인식
-        code_col = 'code' if 'code' in df.columns else ('종목코드' if '종목코드' in df.columns else None)
-        if code_col is None:
-            print('CSV 파일에 종목코드 컬럼이 없습니다. (code 또는 종목코드)')
+        codes = load_all_stock_codes()
+        if codes is None:
             return
-        codes = df[code_col].astype(str).str.zfill(6)
+        if args.shards > 1:
+            codes = partition_codes(codes, args.shards, args.shard_index)
+            print(f"샤드 {args.shard_index + 1}/{args.shards}: {len(codes)}개 종목 담당")
         print(f"전체 {len(codes)}개 종목 데이터 수집 시작...")
+        completed = None
+        if args.resume:
+            completed = load_checkpoint(get_checkpoint_path(config))
+            print(f"재개 모드: 체크포인트 저널에 완료 기록 {len(completed)}건")
+        if args.async_mode:
+            print(f"비동기 수집 모드: 최대 동시 요청 {args.max_concurrency}개")
+            summary = asyncio.run(collect_all_stocks_async(
+                codes, args.start_date, args.end_date, config, args.max_concurrency, args.range_fetch,
+                completed))
+            print(f"데이터 있는 종목: {summary['stocks_with_data']}개, "
+                  f"데이터 없는 종목: {summary['stocks_without_data']}개, "
+                  f"건너뛴 종목: {summary['stocks_skipped']}개, "
+                  f"소요 시간: {summary['elapsed_seconds']:.1f}초")
+            print_connection_stats(summary['connection_stats'])
+            print_retry_stats(config)
+            get_response_cache(config).print_stats()
+            print("전체 종목 데이터 수집이 완료되었습니다.")
+            return
         for idx, code in enumerate(codes, 1):
             print(f"[{idx}/{len(codes)}] 종목코드: {code}")
-            all_data = collect_data_for_date_range(args.start_date, args.end_date, code, config)
-            if all_data:
-                save_data_by_date_and_stock(all_data, code, args.start_date, args.end_date, config)
-            else:
+            status = collect_and_save_stock(code, args.start_date, args.end_date, config, args.range_fetch, completed)
+            if status == 'empty':
                 print(f"  {code} 데이터 없음")
+        flush_bar_store(config)
+        print_connection_stats(get_connection_stats(get_session(config)))
+        print_retry_stats(config)
+        get_response_cache(config).print_stats()
         print("전체 종목 데이터 수집이 완료되었습니다.")
     else:
         if not args.stock_code:
@@ -245,14 +998,20 @@ def main():
         print(f"종료일: {args.end_date}")
         print(f"설정 파일: {args.config}")
         print("데이터 수집을 시작합니다...")
-        # 데이터 수집
-        all_data = collect_data_for_date_range(args.start_date, args.end_date, args.stock_code, config)
-        if all_data:
-            # 데이터를 일별, 종목별로 저장
-            save_data_by_date_and_stock(all_data, args.stock_code, args.start_date, args.end_date, config)
+        completed = load_checkpoint(get_checkpoint_path(config)) if args.resume else None
+        # 데이터 수집 및 일별, 종목별 저장
+        status = collect_and_save_stock(args.stock_code, args.start_date, args.end_date, config,
+                                        args.range_fetch, completed)
+        flush_bar_store(config)
+        if status == 'saved':
             print("데이터 수집 및 저장이 완료되었습니다.")
+        elif status == 'skipped':
+            print("이미 수집이 완료된 종목입니다.")
         else:
             print("수집된 데이터가 없습니다.")
+        print_connection_stats(get_connection_stats(get_session(config)))
+        print_retry_stats(config)
+        get_response_cache(config).print_stats()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,236 @@
+import json
+import os
+import argparse
+from collections import OrderedDict
+import numpy as np
+from price_matrix import build_price_matrix, load_price_matrix, matrix_dir
+from rsi_engine import compact_rows, expand_rows, rsi_matrix
+
+# 날짜별 전 종목 기술적 지표 일괄 계산
+#
+# 가격 행렬(price_matrix.py)을 한 번 열어 open/high/low/close/volume [종목 수, 봉 수]를 공유하고
+# 지표마다 시간축으로만 반복하며 전 종목을 한 번에 계산
+# 결과는 같은 data/<date>/matrix/ 폴더에 <출력 이름>.npy (float64 [n_stocks, n_bars], 값이 없으면 NaN)로 저장하고
+# meta.json의 "indicators"에 출력 이름별 지표/파라미터를 기록
+# (PriceMatrix.matrix('macd'), PriceMatrix.stock_series('005930', 'vwap')처럼 가격과 같은 방식으로 읽음)
+#
+# 봉이 없는 칸(NaN)은 종목별로 유효한 봉만 앞으로 모아 계산한 뒤 원래 열 위치로 되돌림 (rsi_engine.compact_rows / expand_rows)
+# (지표는 현재와 이전 봉만 사용하므로 유효 길이 뒤에 남는 칸의 값은 결과에 쓰이지 않음)
+# (거래정지 구간을 건너뛰어 이어진 봉처럼 계산, calculate_rsi_with_previous.calculate_rsi와 같은 방식)
+
+def _ema(values, span):
+    # 첫 값에서 시작하는 지수이동평균 (pandas ewm(span, adjust=False)와 같은 방식)
+    alpha = 2 / (span + 1)
+    result = np.full(values.shape, np.nan)
+    if values.shape[1]:
+        result[:, 0] = values[:, 0]
+    for t in range(1, values.shape[1]):
+        result[:, t] = alpha * values[:, t] + (1 - alpha) * result[:, t - 1]
+    return result
+
+def _rolling(values, window, reducer):
+    # 길이 window 구간 통계 (구간에 NaN이 있으면 NaN)
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=1)
+        result[:, window - 1:] = reducer(windows, axis=-1)
+    return result
+
+def indicator_rsi(fields, period=14):
+    """
+    RSI (당일 봉만으로 시작하는 값, calculate_rsi_with_previous.calculate_rsi와 같음)
+    전일 가격으로 워밍업하지 않으므로 calculate_rsi.py / rsi_data_*.json의 RSI와는 앞부분 값이 다름
+    """
+    return {f'rsi_{period}': rsi_matrix(fields['close'], period)}
+
+def indicator_stoch_rsi(fields, period=14, window=14):
+    """
+    Stochastic RSI = (RSI - 구간 최저 RSI) / (구간 최고 RSI - 구간 최저 RSI) * 100
+    (구간 내 RSI가 모두 같으면 NaN)
+    """
+    rsi = rsi_matrix(fields['close'], period)
+    lowest = _rolling(rsi, window, np.min)
+    highest = _rolling(rsi, window, np.max)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch = np.where(highest > lowest, (rsi - lowest) / (highest - lowest) * 100, np.nan)
+    return {f'stoch_rsi_{period}_{window}': stoch}
+
+def indicator_macd(fields, fast=12, slow=26, signal=9):
+    """
+    MACD = EMA(fast) - EMA(slow), 시그널 = EMA(MACD, signal), 히스토그램 = MACD - 시그널
+    """
+    close = fields['close']
+    macd = _ema(close, fast) - _ema(close, slow)
+    macd_signal = _ema(macd, signal)
+    return {'macd': macd, 'macd_signal': macd_signal, 'macd_hist': macd - macd_signal}
+
+def indicator_bollinger(fields, window=20, num_std=2):
+    """
+    볼린저 밴드 %B = (종가 - 하단) / (상단 - 하단) (표준편차는 모표준편차, 밴드 폭이 0이면 NaN)
+    """
+    close = fields['close']
+    middle = _rolling(close, window, np.mean)
+    std = _rolling(close, window, np.std)
+    lower = middle - num_std * std
+    upper = middle + num_std * std
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_b = np.where(upper > lower, (close - lower) / (upper - lower), np.nan)
+    return {f'bb_pctb_{window}': percent_b}
+
+def indicator_vwap(fields):
+    """
+    당일 누적 VWAP = Σ(대표가격 × 거래량) / Σ거래량 (대표가격 = (고가 + 저가 + 종가) / 3)
+    (accumulatedTradingVolume은 봉별 거래량, 누적 거래량이 0이면 대표가격)
+    """
+    typical = (fields['high'] + fields['low'] + fields['close']) / 3
+    volume = np.nan_to_num(fields['volume'], nan=0.0)
+    cumulative_value = np.cumsum(np.nan_to_num(typical * volume, nan=0.0), axis=1)
+    cumulative_volume = np.cumsum(volume, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = np.where(cumulative_volume > 0, cumulative_value / cumulative_volume, typical)
+    return {'vwap': np.where(np.isnan(fields['close']), np.nan, vwap)}
+
+def indicator_atr(fields, period=14):
+    """
+    ATR (Wilder): TR = max(고가 - 저가, |고가 - 전봉 종가|, |저가 - 전봉 종가|)의 처음 period개 평균으로 시작해
+    atr = (atr * (period - 1) + TR) / period로 갱신 (첫 봉의 TR은 고가 - 저가)
+    """
+    high, low, close = fields['high'], fields['low'], fields['close']
+    previous_close = np.concatenate([np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+    atr = np.full(close.shape, np.nan)
+    if close.shape[1] < period:
+        return {f'atr_{period}': atr}
+    current = np.mean(true_range[:, :period], axis=1)
+    atr[:, period - 1] = current
+    for t in range(period, close.shape[1]):
+        current = (current * (period - 1) + true_range[:, t]) / period
+        atr[:, t] = current
+    return {f'atr_{period}': atr}
+
+INDICATORS = OrderedDict([
+    ('rsi', (indicator_rsi, {'period': 14})),
+    ('stoch_rsi', (indicator_stoch_rsi, {'period': 14, 'window': 14})),
+    ('macd', (indicator_macd, {'fast': 12, 'slow': 26, 'signal': 9})),
+    ('bollinger', (indicator_bollinger, {'window': 20, 'num_std': 2})),
+    ('vwap', (indicator_vwap, {})),
+    ('atr', (indicator_atr, {'period': 14})),
+])
+
+def compute_indicators(price_matrix, names=None, params=None):
+    """
+    가격 행렬 하나로 여러 지표를 전 종목에 대해 계산하는 함수
+
+    Args:
+        price_matrix (PriceMatrix): 날짜의 가격 행렬
+        names (list): 계산할 지표 이름 (None이면 INDICATORS 전체)
+        params (dict): {지표 이름: 파라미터 dict} (없는 항목은 기본값)
+
+    Returns:
+        tuple: ({출력 이름: [n_stocks, n_bars] 배열}, {출력 이름: {'indicator', 'params'}})
+    """
+    names = list(names or INDICATORS)
+    params = params or {}
+    unknown = [name for name in names if name not in INDICATORS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 지표입니다: {', '.join(unknown)} ({', '.join(INDICATORS)})")
+
+    close = np.asarray(price_matrix.matrix('close'), dtype=np.float64)
+    valid = ~np.isnan(close)
+    others = ('open', 'high', 'low', 'volume')
+    packed_close, _, *packed_others = compact_rows(
+        close, *(np.asarray(price_matrix.matrix(field), dtype=np.float64) for field in others))
+    packed = dict(zip(others, packed_others), close=packed_close)
+
+    outputs = OrderedDict()
+    descriptions = OrderedDict()
+    for name in names:
+        function, default_params = INDICATORS[name]
+        indicator_params = dict(default_params, **params.get(name, {}))
+        for output_name, values in function(packed, **indicator_params).items():
+            outputs[output_name] = expand_rows(values, valid)
+            descriptions[output_name] = {'indicator': name, 'params': indicator_params}
+    return outputs, descriptions
+
+def save_indicators(date, outputs, descriptions, data_dir='data'):
+    """
+    계산한 지표를 가격 행렬 폴더에 <출력 이름>.npy로 저장하고 meta.json에 기록하는 함수
+    (파일마다 임시 파일에 쓴 뒤 교체)
+    """
+    folder = matrix_dir(date, data_dir)
+    for output_name, values in outputs.items():
+        path = os.path.join(folder, f'{output_name}.npy')
+        temp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(temp_path, values.astype(np.float64))
+        os.replace(temp_path, path)
+
+    meta_path = os.path.join(folder, 'meta.json')
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    meta.setdefault('indicators', {}).update(descriptions)
+    temp_path = f"{meta_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(temp_path, meta_path)
+
+def build_indicators(date, names=None, params=None, data_dir='data'):
+    """
+    날짜의 가격 행렬(없으면 생성)을 한 번 열어 지표를 계산하고 같은 폴더에 저장하는 함수
+
+    Returns:
+        list: 저장한 출력 이름 리스트 (데이터가 없으면 빈 리스트)
+    """
+    price_matrix = load_price_matrix(date, data_dir)
+    if price_matrix is None:
+        if not build_price_matrix(date, data_dir):
+            return []
+        price_matrix = load_price_matrix(date, data_dir)
+
+    outputs, descriptions = compute_indicators(price_matrix, names, params)
+    save_indicators(date, outputs, descriptions, data_dir)
+    return list(outputs)
+
+def load_indicator_series(stock_code, date, output_name, data_dir='data'):
+    """
+    종목/날짜의 지표 값을 (localDateTime 리스트, 값 리스트)로 반환하는 함수 (값이 없는 봉은 None)
+
+    Returns:
+        tuple: (timestamps, values) (가격 행렬/지표/종목이 없으면 None)
+    """
+    price_matrix = load_price_matrix(date, data_dir)
+    if price_matrix is None or stock_code not in price_matrix:
+        return None
+    if not os.path.exists(os.path.join(price_matrix.folder, f'{output_name}.npy')):
+        return None
+    timestamps, values = price_matrix.stock_series(stock_code, output_name)
+    return timestamps, [None if np.isnan(value) else value for value in values]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='날짜별 전 종목 기술적 지표 일괄 계산')
+    parser.add_argument('--date', type=str, help='계산할 날짜 (YYYYMMDD)')
+    parser.add_argument('--all', action='store_true', help='data 디렉토리의 모든 날짜 계산')
+    parser.add_argument('--indicators', type=str, default=None,
+                        help=f"계산할 지표 (쉼표 구분, 기본값: 전체 - {','.join(INDICATORS)})")
+    parser.add_argument('--data_dir', default='data', help='데이터 디렉토리 (기본값: data)')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.indicators.split(',')] if args.indicators else None
+    if args.date:
+        dates = [args.date]
+    elif args.all:
+        dates = sorted(item for item in os.listdir(args.data_dir)
+                       if item.isdigit() and len(item) == 8 and os.path.isdir(os.path.join(args.data_dir, item)))
+    else:
+        print("사용법:")
+        print("  특정 날짜 계산: python indicators.py --date 20250722")
+        print("  전체 날짜 계산: python indicators.py --all")
+        print("  지표 선택: python indicators.py --date 20250722 --indicators rsi,macd,vwap")
+        dates = []
+
+    for date in dates:
+        saved = build_indicators(date, names, data_dir=args.data_dir)
+        if saved:
+            print(f"{date}: 지표 저장 완료 ({', '.join(saved)}) → {matrix_dir(date, args.data_dir)}")
+        else:
+            print(f"{date}: 가격 데이터 없음 - 건너뜀")
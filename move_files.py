@@ -1,6 +1,7 @@
 import os
 import shutil
 import sys
+from data_catalog import folder_mtimes, get_catalog, parse_data_filename
 
 # 이동할 날짜 문자열
 if len(sys.argv) < 2:
@@ -15,10 +16,16 @@ DEST_DIR = os.path.join(DATA_ROOT, TARGET_DATE)
 # 이동 대상 폴더가 없으면 생성
 os.makedirs(DEST_DIR, exist_ok=True)
 
+# 카탈로그에 기록된 해당 날짜 데이터 파일(stock_data_*/rsi_data_*)의 생성 단계 (이동 후에도 유지)
+catalog = get_catalog(DATA_ROOT)
+catalog.refresh(DATA_ROOT)
+producers = {entry['path']: entry['producer']
+             for kind in ('stock_data', 'rsi_data') for entry in catalog.list_entries(kind, TARGET_DATE)}
+
 # data/ 하위의 종목코드 폴더 순회
 for code in os.listdir(DATA_ROOT):
     code_path = os.path.join(DATA_ROOT, code)
-    if not os.path.isdir(code_path):
+    if not os.path.isdir(code_path) or os.path.normpath(code_path) == os.path.normpath(DEST_DIR):
         continue
     # 종목코드 폴더 내 파일 순회
     for fname in os.listdir(code_path):
@@ -26,4 +33,9 @@ for code in os.listdir(DATA_ROOT):
             src = os.path.join(code_path, fname)
             dst = os.path.join(DEST_DIR, fname)
             print(f"Moving {src} -> {dst}")
-            shutil.move(src, dst) 
\ No newline at end of file
+            before = folder_mtimes([src, dst])
+            shutil.move(src, dst)
+            # 카탈로그 대상 파일이면 이동한 경로로 갱신
+            if parse_data_filename(fname) is not None:
+                catalog.remove_path(src, before)
+                catalog.record_file(dst, producers.get(os.path.normpath(src), 'move_files'), before=before)
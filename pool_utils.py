@@ -0,0 +1,26 @@
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# --workers 프로세스 풀 공통 설정 (calculate_rsi_with_previous.py --all, rsi_trading_simulation_final.py --all_stocks)
+
+def quiet_worker():
+    """
+    작업 프로세스 초기화 함수 (종목별 출력은 버리고 진행 상황은 부모 프로세스에서 출력)
+    """
+    sys.stdout = open(os.devnull, 'w')
+
+def create_process_pool(workers):
+    """
+    작업 프로세스 풀을 만드는 함수
+    spawn으로 시작하여 부모의 SQLite 연결/스레드 상태를 물려받지 않음
+
+    Args:
+        workers (int): 작업 프로세스 수
+
+    Returns:
+        ProcessPoolExecutor: quiet_worker로 초기화되는 프로세스 풀
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=quiet_worker)
@@ -0,0 +1,240 @@
+import json
+import os
+import shutil
+import hashlib
+import threading
+import argparse
+from collections import OrderedDict
+import numpy as np
+from bar_store import load_stock_bars, list_stock_codes, partition_dir
+
+# 날짜별 전 종목 가격 행렬 (메모리 맵)
+#
+# data/<date>/matrix/
+#   open.npy / high.npy / low.npy / close.npy / volume.npy : float32 [n_stocks, n_bars]
+#   meta.json : {"date", "codes": [행 순서 종목코드], "timestamps": [열 순서 localDateTime],
+#                "source_signature": 행렬을 만들 때의 원본(stock_data_*.json, bars/part-*.npz) 서명}
+# 종목에 해당 시간 봉이 없으면 NaN
+# 원본 파일이 바뀌어 서명이 다르면 행렬을 사용하지 않음 (수집 시 해당 날짜의 matrix/ 폴더도 삭제됨)
+# np.load(mmap_mode='r')로 열기 때문에 종목 한 행이나 전체 시장을 파싱/복사 없이 슬라이스할 수 있음
+# (KRX 가격은 정수이므로 float32로 정확히 표현됨, 거래량은 2^24를 넘으면 근사값)
+
+MATRIX_FIELDS = OrderedDict([
+    ('open', 'openPrice'),
+    ('high', 'highPrice'),
+    ('low', 'lowPrice'),
+    ('close', 'currentPrice'),
+    ('volume', 'accumulatedTradingVolume'),
+])
+
+def matrix_dir(date, data_dir='data'):
+    return os.path.join(data_dir, date, 'matrix')
+
+def source_signature(date, data_dir='data'):
+    """
+    날짜의 원본 봉 파일(stock_data_*.json, bars/part-*.npz)의 이름/크기/수정 시각으로 만든 서명
+    """
+    entries = []
+    for folder, prefix, suffix in ((os.path.join(data_dir, date), 'stock_data_', f'_{date}.json'),
+                                   (partition_dir(date, data_dir), 'part-', '.npz')):
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.startswith(prefix) and entry.name.endswith(suffix):
+                        stat = entry.stat()
+                        entries.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+        except FileNotFoundError:
+            continue
+    return hashlib.sha256('\n'.join(sorted(entries)).encode('utf-8')).hexdigest()
+
+def remove_price_matrix(date, data_dir='data'):
+    """
+    날짜의 가격 행렬 폴더를 삭제하는 함수 (봉 데이터를 다시 저장할 때 호출)
+    """
+    shutil.rmtree(matrix_dir(date, data_dir), ignore_errors=True)
+
+def build_price_matrix(date, data_dir='data'):
+    """
+    날짜의 봉 데이터(컬럼형 저장소 또는 stock_data_*.json)로 가격 행렬 파일을 만드는 함수
+    (임시 폴더에 모두 쓴 뒤 교체하므로 읽는 쪽에서 섞인 파일을 보지 않음)
+    원본 서명은 읽기 전에 계산하므로, 만드는 도중 원본이 바뀌면 다음에 열 때 오래된 행렬로 판단됨
+
+    Args:
+        date (str): 날짜 (YYYYMMDD)
+        data_dir (str): 데이터 디렉토리
+
+    Returns:
+        int: 행렬에 포함된 종목 수
+    """
+    signature = source_signature(date, data_dir)
+    bars_by_code = OrderedDict()
+    for stock_code in list_stock_codes(date, data_dir):
+        bars = load_stock_bars(stock_code, date, data_dir)
+        if bars:
+            bars_by_code[stock_code] = bars
+    if not bars_by_code:
+        return 0
+
+    timestamps = sorted({str(bar['localDateTime']) for bars in bars_by_code.values() for bar in bars})
+    column_index = {ts: col for col, ts in enumerate(timestamps)}
+    shape = (len(bars_by_code), len(timestamps))
+    matrices = {name: np.full(shape, np.nan, dtype=np.float32) for name in MATRIX_FIELDS}
+
+    for row, bars in enumerate(bars_by_code.values()):
+        cols = [column_index[str(bar['localDateTime'])] for bar in bars]
+        for name, field in MATRIX_FIELDS.items():
+            values = [np.nan if bar.get(field) is None else bar[field] for bar in bars]
+            matrices[name][row, cols] = values
+
+    target_dir = matrix_dir(date, data_dir)
+    temp_dir = f"{target_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+    for name, matrix in matrices.items():
+        np.save(os.path.join(temp_dir, f'{name}.npy'), matrix)
+    meta = {'date': date, 'codes': list(bars_by_code), 'timestamps': timestamps,
+            'source_signature': signature}
+    with open(os.path.join(temp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    old_dir = f"{target_dir}.{os.getpid()}.old"
+    if os.path.exists(target_dir):
+        os.replace(target_dir, old_dir)
+    os.replace(temp_dir, target_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return len(bars_by_code)
+
+class PriceMatrix:
+    """
+    한 날짜의 전 종목 가격 행렬 (각 필드는 읽기 전용 memmap)
+
+    - matrix('close') : [n_stocks, n_bars] 전체 시장
+    - row('005930', 'close') : 한 종목의 [n_bars] 행 (복사 없음)
+    """
+
+    def __init__(self, date, folder):
+        self.date = date
+        self.folder = folder
+        with open(os.path.join(folder, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.codes = meta['codes']
+        self.timestamps = meta['timestamps']
+        self.source_signature = meta.get('source_signature')
+        self.row_index = {code: row for row, code in enumerate(self.codes)}
+        self._matrices = {}
+
+    def __contains__(self, stock_code):
+        return stock_code in self.row_index
+
+    def __len__(self):
+        return len(self.codes)
+
+    def matrix(self, field='close'):
+        if field not in self._matrices:
+            self._matrices[field] = np.load(os.path.join(self.folder, f'{field}.npy'), mmap_mode='r')
+        return self._matrices[field]
+
+    def row(self, stock_code, field='close'):
+        return self.matrix(field)[self.row_index[stock_code]]
+
+    def stock_series(self, stock_code, field='close'):
+        """
+        한 종목의 (localDateTime 리스트, 값 리스트) - 봉이 없는 시간(NaN)은 제외
+        """
+        close = self.row(stock_code, 'close')
+        values = close if field == 'close' else self.row(stock_code, field)
+        present = np.flatnonzero(~np.isnan(close))
+        return [self.timestamps[i] for i in present], [float(values[i]) for i in present]
+
+_matrix_cache = OrderedDict()
+_matrix_cache_lock = threading.Lock()
+_MATRIX_CACHE_SIZE = 8
+
+def load_price_matrix(date, data_dir='data'):
+    """
+    날짜의 가격 행렬을 여는 함수 (최근 날짜 몇 개는 열린 상태로 재사용)
+    meta.json의 원본 서명이 현재 원본 파일과 다르면(또는 서명이 없으면) 오래된 행렬로 보고 사용하지 않음
+    (서명 확인은 meta.json이 바뀐 뒤 처음 열 때 한 번만 하고 결과를 캐시)
+
+    Returns:
+        PriceMatrix: 가격 행렬 (파일이 없거나 원본보다 오래되었으면 None)
+    """
+    folder = matrix_dir(date, data_dir)
+    meta_path = os.path.join(folder, 'meta.json')
+    try:
+        signature = os.path.getmtime(meta_path)
+    except OSError:
+        return None
+    key = (data_dir, date)
+    with _matrix_cache_lock:
+        cached = _matrix_cache.get(key)
+        if cached and cached[0] == signature:
+            _matrix_cache.move_to_end(key)
+            return cached[1]
+
+    price_matrix = PriceMatrix(date, folder)
+    if price_matrix.source_signature != source_signature(date, data_dir):
+        price_matrix = None
+    with _matrix_cache_lock:
+        _matrix_cache[key] = (signature, price_matrix)
+        _matrix_cache.move_to_end(key)
+        while len(_matrix_cache) > _MATRIX_CACHE_SIZE:
+            _matrix_cache.popitem(last=False)
+    return price_matrix
+
+def load_price_series(stock_code, date, field='close', data_dir='data'):
+    """
+    종목/날짜의 (localDateTime 리스트, 가격 리스트)를 반환하는 함수
+    가격 행렬을 먼저 확인하고, 없으면 컬럼형 저장소/stock_data_*.json을 읽음
+
+    Args:
+        field (str): open / high / low / close / volume
+
+    Returns:
+        tuple: (timestamps, values) (데이터가 없으면 None)
+    """
+    price_matrix = load_price_matrix(date, data_dir)
+    if price_matrix is not None and stock_code in price_matrix:
+        return price_matrix.stock_series(stock_code, field)
+
+    bars = load_stock_bars(stock_code, date, data_dir)
+    if not bars:
+        return None
+    source_field = MATRIX_FIELDS[field]
+    return [item['localDateTime'] for item in bars], [item[source_field] for item in bars]
+
+def load_open_price_map(stock_code, date, data_dir='data'):
+    """
+    시뮬레이션 체결가용 localDateTime -> openPrice 매핑 (없는 시가는 None)
+
+    Returns:
+        dict: {localDateTime: openPrice} (데이터가 없으면 None)
+    """
+    series = load_price_series(stock_code, date, 'open', data_dir)
+    if series is None:
+        return None
+    timestamps, open_prices = series
+    return {ts: (None if price is None or np.isnan(price) else price)
+            for ts, price in zip(timestamps, open_prices)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='날짜별 전 종목 가격 행렬(memmap .npy) 생성')
+    parser.add_argument('--date', type=str, help='변환할 날짜 (YYYYMMDD)')
+    parser.add_argument('--all', action='store_true', help='data 디렉토리의 모든 날짜 변환')
+    parser.add_argument('--data_dir', default='data', help='데이터 디렉토리 (기본값: data)')
+    args = parser.parse_args()
+
+    if args.date:
+        dates = [args.date]
+    elif args.all:
+        dates = sorted(item for item in os.listdir(args.data_dir)
+                       if item.isdigit() and len(item) == 8 and os.path.isdir(os.path.join(args.data_dir, item)))
+    else:
+        print("사용법:")
+        print("  특정 날짜 변환: python price_matrix.py --date 20250722")
+        print("  전체 날짜 변환: python price_matrix.py --all")
+        dates = []
+
+    for date in dates:
+        count = build_price_matrix(date, args.data_dir)
+        print(f"{date}: {count}개 종목 가격 행렬 생성 ({matrix_dir(date, args.data_dir)})")
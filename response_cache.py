@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+
+CACHE_MODES = ('passthrough', 'record', 'replay')
+
+class ResponseCache:
+    """
+    네이버 API 응답을 (종목코드, startDateTime, endDateTime) 키로 디스크에 저장/재생하는 캐시
+
+    - passthrough: 캐시를 사용하지 않음 (기본값)
+    - record: 실제 API를 호출하고 응답 원본을 캐시에 저장
+    - replay: API를 호출하지 않고 캐시에 저장된 응답만 사용 (없으면 데이터 없음)
+    """
+
+    def __init__(self, cache_dir=os.path.join('data', 'response_cache'), mode='passthrough'):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"지원하지 않는 캐시 모드입니다: {mode} ({', '.join(CACHE_MODES)})")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def path_for(self, stock_code, start_datetime, end_datetime):
+        return os.path.join(self.cache_dir, stock_code, f"{start_datetime}_{end_datetime}.json")
+
+    def load(self, stock_code, start_datetime, end_datetime):
+        """
+        캐시된 응답 원본을 읽는 함수
+
+        Returns:
+            dict/list: 저장된 응답 JSON (없으면 None)
+        """
+        path = self.path_for(stock_code, start_datetime, end_datetime)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                response_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._count('misses')
+            return None
+        self._count('hits')
+        return response_data
+
+    def save(self, stock_code, start_datetime, end_datetime, response_data):
+        """
+        응답 원본을 캐시에 저장하는 함수 (임시 파일에 쓴 뒤 교체)
+        """
+        path = self.path_for(stock_code, start_datetime, end_datetime)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(response_data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        self._count('writes')
+
+    def print_stats(self):
+        if self.mode == 'passthrough':
+            return
+        print(f"응답 캐시({self.mode}): 적중 {self.stats['hits']}회, "
+              f"미적중 {self.stats['misses']}회, 저장 {self.stats['writes']}회")
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_response_cache(config):
+    """
+    config의 cache_settings(mode, directory)에 해당하는 ResponseCache를 반환하는 함수
+    (같은 설정이면 프로세스 내에서 하나를 공유)
+    """
+    cache_settings = config.get('cache_settings', {})
+    mode = cache_settings.get('mode', 'passthrough')
+    cache_dir = cache_settings.get('directory', os.path.join('data', 'response_cache'))
+    with _caches_lock:
+        if (mode, cache_dir) not in _caches:
+            _caches[(mode, cache_dir)] = ResponseCache(cache_dir, mode)
+        return _caches[(mode, cache_dir)]
@@ -0,0 +1,133 @@
+import json
+import os
+
+# 전체 종목 시뮬레이션 결과 저널 (JSONL)
+#
+# data/all_stocks_simulation_results_<start>_<end>.jsonl
+#   종목 처리가 끝날 때마다 한 줄씩 추가 (flush + fsync)
+#   {"stock_code", "stock_name", "status": "success"/"failed", "best_result", "all_results"}
+# 실행 중 결과를 메모리에 모으지 않으며, 중단되어도 기록된 종목은 남으므로 --resume으로 이어서 실행
+# 마지막에 finalize_results()가 저널을 읽어 정렬하고 기존 형식의 결과 JSON을 만듦
+
+def results_sink_path(start_date, end_date, data_dir='./data'):
+    return os.path.join(data_dir, f"all_stocks_simulation_results_{start_date}_{end_date}.jsonl")
+
+def results_json_path(start_date, end_date, data_dir='./data'):
+    return os.path.join(data_dir, f"all_stocks_simulation_results_{start_date}_{end_date}.json")
+
+def reset_sink(sink_path):
+    """
+    새 실행을 위해 저널을 비우는 함수
+    """
+    sink_dir = os.path.dirname(sink_path)
+    if sink_dir:
+        os.makedirs(sink_dir, exist_ok=True)
+    open(sink_path, 'w', encoding='utf-8').close()
+
+def trim_partial_line(sink_path):
+    """
+    중단으로 잘린 마지막 줄(줄바꿈 없이 끝난 부분)을 잘라내는 함수
+    (그대로 두면 이어서 추가하는 첫 항목이 잘린 줄에 붙어 함께 읽을 수 없게 됨)
+    """
+    if not os.path.exists(sink_path):
+        return
+    with open(sink_path, 'rb+') as f:
+        content = f.read()
+        if content and not content.endswith(b'\n'):
+            f.truncate(content.rfind(b'\n') + 1)
+
+def append_stock_result(sink_path, stock_code, stock_name, stock_results):
+    """
+    한 종목의 날짜별 최고 결과를 저널 끝에 추가하는 함수
+
+    Args:
+        stock_results (list): 날짜별 최고 수익률 결과 (비어 있으면 실패로 기록)
+
+    Returns:
+        dict: 기록한 항목
+    """
+    entry = {
+        'stock_code': stock_code,
+        'stock_name': stock_name,
+        'status': 'success' if stock_results else 'failed',
+        'best_result': max(stock_results, key=lambda x: x['profit_rate']) if stock_results else None,
+        'all_results': stock_results
+    }
+    with open(sink_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    return entry
+
+def load_sink(sink_path):
+    """
+    저널에 기록된 종목별 결과를 읽는 함수
+    (중단 시 마지막 줄이 잘려 있을 수 있으므로 해석할 수 없는 줄은 무시, 같은 종목은 마지막 기록 사용)
+
+    Returns:
+        dict: {종목코드: 항목}
+    """
+    entries = {}
+    if not os.path.exists(sink_path):
+        return entries
+    with open(sink_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry['stock_code']] = entry
+    return entries
+
+def finalize_results(sink_path, stock_codes, start_date, end_date, summary_extra=None, data_dir='./data'):
+    """
+    저널을 읽어 수익률 순으로 정렬하고 기존 형식의 결과 JSON을 저장하는 함수
+
+    Args:
+        stock_codes (list): 종목 목록 순서의 종목코드 (정렬 전 순서와 전체 종목 수 기준)
+        summary_extra (dict): summary에 함께 기록할 항목
+
+    Returns:
+        tuple: (결과 JSON 경로, 수익률 순 종목 결과 리스트, summary)
+    """
+    entries = load_sink(sink_path)
+    all_stock_results = []
+    successful_stocks = 0
+    failed_stocks = 0
+    for stock_code in stock_codes:
+        entry = entries.get(stock_code)
+        if entry and entry['status'] == 'success':
+            all_stock_results.append({
+                'stock_code': entry['stock_code'],
+                'stock_name': entry['stock_name'],
+                'best_result': entry['best_result'],
+                'all_results': entry['all_results']
+            })
+            successful_stocks += 1
+        else:
+            failed_stocks += 1
+
+    # 수익률 기준 정렬
+    all_stock_results.sort(key=lambda x: x['best_result']['profit_rate'], reverse=True)
+
+    summary = {
+        'total_stocks': len(stock_codes),
+        'successful_stocks': successful_stocks,
+        'failed_stocks': failed_stocks
+    }
+    summary.update(summary_extra or {})
+    final_results = {
+        'simulation_period': {
+            'start_date': start_date,
+            'end_date': end_date
+        },
+        'summary': summary,
+        'results': all_stock_results
+    }
+
+    result_filename = results_json_path(start_date, end_date, data_dir)
+    temp_path = f"{result_filename}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(final_results, f, ensure_ascii=False, indent=4)
+    os.replace(temp_path, result_filename)
+    return result_filename, all_stock_results, summary
@@ -0,0 +1,339 @@
+import numpy as np
+
+# 전 종목 RSI 일괄 계산 엔진
+#
+# 가격을 [종목 수, 봉 수] 행렬로 모아 시간축으로만 반복하고 종목축은 배열 연산으로 한 번에 계산
+# 길이가 다른 종목은 오른쪽을 NaN으로 채우며, 중간에 NaN(거래정지 등)이 있으면 유효한 값만 앞으로 모아 계산
+# 여러 RSI 기간도 같은 변화량 배열로 한 번에 계산 (wilder_rsi_multi)
+# 결과는 기존 함수들과 비트 단위로 같음
+#   - calculate_rsi()                         → batch_rsi()
+#   - calculate_rsi.py의 전일자 결합 계산       → batch_rsi_with_warmup()
+#   - calculate_rsi_with_previous.py의 전일자 결합 계산 → batch_rsi_with_previous()
+
+def pack_price_rows(price_rows):
+    """
+    길이가 다른 가격 리스트들을 NaN으로 채운 [종목 수, 최대 길이] 행렬로 만드는 함수
+
+    Returns:
+        tuple: (prices 행렬 float64, 종목별 길이 배열)
+    """
+    lengths = np.array([len(row) for row in price_rows], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    prices = np.full((len(price_rows), width), np.nan, dtype=np.float64)
+    for i, row in enumerate(price_rows):
+        if len(row):
+            prices[i, :len(row)] = row
+    return prices, lengths
+
+def compact_rows(prices, *others):
+    """
+    행마다 NaN이 아닌 값을 왼쪽으로 모으는 함수 (순서 유지)
+
+    Args:
+        prices (np.ndarray): [종목 수, 봉 수] 가격 행렬 (NaN 위치가 모으는 기준)
+        *others (np.ndarray): prices와 같은 순서로 옮길 같은 모양의 행렬 (dtype 유지)
+
+    Returns:
+        tuple: (모은 prices 행렬, 종목별 유효 길이 배열, 옮긴 others 행렬...)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    others = [np.asarray(values) for values in others]
+    valid = ~np.isnan(prices)
+    lengths = valid.sum(axis=1)
+    if valid.all() or not prices.size:
+        return (prices, lengths, *others)
+    order = np.argsort(~valid, axis=1, kind='stable')
+    return (np.take_along_axis(prices, order, axis=1), lengths,
+            *(np.take_along_axis(values, order, axis=1) for values in others))
+
+def expand_rows(packed, valid):
+    """
+    compact_rows로 모은 행렬을 원래 열 위치로 되돌리는 함수
+
+    Args:
+        packed (np.ndarray): 모은 [종목 수, 봉 수] 행렬 (k번째 열 = 종목의 k번째 유효 값)
+        valid (np.ndarray): 원래 행렬에서 값이 있던 칸 (compact_rows에 준 prices의 ~isnan)
+
+    Returns:
+        np.ndarray: valid와 같은 모양의 행렬 (값이 없던 칸은 NaN)
+    """
+    result = np.full(valid.shape, np.nan)
+    rows, cols = np.nonzero(valid)
+    ranks = np.cumsum(valid, axis=1)[rows, cols] - 1
+    result[rows, cols] = packed[rows, ranks]
+    return result
+
+def wilder_rsi_multi(prices, lengths, periods, first_updates=None):
+    """
+    Wilder 방식 RSI 핵심 계산 (모든 종목, 여러 기간을 한 번에)
+
+    변화량/gains/losses는 한 번만 만들고 [기간 수, 종목 수] 평균 배열을 시간축으로 함께 갱신
+    기간별로 종목마다 gains/losses의 처음 period개 평균으로 시작한 뒤, 변화량 인덱스 j가
+    first_update 이상이 되는 시점부터 avg = (avg * (period - 1) + gain[j]) / period로 갱신하고
+    갱신할 때마다 RSI를 계산 (avg_loss가 0이면 100)
+
+    Args:
+        prices (np.ndarray): [종목 수, 봉 수] 가격 행렬 (유효 길이 뒤는 무시)
+        lengths (np.ndarray): 종목별 유효 길이
+        periods (list): RSI 기간 리스트
+        first_updates (list): 기간별 종목별 첫 갱신 변화량 인덱스 배열 (None이면 각 기간의 period - 1)
+
+    Returns:
+        dict: {기간: (rsi [종목 수, 봉 수 - 1] (계산하지 않은 칸은 NaN),
+                      avg_loss가 0이었던 칸 bool 행렬,
+                      계산 가능한 종목 bool 배열 (유효 길이 >= period + 1))}
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n_stocks, n_bars = prices.shape
+    lengths = np.asarray(lengths)
+    periods = [int(period) for period in periods]
+    if first_updates is None:
+        first_updates = [np.full(n_stocks, period - 1, dtype=np.int64) for period in periods]
+    first_update = np.array([np.broadcast_to(np.asarray(fu, dtype=np.int64), (n_stocks,)) for fu in first_updates])
+    period_column = np.array(periods, dtype=np.int64)[:, None]
+
+    rsi = np.full((len(periods), n_stocks, max(n_bars - 1, 0)), np.nan)
+    zero_loss = np.zeros(rsi.shape, dtype=bool)
+    computable = lengths[None, :] >= period_column + 1
+
+    def _results():
+        return {period: (rsi[k], zero_loss[k], computable[k]) for k, period in enumerate(periods)}
+
+    if not computable.any():
+        return _results()
+
+    deltas = np.diff(prices, axis=1)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+
+    avg_gain = np.zeros((len(periods), n_stocks))
+    avg_loss = np.zeros((len(periods), n_stocks))
+    for k, period in enumerate(periods):
+        if n_bars >= period + 1:
+            avg_gain[k] = np.mean(gains[:, :period], axis=1)
+            avg_loss[k] = np.mean(losses[:, :period], axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for j in range(int(first_update[computable].min()), n_bars - 1):
+            active = computable & (j >= first_update) & (j < lengths - 1)
+            if not active.any():
+                continue
+            avg_gain = np.where(active, (avg_gain * (period_column - 1) + gains[:, j]) / period_column, avg_gain)
+            avg_loss = np.where(active, (avg_loss * (period_column - 1) + losses[:, j]) / period_column, avg_loss)
+            flat = avg_loss == 0
+            rs = avg_gain / avg_loss
+            values = np.where(flat, 100.0, 100 - (100 / (1 + rs)))
+            rsi[:, :, j] = np.where(active, values, np.nan)
+            zero_loss[:, :, j] = active & flat
+    return _results()
+
+def wilder_rsi(prices, lengths, period=14, first_update=None):
+    """
+    한 기간에 대한 wilder_rsi_multi
+
+    Returns:
+        tuple: (rsi, avg_loss가 0이었던 칸, 계산 가능한 종목) - wilder_rsi_multi 참고
+    """
+    first_updates = None if first_update is None else [first_update]
+    return wilder_rsi_multi(prices, lengths, [period], first_updates)[int(period)]
+
+def parse_periods(text):
+    """
+    '6-30', '6,9,14', '6-10,14' 형식의 RSI 기간 문자열을 정렬된 리스트로 변환
+    """
+    periods = set()
+    for part in str(text).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = (int(value) for value in part.split('-', 1))
+            periods.update(range(first, last + 1))
+        else:
+            periods.add(int(part))
+    if not periods or min(periods) < 1:
+        raise ValueError(f"RSI 기간 형식이 올바르지 않습니다: {text}")
+    return sorted(periods)
+
+def _to_values(rsi_row, zero_row):
+    # 기존 함수와 같이 avg_loss가 0이면 정수 100, 아니면 float
+    return [100 if flat else float(value) for value, flat in zip(rsi_row, zero_row)]
+
+def batch_rsi_multi(price_rows, periods):
+    """
+    calculate_rsi(prices, period)를 여러 종목, 여러 기간에 한 번에 적용
+
+    Returns:
+        dict: {기간: 종목별 RSI 리스트 (처음 period개는 None)}
+    """
+    prices, lengths = pack_price_rows(price_rows)
+    computed = wilder_rsi_multi(prices, lengths, periods)
+
+    results_by_period = {}
+    for period, (rsi, zero_loss, computable) in computed.items():
+        results = []
+        for i, n in enumerate(lengths):
+            if not computable[i]:
+                results.append([None] * int(n))
+                continue
+            results.append([None] * period + _to_values(rsi[i, period - 1:n - 1], zero_loss[i, period - 1:n - 1]))
+        results_by_period[period] = results
+    return results_by_period
+
+def batch_rsi(price_rows, period=14):
+    """
+    calculate_rsi(prices)를 여러 종목에 한 번에 적용
+
+    Returns:
+        list: 종목별 RSI 리스트 (처음 period개는 None)
+    """
+    return batch_rsi_multi(price_rows, [period])[int(period)]
+
+def batch_rsi_with_warmup(current_rows, previous_rows, period=14):
+    """
+    calculate_rsi.py의 calculate_rsi_with_previous_data를 여러 종목에 한 번에 적용
+    (전일 가격 + 당일 가격을 이어서 calculate_rsi를 계산한 뒤 당일 구간만 반환)
+    """
+    combined = [list(previous or []) + list(current) for current, previous in zip(current_rows, previous_rows)]
+    return [values[len(previous or []):]
+            for values, previous in zip(batch_rsi(combined, period), previous_rows)]
+
+def batch_rsi_with_previous_multi(current_rows, previous_rows, periods):
+    """
+    calculate_rsi_with_previous.py의 calculate_rsi_with_previous_data를 여러 종목, 여러 기간에 한 번에 적용
+    (결합 데이터 앞부분으로 시작 평균을 만들고, 전일 데이터 끝 이후 변화량부터 갱신하며
+     당일 가격 수 - 1개의 RSI를 반환)
+
+    Returns:
+        dict: {기간: 종목별 RSI 리스트}
+    """
+    combined = [list(previous) + list(current) for current, previous in zip(current_rows, previous_rows)]
+    prices, lengths = pack_price_rows(combined)
+    first_update = np.array([len(previous) for previous in previous_rows], dtype=np.int64)
+    computed = wilder_rsi_multi(prices, lengths, periods, [first_update] * len(periods))
+
+    results_by_period = {}
+    for period, (rsi, zero_loss, computable) in computed.items():
+        results = []
+        for i, (current, start) in enumerate(zip(current_rows, first_update)):
+            if not computable[i]:
+                results.append([None] * len(current))
+                continue
+            end = int(lengths[i]) - 1
+            results.append(_to_values(rsi[i, start:end], zero_loss[i, start:end]))
+        results_by_period[period] = results
+    return results_by_period
+
+def batch_rsi_with_previous(current_rows, previous_rows, period=14):
+    """
+    calculate_rsi_with_previous.py의 calculate_rsi_with_previous_data를 여러 종목에 한 번에 적용
+    """
+    return batch_rsi_with_previous_multi(current_rows, previous_rows, [period])[int(period)]
+
+def rsi_matrix(prices, period=14):
+    """
+    [종목 수, 봉 수] 가격 행렬(NaN 포함 가능)에 calculate_rsi를 행별로 적용한 RSI 행렬
+
+    Returns:
+        np.ndarray: 입력과 같은 모양의 RSI 행렬 (값이 없는 칸은 NaN, NaN이 있던 칸도 NaN)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    packed, lengths = compact_rows(prices)
+    rsi, _, computable = wilder_rsi(packed, lengths, period)
+
+    packed_rsi = np.full(packed.shape, np.nan)
+    packed_rsi[:, 1:] = rsi
+    packed_rsi[:, :period] = np.nan
+    packed_rsi[~computable] = np.nan
+
+    return expand_rows(packed_rsi, ~np.isnan(prices))
+
+def continuous_rsi(current_rows, states, period=14):
+    """
+    전일 종료 시점의 평활 상태에서 이어서 당일 RSI를 계산 (날짜 경계에서 다시 시작 평균을 만들지 않음)
+
+    상태는 종목별로 다음 중 하나
+      - {'avg_gain', 'avg_loss', 'last_price', 'bars'} : 시작 평균이 만들어진 뒤의 상태 → 전일 종가 대비
+        첫 변화량부터 바로 갱신하므로 당일 모든 봉에 RSI가 있음
+      - {'pending_prices': [...]} : 아직 period + 1개 가격이 모이지 않은 상태 → 당일 가격과 이어서 시작 평균 계산
+      - None : 이전 상태 없음 → 당일 가격만으로 처음 period개 변화량 평균에서 시작 (Wilder 원래 방식)
+
+    Args:
+        current_rows (list): 종목별 당일 가격 리스트
+        states (list): 종목별 전일 종료 상태 (위 형식 또는 None)
+        period (int): RSI 기간
+
+    Returns:
+        tuple: (종목별 당일 RSI 리스트 (값이 없는 봉은 None), 종목별 당일 종료 상태)
+    """
+    prefixes = []
+    for state in states:
+        if state and 'avg_gain' in state:
+            prefixes.append([state['last_price']])
+        elif state:
+            prefixes.append(list(state.get('pending_prices', [])))
+        else:
+            prefixes.append([])
+    combined = [prefix + list(current) for prefix, current in zip(prefixes, current_rows)]
+    prices, lengths = pack_price_rows(combined)
+    n_stocks = len(combined)
+    n_bars = prices.shape[1] if n_stocks else 0
+
+    resumed = np.array([bool(state and 'avg_gain' in state) for state in states], dtype=bool)
+    avg_gain = np.array([state['avg_gain'] if resumed[i] else 0.0 for i, state in enumerate(states)], dtype=np.float64)
+    avg_loss = np.array([state['avg_loss'] if resumed[i] else 0.0 for i, state in enumerate(states)], dtype=np.float64)
+    seeding = ~resumed & (lengths >= period + 1)
+    first_update = np.where(resumed, 0, period)
+
+    rsi = np.full((n_stocks, max(n_bars - 1, 0)), np.nan)
+    zero_loss = np.zeros(rsi.shape, dtype=bool)
+    if n_bars >= 2:
+        deltas = np.diff(prices, axis=1)
+        gains = np.where(deltas > 0, deltas, 0)
+        losses = np.where(deltas < 0, -deltas, 0)
+        if seeding.any():
+            avg_gain = np.where(seeding, np.mean(gains[:, :period], axis=1), avg_gain)
+            avg_loss = np.where(seeding, np.mean(losses[:, :period], axis=1), avg_loss)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for j in range(n_bars - 1):
+                in_row = j < lengths - 1
+                if j == period - 1:
+                    # 새로 시작하는 종목은 시작 평균으로 첫 RSI
+                    emit = seeding & in_row
+                else:
+                    emit = np.zeros(n_stocks, dtype=bool)
+                active = (resumed | seeding) & (j >= first_update) & in_row
+                if not (active.any() or emit.any()):
+                    continue
+                avg_gain = np.where(active, (avg_gain * (period - 1) + gains[:, j]) / period, avg_gain)
+                avg_loss = np.where(active, (avg_loss * (period - 1) + losses[:, j]) / period, avg_loss)
+                flat = avg_loss == 0
+                values = np.where(flat, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+                written = active | emit
+                rsi[:, j] = np.where(written, values, np.nan)
+                zero_loss[:, j] = written & flat
+
+    results = []
+    end_states = []
+    for i, (prefix, current, state) in enumerate(zip(prefixes, current_rows, states)):
+        offset = len(prefix)
+        values = [None] * len(current)
+        for k in range(len(current)):
+            j = offset + k - 1
+            if j >= 0 and not np.isnan(rsi[i, j]):
+                values[k] = 100 if zero_loss[i, j] else float(rsi[i, j])
+        results.append(values)
+
+        if not len(current):
+            end_states.append(state)
+        elif resumed[i] or seeding[i]:
+            end_states.append({
+                'avg_gain': float(avg_gain[i]),
+                'avg_loss': float(avg_loss[i]),
+                'last_price': float(combined[i][-1]),
+                'bars': state['bars'] + len(current) if resumed[i] else len(combined[i]),
+            })
+        else:
+            end_states.append({'pending_prices': [float(price) for price in combined[i]]})
+    return results, end_states
@@ -0,0 +1,146 @@
+import json
+import os
+import argparse
+from datetime import datetime
+from trading_calendar import load_trading_calendar
+from bar_store import list_stock_codes
+from price_matrix import load_price_series
+from rsi_engine import continuous_rsi
+
+# 날짜 간 RSI 평활 상태 (carry-forward)
+#
+# data/<date>/rsi_state_<period>.json
+#   {"date", "period", "previous_date", "states": {종목코드: 상태}}
+#   상태: {"avg_gain", "avg_loss", "last_price", "bars"} 또는 아직 시작 평균 전이면 {"pending_prices": [...]}
+# 다음 거래일 RSI는 이 상태에서 바로 이어서 계산하므로 전일 가격 파일을 다시 읽지 않고,
+# 여러 날을 하나로 이어 계산한 Wilder RSI와 같은 값이 나옴
+# (float는 JSON에 repr로 저장되어 상태를 읽고 써도 값이 바뀌지 않음)
+
+def rsi_state_path(date, period=14, data_dir='data'):
+    return os.path.join(data_dir, date, f'rsi_state_{period}.json')
+
+def load_rsi_state(date, period=14, data_dir='data'):
+    """
+    날짜의 종료 시점 RSI 상태를 읽는 함수
+
+    Returns:
+        dict: {종목코드: 상태} (파일이 없으면 None)
+    """
+    try:
+        with open(rsi_state_path(date, period, data_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)['states']
+    except (OSError, json.JSONDecodeError, KeyError):
+        return None
+
+def save_rsi_state(date, states, period=14, previous_date=None, data_dir='data'):
+    """
+    날짜의 종료 시점 RSI 상태를 저장하는 함수 (임시 파일에 쓴 뒤 교체)
+    """
+    path = rsi_state_path(date, period, data_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    state_data = {
+        'date': date,
+        'period': period,
+        'previous_date': previous_date,
+        'states': states
+    }
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state_data, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+    return path
+
+def find_previous_rsi_state(date, period=14, data_dir='data', max_lookback=7):
+    """
+    date 이전 거래일 중 상태 파일이 있는 가장 가까운 날의 상태를 찾는 함수
+    (데이터가 없는 거래일은 건너뛰되 max_lookback일보다 오래된 상태는 사용하지 않음)
+
+    Returns:
+        tuple: (상태 날짜, {종목코드: 상태}) 또는 (None, None)
+    """
+    calendar = load_trading_calendar()
+    current_dt = datetime.strptime(date, '%Y%m%d')
+    previous_date = calendar.previous_trading_day(date)
+    while (current_dt - datetime.strptime(previous_date, '%Y%m%d')).days <= max_lookback:
+        states = load_rsi_state(previous_date, period, data_dir)
+        if states is not None:
+            return previous_date, states
+        previous_date = calendar.previous_trading_day(previous_date)
+    return None, None
+
+def carry_forward_rsi(stock_codes, current_rows, previous_states, period=14):
+    """
+    전일 상태에서 이어서 여러 종목의 당일 RSI와 종료 상태를 한 번에 계산하는 함수
+    (오늘 데이터가 없는 종목의 전일 상태는 그대로 넘겨 거래정지 후에도 이어지게 함)
+
+    Args:
+        stock_codes (list): 종목 코드 리스트
+        current_rows (list): 종목별 당일 가격 리스트
+        previous_states (dict): {종목코드: 전일 종료 상태} (없으면 None)
+        period (int): RSI 기간
+
+    Returns:
+        tuple: (종목별 RSI 리스트, 당일 종료 상태 {종목코드: 상태})
+    """
+    previous_states = previous_states or {}
+    rsi_values_list, end_states = continuous_rsi(
+        current_rows, [previous_states.get(stock_code) for stock_code in stock_codes], period)
+
+    states = {stock_code: state for stock_code, state in previous_states.items() if stock_code not in stock_codes}
+    for stock_code, state in zip(stock_codes, end_states):
+        if state is not None:
+            states[stock_code] = state
+    return rsi_values_list, states
+
+def advance_rsi_state(date, period=14, data_dir='data'):
+    """
+    전일 상태와 당일 가격으로 날짜의 종료 상태 파일을 만드는 함수
+
+    Returns:
+        int: 당일 가격이 있는 종목 수
+    """
+    previous_date, previous_states = find_previous_rsi_state(date, period, data_dir)
+    stock_codes = []
+    current_rows = []
+    for stock_code in list_stock_codes(date, data_dir):
+        series = load_price_series(stock_code, date, data_dir=data_dir)
+        if series:
+            stock_codes.append(stock_code)
+            current_rows.append(series[1])
+
+    _, states = carry_forward_rsi(stock_codes, current_rows, previous_states, period)
+    save_rsi_state(date, states, period, previous_date, data_dir)
+    return len(stock_codes)
+
+def backfill_rsi_state(start_date, end_date, period=14, data_dir='data'):
+    """
+    시작일~종료일 거래일을 순서대로 계산하여 상태 체인을 다시 만드는 함수
+    (시작일 이전 상태 파일이 있으면 거기서 이어가고, 없으면 시작일에 새로 시작)
+    """
+    date_list = load_trading_calendar().trading_days_between(start_date, end_date)
+    print(f"RSI 상태 백필: {start_date} ~ {end_date} (거래일 {len(date_list)}일, 기간 {period})")
+    for date in date_list:
+        if not os.path.isdir(os.path.join(data_dir, date)):
+            print(f"  {date}: 데이터 폴더 없음 - 건너뜀")
+            continue
+        count = advance_rsi_state(date, period, data_dir)
+        print(f"  {date}: {count}개 종목 상태 저장 ({rsi_state_path(date, period, data_dir)})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='날짜 간 RSI 평활 상태 생성/백필')
+    parser.add_argument('--date', type=str, help='상태를 만들 날짜 (YYYYMMDD)')
+    parser.add_argument('--backfill', nargs=2, metavar=('START', 'END'), help='상태 체인을 다시 만들 기간 (YYYYMMDD YYYYMMDD)')
+    parser.add_argument('--period', type=int, default=14, help='RSI 계산 기간 (기본값: 14)')
+    parser.add_argument('--data_dir', default='data', help='데이터 디렉토리 (기본값: data)')
+    args = parser.parse_args()
+
+    if args.backfill:
+        backfill_rsi_state(args.backfill[0], args.backfill[1], args.period, args.data_dir)
+    elif args.date:
+        count = advance_rsi_state(args.date, args.period, args.data_dir)
+        print(f"{args.date}: {count}개 종목 상태 저장 ({rsi_state_path(args.date, args.period, args.data_dir)})")
+    else:
+        print("사용법:")
+        print("  특정 날짜 상태 생성: python rsi_state.py --date 20250722")
+        print("  기간 상태 백필: python rsi_state.py --backfill 20250701 20250731")
+        print("  RSI 기간 변경: python rsi_state.py --backfill 20250701 20250731 --period 21")
@@ -8,8 +8,18 @@ import matplotlib.dates as mdates
 from matplotlib import rcParams
 import argparse
 import sys
-import subprocess
+from concurrent.futures import as_completed
 import glob
+from collections import OrderedDict
+from pool_utils import create_process_pool
+from trading_calendar import load_trading_calendar
+from price_matrix import load_open_price_map
+from rsi_engine import parse_periods
+from data_pipeline import prepare_simulation_inputs, summarize_preparation
+from event_kernel import EventSeries, simulate_rsi_events
+from trade_records import TradeLog, EquityCurve, SELL_ACTIONS
+from continuous_backtest import continuous_backtest, save_continuous_results
+from result_sink import results_sink_path, reset_sink, trim_partial_line, load_sink, append_stock_result, finalize_results
 
 # 한글 폰트 설정 개선 한다
 plt.rcParams['font.family'] = ['Malgun Gothic', 'DejaVu Sans', 'Arial Unicode MS', 'sans-serif']
@@ -36,13 +46,15 @@ if os.name == 'nt':  # Windows
 else:  # Linux/Mac
     plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial Unicode MS', 'sans-serif']
 
-def check_and_create_data(stock_code, date):
+def check_and_create_data(stock_code, date, prepared=None):
     """
     필요한 데이터 파일들이 존재하는지 확인하고, 없으면 자동으로 생성
+    (data_pipeline으로 같은 프로세스에서 수집/계산)
     
     Args:
         stock_code (str): 종목 코드
         date (str): 날짜 (YYYYMMDD 형식)
+        prepared (dict): 이미 준비한 data_pipeline 결과 (없으면 이 종목만 준비)
     
     Returns:
         bool: 데이터 준비 완료 여부
@@ -51,56 +63,39 @@ def check_and_create_data(stock_code, date):
     print("데이터 준비 상태 확인 중...")
     print("=" * 60)
     
+    result = prepared or prepare_simulation_inputs([stock_code], date)[stock_code]
+    
     # 1. 10분가격 데이터 확인
     stock_data_file = f"data/{date}/stock_data_{stock_code}_{date}.json"
-    if not os.path.exists(stock_data_file):
+    if result['bars'] == 'present':
+        print(f"✅ 10분가격 데이터 파일 존재: {stock_data_file}")
+    else:
         print(f"❌ 10분가격 데이터 파일이 없습니다: {stock_data_file}")
-        print("📥 10분가격 데이터를 수집합니다...")
-        
-        try:
-            # get_minute10.py 실행
-            cmd = f"python get_minute10.py {date} {date} {stock_code}"
-            print(f"실행 명령: {cmd}")
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print("✅ 10분가격 데이터 수집 완료")
-            else:
-                print(f"❌ 10분가격 데이터 수집 실패: {result.stderr}")
-                return False
-        except Exception as e:
-            print(f"❌ 10분가격 데이터 수집 중 오류: {str(e)}")
+        if result['bars'] == 'missing':
+            print(f"❌ 10분가격 데이터 수집 실패: {result['error']}")
             return False
-    else:
-        print(f"✅ 10분가격 데이터 파일 존재: {stock_data_file}")
+        print("✅ 10분가격 데이터 수집 완료")
+        _open_price_cache.pop((stock_code, date), None)
     
-    # 2. RSI 데이터 확인
+    # 2. RSI 데이터 확인 (파일이 있어도 기록된 입력과 현재 봉 데이터가 다르면 다시 생성)
     rsi_data_file = f"data/{date}/rsi_data_{stock_code}_{date}.json"
-    if not os.path.exists(rsi_data_file):
-        print(f"❌ RSI 데이터 파일이 없습니다: {rsi_data_file}")
-        print("📊 RSI 데이터를 생성합니다...")
-        
-        try:
-            # calculate_rsi.py 실행 (전일자 데이터 활용)
-            cmd = f"python calculate_rsi.py --stock_code {stock_code} --date {date}"
-            print(f"실행 명령: {cmd}")
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print("✅ RSI 데이터 생성 완료 (전일자 데이터 활용)")
-            else:
-                print(f"❌ RSI 데이터 생성 실패: {result.stderr}")
-                return False
-        except Exception as e:
-            print(f"❌ RSI 데이터 생성 중 오류: {str(e)}")
+    if result['rsi'] != 'present':
+        if result['rsi_reason'] != '결과 없음':
+            print(f"⚠️ RSI 데이터가 현재 입력과 맞지 않습니다 ({result['rsi_reason']}): {rsi_data_file}")
+        else:
+            print(f"❌ RSI 데이터 파일이 없습니다: {rsi_data_file}")
+        if result['rsi'] == 'failed':
+            print(f"❌ RSI 데이터 생성 실패: {result['error']}")
             return False
+        print("✅ RSI 데이터 생성 완료 (전일자 데이터 활용)")
     else:
         print(f"✅ RSI 데이터 파일 존재: {rsi_data_file}")
         # 기존 RSI 파일에서 전일자 데이터 사용 여부 확인
         try:
             with open(rsi_data_file, 'r', encoding='utf-8') as f:
                 rsi_data = json.load(f)
-                used_previous = rsi_data.get('calculation_settings', {}).get('used_previous_data', False)
+                settings = rsi_data.get('calculation_settings', {})
+                used_previous = settings.get('used_previous_data', settings.get('previous_data_used', False))
                 if used_previous:
                     print("  📈 전일자 데이터를 활용한 RSI 계산됨")
                 else:
@@ -113,13 +108,14 @@ def check_and_create_data(stock_code, date):
     print("=" * 60)
     return True
 
-def load_rsi_data(stock_code, date):
+def load_rsi_data(stock_code, date, rsi_period=None):
     """
     RSI 데이터 파일을 로드하는 함수
     
     Args:
         stock_code (str): 종목 코드
         date (str): 날짜 (YYYYMMDD 형식)
+        rsi_period (int): 사용할 RSI 기간 (None이면 파일의 기본 기간)
     
     Returns:
         dict: RSI 데이터
@@ -132,8 +128,35 @@ def load_rsi_data(stock_code, date):
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
+    if rsi_period is not None:
+        data = select_rsi_period(data, rsi_period)
     return data
 
+def select_rsi_period(rsi_data, rsi_period):
+    """
+    RSI 데이터의 'rsi' 값을 함께 저장된 다른 기간(rsi_by_period) 값으로 바꾼 복사본을 반환
+    (calculate_rsi_with_previous.py --rsi_periods로 계산한 파일에서 재계산 없이 기간 선택)
+    
+    Args:
+        rsi_data (dict): RSI 데이터
+        rsi_period (int): 사용할 RSI 기간
+    
+    Returns:
+        dict: 선택한 기간의 RSI 데이터
+    """
+    if rsi_period == rsi_data.get('rsi_period'):
+        return rsi_data
+    
+    rsi_values = rsi_data.get('rsi_by_period', {}).get(str(rsi_period))
+    if rsi_values is None:
+        raise ValueError(f"RSI 기간 {rsi_period} 데이터가 없습니다: {rsi_data['stock_code']} ({rsi_data['date']}) "
+                         f"- calculate_rsi_with_previous.py --rsi_periods로 다시 계산하세요")
+    
+    selected = dict(rsi_data)
+    selected['rsi_period'] = rsi_period
+    selected['data'] = [dict(item, rsi=rsi, rsi_period=rsi_period) for item, rsi in zip(rsi_data['data'], rsi_values)]
+    return selected
+
 def analyze_rsi_distribution(rsi_data):
     """
     RSI 분포 분석
@@ -168,7 +191,56 @@ with open('config.json', 'r', encoding='utf-8') as f:
     config = json.load(f)
 trade_settings = config.get('trade_settings', {})
 
-def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=40, rsi_overbought=60):
+# 체결가용 시가 매핑 캐시 ((종목코드, 날짜) -> {localDateTime: openPrice})
+# 같은 종목/날짜를 기준값 조합마다 시뮬레이션해도 10분 가격 데이터는 한 번만 읽음
+_open_price_cache = OrderedDict()
+_OPEN_PRICE_CACHE_SIZE = 32
+open_price_cache_stats = {'hits': 0, 'misses': 0}
+
+def get_open_price_map(stock_code, date):
+    """
+    load_open_price_map 결과를 최근 (종목코드, 날짜) 몇 개만큼 보관하여 재사용하는 함수
+
+    Returns:
+        dict: {localDateTime: openPrice} (데이터가 없으면 None, 캐시하지 않음)
+    """
+    key = (stock_code, date)
+    if key in _open_price_cache:
+        open_price_cache_stats['hits'] += 1
+        _open_price_cache.move_to_end(key)
+        return _open_price_cache[key]
+
+    open_price_cache_stats['misses'] += 1
+    open_price_map = load_open_price_map(stock_code, date)
+    if open_price_map is not None:
+        _open_price_cache[key] = open_price_map
+        while len(_open_price_cache) > _OPEN_PRICE_CACHE_SIZE:
+            _open_price_cache.popitem(last=False)
+    return open_price_map
+
+def format_open_price_cache_stats():
+    return f"시가 데이터 캐시: 적중 {open_price_cache_stats['hits']}회, 미적중(로드) {open_price_cache_stats['misses']}회"
+
+# 이벤트 커널 입력 캐시: 같은 RSI 데이터로 기준값만 바꿔 반복 실행할 때 봉 인덱스/기준값별 신호 봉을 재사용
+# (입력 객체가 같은지(is)로 확인하며 마지막 하나만 보관)
+_event_series_cache = None
+
+def get_event_series(rsi_data, open_price_map):
+    """
+    rsi_data/open_price_map/trade_settings가 직전 호출과 같으면 EventSeries를 재사용하는 함수
+    """
+    global _event_series_cache
+    settings = (trade_settings.get('buy_price_type'), trade_settings.get('sell_price_type'), trade_settings.get('slippage'))
+    if _event_series_cache is not None:
+        cached_data, cached_prices, cached_settings, series = _event_series_cache
+        if (cached_data is rsi_data['data'] and cached_prices is open_price_map and cached_settings == settings
+                and series.stock_code == rsi_data['stock_code'] and series.date == rsi_data['date']):
+            return series
+    series = EventSeries(rsi_data, open_price_map, trade_settings)
+    _event_series_cache = (rsi_data['data'], open_price_map, settings, series)
+    return series
+
+def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=40, rsi_overbought=60, open_price_map=None):
     """
     최종 RSI 기반 매매 시뮬레이션 (현실적인 기준 사용)
     
@@ -177,6 +249,7 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
         initial_capital (int): 초기 자본금 (원)
         rsi_oversold (int): 과매도 기준 (기본값: 40)
         rsi_overbought (int): 과매수 기준 (기본값: 60)
+        open_price_map (dict): 미리 읽은 localDateTime -> openPrice 매핑 (없으면 캐시에서 읽음)
     
     Returns:
         dict: 시뮬레이션 결과
@@ -185,22 +258,25 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
     stock_code = rsi_data['stock_code']
     date = rsi_data['date']
 
-    # 10분 가격 데이터 로드 (openPrice 사용)
-    stock_data_file = f"data/{date}/stock_data_{stock_code}_{date}.json"
-    if not os.path.exists(stock_data_file):
-        raise FileNotFoundError(f"10분 가격 데이터 파일을 찾을 수 없습니다: {stock_data_file}")
-    with open(stock_data_file, 'r', encoding='utf-8') as f:
-        stock_data_json = json.load(f)
-        stock_data = stock_data_json['data']
+    # 10분 가격 데이터 로드 (openPrice 사용, 가격 행렬이 있으면 행렬에서 읽음)
     # localDateTime -> openPrice 매핑
-    open_price_map = {item['localDateTime']: item['openPrice'] for item in stock_data}
+    if open_price_map is None:
+        open_price_map = get_open_price_map(stock_code, date)
+    if open_price_map is None:
+        raise FileNotFoundError(f"10분 가격 데이터를 찾을 수 없습니다: data/{date}/stock_data_{stock_code}_{date}.json")
+
+    # 체결 시점이 'next'이면 신호 봉만 찾아 처리하는 이벤트 커널 사용 (아래 봉 단위 루프와 같은 결과)
+    if (trade_settings.get('buy_execution_timing', 'next') == 'next'
+            and trade_settings.get('sell_execution_timing', 'next') == 'next'):
+        return simulate_rsi_events(get_event_series(rsi_data, open_price_map),
+                                   initial_capital, rsi_oversold, rsi_overbought)
 
     # 시뮬레이션 변수 초기화
     capital = initial_capital  # 현금
     shares = 0  # 보유 주식 수
     total_value = initial_capital  # 총 자산가치
-    trades = []  # 거래 기록
-    portfolio_values = []  # 포트폴리오 가치 기록
+    trades = TradeLog()  # 거래 기록
+    portfolio_values = EquityCurve(data)  # 포트폴리오 가치 기록
 
     # 첫 번째 유효한 RSI 값 찾기
     start_idx = 0
@@ -219,8 +295,6 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
     while i < len(data):
         item = data[i]
         rsi = item['rsi']
-        timestamp = item['localDateTime']
-        current_price = item['currentPrice']
 
         if rsi is None:
             i += 1
@@ -251,16 +325,7 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
                     cost = shares_to_buy * buy_price
                     capital -= cost
                     shares += shares_to_buy
-                    trades.append({
-                        'timestamp': buy_timestamp,
-                        'action': 'BUY',
-                        'price': buy_price,
-                        'shares': shares_to_buy,
-                        'cost': cost,
-                        'rsi': rsi,
-                        'capital': capital,
-                        'shares_held': shares
-                    })
+                    trades.add(buy_timestamp, 'BUY', buy_price, shares_to_buy, cost, rsi, capital, shares)
                 i = buy_idx  # 신호 발생 시점에 따라 인덱스 이동
                 continue
             else:
@@ -287,32 +352,15 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
                 sell_price = sell_price * (1 - slippage)
                 revenue = shares * sell_price
                 capital += revenue
-                trades.append({
-                    'timestamp': sell_timestamp,
-                    'action': 'SELL',
-                    'price': sell_price,
-                    'shares': shares,
-                    'revenue': revenue,
-                    'rsi': rsi,
-                    'capital': capital,
-                    'shares_held': 0
-                })
+                trades.add(sell_timestamp, 'SELL', sell_price, shares, revenue, rsi, capital, 0)
                 shares = 0
                 i = sell_idx  # 신호 발생 시점에 따라 인덱스 이동
                 continue
             else:
                 break
 
-        # 현재 포트폴리오 가치 계산 (현재 캔들 기준)
-        current_portfolio_value = capital + (shares * current_price)
-        portfolio_values.append({
-            'timestamp': timestamp,
-            'price': current_price,
-            'rsi': rsi,
-            'capital': capital,
-            'shares': shares,
-            'portfolio_value': current_portfolio_value
-        })
+        # 현재 포트폴리오 가치 기록 (현재 캔들 기준, 가치는 EquityCurve에서 계산)
+        portfolio_values.add(i, capital, shares)
         i += 1
 
     # 마지막 거래일 종가로 모든 주식 매도 (청산)
@@ -320,16 +368,8 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
         final_price = data[-1]['currentPrice']
         final_revenue = shares * final_price
         capital += final_revenue
-        trades.append({
-            'timestamp': data[-1]['localDateTime'],
-            'action': 'FINAL_SELL',
-            'price': final_price,
-            'shares': shares,
-            'revenue': final_revenue,
-            'rsi': data[-1]['rsi'],
-            'capital': capital,
-            'shares_held': 0
-        })
+        trades.add(data[-1]['localDateTime'], 'FINAL_SELL', final_price, shares, final_revenue,
+                   data[-1]['rsi'], capital, 0)
 
     # 수익률 계산
     final_value = capital
@@ -337,15 +377,15 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
     profit_rate = (profit / initial_capital) * 100
 
     # 거래 통계
-    buy_trades = [t for t in trades if t['action'] == 'BUY']
-    sell_trades = [t for t in trades if t['action'] in ['SELL', 'FINAL_SELL']]
+    buy_trades = trades.count('BUY')
+    sell_trades = trades.count(*SELL_ACTIONS)
 
     # 평균 매수/매도 가격
-    avg_buy_price = np.mean([t['price'] for t in buy_trades]) if buy_trades else 0
-    avg_sell_price = np.mean([t['price'] for t in sell_trades]) if sell_trades else 0
+    avg_buy_price = trades.mean_price('BUY')
+    avg_sell_price = trades.mean_price(*SELL_ACTIONS)
 
     # 최대/최소 포트폴리오 가치
-    portfolio_values_list = [pv['portfolio_value'] for pv in portfolio_values]
+    portfolio_values_list = portfolio_values.values()
     max_portfolio_value = max(portfolio_values_list) if portfolio_values_list else initial_capital
     min_portfolio_value = min(portfolio_values_list) if portfolio_values_list else initial_capital
 
@@ -359,8 +399,8 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
         'rsi_oversold': rsi_oversold,
         'rsi_overbought': rsi_overbought,
         'total_trades': len(trades),
-        'buy_trades': len(buy_trades),
-        'sell_trades': len(sell_trades),
+        'buy_trades': buy_trades,
+        'sell_trades': sell_trades,
         'avg_buy_price': avg_buy_price,
         'avg_sell_price': avg_sell_price,
         'max_portfolio_value': max_portfolio_value,
@@ -373,6 +413,177 @@ def simulate_rsi_trading_final(rsi_data, initial_capital=10000000, rsi_oversold=
 
     return result
 
+def add_trade_lists(simulation_result):
+    """
+    시뮬레이션 결과에 매수/매도 가격 및 시간 리스트를 추가하는 함수
+    """
+    trades = simulation_result['trades']
+    simulation_result['buy_prices'] = trades.prices_of('BUY')
+    simulation_result['buy_times'] = trades.times_of('BUY')
+    simulation_result['sell_prices'] = trades.prices_of(*SELL_ACTIONS)
+    simulation_result['sell_times'] = trades.times_of(*SELL_ACTIONS)
+    return simulation_result
+
+def simulate_rsi_trading_grid(rsi_data, initial_capital=10000000, oversold_values=range(25, 36), overbought_values=range(65, 76)):
+    """
+    여러 RSI 기준값 조합을 한 번에 시뮬레이션하는 함수
+    가격 데이터는 한 번만 읽고, 체결 시점이 'next'이면 조합마다 같은 이벤트 입력(EventSeries)을 재사용하여
+    이벤트 커널로 계산 (신호 봉 목록은 기준값별로 한 번만 만들어짐)
+
+    Args:
+        rsi_data (dict): RSI 데이터
+        initial_capital (int): 초기 자본금 (원)
+        oversold_values (iterable): 과매도 기준 값들
+        overbought_values (iterable): 과매수 기준 값들
+
+    Returns:
+        dict: {(oversold, overbought): (결과 dict 또는 None, 오류 메시지)} - oversold, overbought 순서
+    """
+    oversold_values = list(oversold_values)
+    overbought_values = list(overbought_values)
+    open_price_map = get_open_price_map(rsi_data['stock_code'], rsi_data['date'])
+    if open_price_map is None:
+        error_message = f"10분 가격 데이터를 찾을 수 없습니다: data/{rsi_data['date']}/stock_data_{rsi_data['stock_code']}_{rsi_data['date']}.json"
+        return {(oversold, overbought): (None, error_message)
+                for oversold in oversold_values for overbought in overbought_values}
+
+    results = {}
+    for oversold in oversold_values:
+        for overbought in overbought_values:
+            try:
+                simulation_result = simulate_rsi_trading_final(rsi_data, initial_capital, oversold, overbought, open_price_map)
+                results[(oversold, overbought)] = (add_trade_lists(simulation_result), None)
+            except Exception as e:
+                results[(oversold, overbought)] = (None, str(e))
+    return results
+
+def find_best_thresholds(stock_code, date, initial_capital=10000000, rsi_period=None):
+    """
+    종목/날짜의 oversold 25-35, overbought 65-75 조합 중 최고 수익률 결과를 찾는 함수
+    (데이터는 미리 준비되어 있어야 함, 수익률이 같으면 먼저 나온 조합)
+    
+    Returns:
+        dict: 최고 수익률 결과 (모든 조합이 실패하면 None)
+    """
+    rsi_data = load_rsi_data(stock_code, date, rsi_period)
+    best_result = None
+    best_profit_rate = -999
+    
+    grid_results = simulate_rsi_trading_grid(rsi_data, initial_capital=initial_capital)
+    for (oversold, overbought), (simulation_result, _) in grid_results.items():
+        if simulation_result is None:
+            continue
+        if simulation_result['profit_rate'] > best_profit_rate:
+            best_profit_rate = simulation_result['profit_rate']
+            best_result = {
+                'date': date,
+                'oversold': oversold,
+                'overbought': overbought,
+                'profit_rate': simulation_result['profit_rate'],
+                'profit': simulation_result['profit'],
+                'total_trades': simulation_result['total_trades'],
+                'buy_trades': simulation_result['buy_trades'],
+                'sell_trades': simulation_result['sell_trades']
+            }
+    return best_result
+
+def _simulate_chunk(work_units, initial_capital, rsi_period):
+    """
+    작업 프로세스에서 (종목, 날짜) 묶음을 시뮬레이션하는 함수
+
+    Returns:
+        tuple: ([(종목코드, 날짜, 최고 결과, 오류 메시지)], 이 묶음의 시가 캐시 적중/미적중 수)
+    """
+    stats_before = dict(open_price_cache_stats)
+    records = []
+    for stock_code, date in work_units:
+        try:
+            records.append((stock_code, date, find_best_thresholds(stock_code, date, initial_capital, rsi_period), None))
+        except Exception as e:
+            records.append((stock_code, date, None, str(e)))
+    return records, {key: open_price_cache_stats[key] - stats_before[key] for key in stats_before}
+
+def simulate_all_stocks_in_pool(work_units, initial_capital=10000000, rsi_period=None, workers=2, chunk_size=None):
+    """
+    (종목, 날짜) 작업을 작은 묶음으로 나누어 프로세스 풀에서 시뮬레이션하고, 종목의 모든 날짜가 끝나는 대로 결과를 넘겨주는 제너레이터
+    (묶음을 작게 나누어 먼저 끝난 작업 프로세스가 남은 묶음을 가져가므로 종목별 처리 시간 차이가 고르게 분산됨,
+     종목 단위로 바로 넘겨주므로 호출 쪽에서 즉시 저널에 기록할 수 있어 중간에 중단되어도 끝난 종목은 남음)
+    
+    Args:
+        work_units (list): [(종목코드, 날짜)] - 데이터가 준비된 작업
+        workers (int): 작업 프로세스 수
+        chunk_size (int): 한 묶음의 작업 수 (None이면 작업 수 / (workers * 8))
+    
+    Yields:
+        tuple: (종목코드, {날짜: (최고 수익률 결과 또는 None, 오류 메시지)}) - 종목의 모든 날짜가 끝난 순서
+    """
+    size = chunk_size or max(1, -(-len(work_units) // (workers * 8)))
+    chunks = [work_units[i:i + size] for i in range(0, len(work_units), size)]
+    remaining = {}
+    for stock_code, _ in work_units:
+        remaining[stock_code] = remaining.get(stock_code, 0) + 1
+    
+    print(f"프로세스 풀 실행: 작업 프로세스 {workers}개, (종목, 날짜) {len(work_units)}개, 묶음 {len(chunks)}개")
+    best_by_stock = {}
+    finished_units = 0
+    with create_process_pool(workers) as executor:
+        futures = [executor.submit(_simulate_chunk, chunk, initial_capital, rsi_period) for chunk in chunks]
+        for done, future in enumerate(as_completed(futures), 1):
+            records, cache_stats = future.result()
+            for key, count in cache_stats.items():
+                open_price_cache_stats[key] += count
+            finished_units += len(records)
+            if done % max(1, len(chunks) // 20) == 0 or done == len(chunks):
+                print(f"  [{done}/{len(chunks)}] 묶음 완료 (누적 {finished_units}/{len(work_units)}개)")
+            for stock_code, date, best_result, error_message in records:
+                best_by_stock.setdefault(stock_code, {})[date] = (best_result, error_message)
+                remaining[stock_code] -= 1
+                if remaining[stock_code] == 0:
+                    yield stock_code, best_by_stock.pop(stock_code)
+
+def simulate_stock_dates(stock_code, date_list, prepared_by_date, initial_capital=10000000, rsi_period=None, best_by_date=None):
+    """
+    한 종목의 날짜별 최고 수익률 결과를 모으는 함수
+    
+    Args:
+        stock_code (str): 종목코드
+        date_list (list): 시뮬레이션 날짜 리스트
+        prepared_by_date (dict): {날짜: prepare_simulation_inputs 결과}
+        best_by_date (dict): 프로세스 풀에서 계산된 {날짜: (최고 결과, 오류 메시지)} (None이면 이 프로세스에서 계산)
+    
+    Returns:
+        list: 날짜별 최고 수익률 결과
+    """
+    stock_results = []
+    for date in date_list:
+        try:
+            print(f"  {date} 시뮬레이션 중...")
+            
+            # 데이터 준비 결과 확인
+            prepared = prepared_by_date[date][stock_code]
+            if not prepared['ok']:
+                print(f"    ❌ {date} 데이터 준비 실패: {prepared['error']}")
+                continue
+            
+            # 자동 시뮬레이션 (oversold 25-35, overbought 65-75)
+            if best_by_date is not None:
+                best_result, error_message = best_by_date[date]
+                if error_message:
+                    raise RuntimeError(error_message)
+            else:
+                best_result = find_best_thresholds(stock_code, date, initial_capital, rsi_period)
+            
+            if best_result:
+                stock_results.append(best_result)
+                print(f"    ✅ {date} 최고 수익률: {best_result['profit_rate']:.2f}%")
+            else:
+                print(f"    ❌ {date} 시뮬레이션 실패")
+                
+        except Exception as e:
+            print(f"    ❌ {date} 오류: {str(e)}")
+            continue
+    return stock_results
+
 def create_final_trading_report(simulation_result, rsi_analysis):
     """
     최종 거래 시뮬레이션 보고서 생성
@@ -407,8 +618,9 @@ def create_final_trading_report(simulation_result, rsi_analysis):
             'max_loss_rate': simulation_result['max_loss_rate']
         },
         'rsi_analysis': rsi_analysis,
-        'trades': simulation_result['trades'],
-        'portfolio_values': simulation_result['portfolio_values']
+        # 거래/포트폴리오 기록은 보고서(JSON, 차트)를 만들 때만 dict 리스트로 변환
+        'trades': simulation_result['trades'].to_dicts(),
+        'portfolio_values': simulation_result['portfolio_values'].to_dicts()
     }
     
     return report
@@ -789,6 +1001,10 @@ def main():
                        help='종목코드 (기본값: 226950)')
     parser.add_argument('--date', '-d', type=str, default='20250718',
                        help='날짜 (YYYYMMDD 형식, 기본값: 20250718)')
+    parser.add_argument('--start_date', type=str, default=None,
+                       help='전체 종목 시뮬레이션 시작일 (YYYYMMDD, 주면 --date 대신 기간 사용, 전체 종목 시뮬레이션에서만 적용)')
+    parser.add_argument('--end_date', type=str, default=None,
+                       help='전체 종목 시뮬레이션 종료일 (YYYYMMDD, 없으면 시작일, 전체 종목 시뮬레이션에서만 적용)')
     parser.add_argument('--capital', '-c', type=int, default=10000000,
                        help='초기자본 (원, 기본값: 10000000)')
     parser.add_argument('--oversold', type=int, default=40,
@@ -798,9 +1014,21 @@ def main():
     parser.add_argument('--auto_simulate', action='store_true',
                        help='oversold 25-35, overbought 65-75 범위에서 1단위씩 자동 시뮬레이션')
     parser.add_argument('--all_stocks', action='store_true',
-                       help='전체 종목에 대해 20250711~20250718 기간 동안 시뮬레이션 실행')
+                       help='전체 종목에 대해 --date 하루 (또는 --start_date~--end_date 기간) 동안 시뮬레이션 실행')
     parser.add_argument('--no_charts', action='store_true',
                        help='차트 생성하지 않음 (자동 시뮬레이션에서만 적용)')
+    parser.add_argument('--rsi_period', type=int, default=None,
+                       help='사용할 RSI 기간 (기본값: RSI 파일의 기본 기간, 다른 기간은 --rsi_periods로 계산된 파일 필요)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='전체 종목 시뮬레이션을 나누어 실행할 프로세스 수 (기본값: 1, 전체 종목 시뮬레이션에서만 적용)')
+    parser.add_argument('--resume', action='store_true',
+                       help='결과 저널(data/all_stocks_simulation_results_<시작일>_<종료일>.jsonl)에 기록된 종목은 건너뛰고 이어서 실행 (전체 종목 시뮬레이션에서만 적용)')
+    parser.add_argument('--continuous', action='store_true',
+                       help='기간 전체를 하나의 흐름으로 연속 백테스트 (--oversold/--overbought 기준, 전체 종목 시뮬레이션에서만 적용)')
+    parser.add_argument('--carry_positions', action='store_true',
+                       help='연속 백테스트에서 보유 주식을 다음 거래일로 넘김 (기본: 매일 종가 청산)')
+    parser.add_argument('--rsi_periods', type=str, default=None,
+                       help='자동 시뮬레이션에서 함께 탐색할 RSI 기간 (예: 6-30, 자동 시뮬레이션에서만 적용)')
     
     args = parser.parse_args()
     
@@ -818,121 +1046,112 @@ def main():
             print(f"전체 종목 데이터 로드 실패: {str(e)}")
             sys.exit(1)
         
-        # 시뮬레이션 기간 설정
-        if args.date:
-            date_list = [args.date]
-            start_date = end_date = args.date  # 추가!
+        # 시뮬레이션 기간 설정 (--start_date/--end_date가 있으면 기간, 없으면 --date 하루)
+        if args.start_date or args.end_date:
+            start_date = args.start_date or args.end_date
+            end_date = args.end_date or args.start_date
+            # 거래일 리스트 생성 (주말/휴장일 제외)
+            date_list = load_trading_calendar(config).trading_days_between(start_date, end_date)
+            if not date_list:
+                print(f"시뮬레이션 기간에 거래일이 없습니다: {start_date} ~ {end_date}")
+                sys.exit(1)
         else:
-            # 기존처럼 8일 전체
-            start_date = '20250711'
-            end_date = '20250718'
-            # 날짜 리스트 생성
-            from datetime import datetime, timedelta
-            start_dt = datetime.strptime(start_date, '%Y%m%d')
-            end_dt = datetime.strptime(end_date, '%Y%m%d')
-            date_list = []
-            current_dt = start_dt
-            while current_dt <= end_dt:
-                date_list.append(current_dt.strftime('%Y%m%d'))
-                current_dt += timedelta(days=1)
+            date_list = [args.date]
+            start_date = end_date = args.date
         
         print(f"시뮬레이션 기간: {start_date} ~ {end_date} ({len(date_list)}일)")
         print("=" * 80)
         
-        # 전체 결과 저장용
-        all_stock_results = []
-        successful_stocks = 0
-        failed_stocks = 0
+        # 연속 백테스트: 날짜별 독립 시뮬레이션 대신 기간 전체를 한 번에 (현금 유지, 전 종목 일괄 계산)
+        if args.continuous:
+            stock_codes = list(dict.fromkeys(str(code).zfill(6) for code in stock_data['종목코드']))
+            stock_names = {str(row['종목코드']).zfill(6): row['종목명'] for _, row in stock_data.iterrows()}
+            # 하루 단위 시뮬레이션과 같은 rsi_data 파일의 RSI/봉을 쓰므로 10분봉과 RSI를 함께 준비
+            for date in date_list:
+                preparation = summarize_preparation(prepare_simulation_inputs(stock_codes, date))
+                print(f"{date} 데이터 준비: 완료 {preparation['ready']}개, 실패 {preparation['failed']}개 "
+                      f"(10분봉 수집 {preparation['bars_collected']}개, RSI 생성 {preparation['rsi_built']}개)")
+            
+            result = continuous_backtest(stock_codes, start_date, end_date, args.capital, args.oversold, args.overbought,
+                                         args.carry_positions, args.rsi_period, trade_settings)
+            result_filename, summaries = save_continuous_results(result, start_date, end_date, args.carry_positions)
+            
+            print(f"\n연속 백테스트 완료 ({'보유 주식 이월' if args.carry_positions else '매일 종가 청산'}, "
+                  f"oversold: {args.oversold}, overbought: {args.overbought})")
+            print(f"성공: {len(summaries)}개 종목, 실패: {len(stock_codes) - len(summaries)}개 종목")
+            print(f"\n상위 20개 종목 (수익률 순):")
+            print(f"{'순위':<4} {'종목코드':<8} {'종목명':<15} {'수익률':<8} {'최대낙폭':<8} {'거래횟수':<8}")
+            print("-" * 80)
+            for i, summary in enumerate(summaries[:20], 1):
+                print(f"{i:<4} {summary['stock_code']:<8} {stock_names.get(summary['stock_code'], ''):<15} "
+                      f"{summary['profit_rate']:<8.2f}% {summary['max_drawdown_rate']:<8.2f}% {summary['total_trades']:<8}회")
+            print(f"\n연속 백테스트 결과 저장 완료: {result_filename}")
+            return
+        
+        # 결과 저널 (종목마다 한 줄씩 추가, --resume이면 기록된 종목은 건너뜀)
+        stock_codes = [str(code).zfill(6) for code in stock_data['종목코드']]
+        sink_path = results_sink_path(start_date, end_date)
+        if args.resume:
+            trim_partial_line(sink_path)
+            finished_codes = set(load_sink(sink_path))
+            print(f"재개 모드: 결과 저널에 기록된 종목 {len(finished_codes)}개 건너뜀 ({sink_path})")
+        else:
+            finished_codes = set()
+            reset_sink(sink_path)
+        pending_codes = [stock_code for stock_code in dict.fromkeys(stock_codes) if stock_code not in finished_codes]
+        
+        # 날짜별로 부족한 10분봉/RSI 데이터를 한 번에 준비 (같은 프로세스에서 일괄 수집/계산)
+        prepared_by_date = {}
+        for date in date_list:
+            prepared_by_date[date] = prepare_simulation_inputs(pending_codes, date)
+            preparation = summarize_preparation(prepared_by_date[date])
+            print(f"{date} 데이터 준비: 완료 {preparation['ready']}개, 실패 {preparation['failed']}개 "
+                  f"(10분봉 수집 {preparation['bars_collected']}개, RSI 생성 {preparation['rsi_built']}개)")
         
-        # 각 종목에 대해 시뮬레이션 실행
+        # 종목별 결과를 저널에 기록 (최고 수익률 결과 포함)
+        stock_rows = {}
         for idx, row in stock_data.iterrows():
-            stock_code = str(row['종목코드']).zfill(6)
-            stock_name = row['종목명']
-            
+            stock_rows.setdefault(str(row['종목코드']).zfill(6), (idx, row['종목명']))
+        
+        def journal_stock(stock_code, best_by_date=None):
+            idx, stock_name = stock_rows[stock_code]
             print(f"\n[{idx+1}/{len(stock_data)}] {stock_code} {stock_name} 처리 중...")
-            
-            stock_results = []
-            
-            # 각 날짜에 대해 시뮬레이션
-            for date in date_list:
-                try:
-                    print(f"  {date} 시뮬레이션 중...")
-                    
-                    # 데이터 준비
-                    if not check_and_create_data(stock_code, date):
-                        print(f"    ❌ {date} 데이터 준비 실패")
-                        continue
-                    
-                    # RSI 데이터 로드
-                    rsi_data = load_rsi_data(stock_code, date)
-                    
-                    # 자동 시뮬레이션 (oversold 25-35, overbought 65-75)
-                    best_result = None
-                    best_profit_rate = -999
-                    
-                    for oversold in range(25, 36):
-                        for overbought in range(65, 76):
-                            try:
-                                simulation_result = simulate_rsi_trading_final(
-                                    rsi_data=rsi_data,
-                                    initial_capital=args.capital,
-                                    rsi_oversold=oversold,
-                                    rsi_overbought=overbought
-                                )
-                                
-                                if simulation_result['profit_rate'] > best_profit_rate:
-                                    best_profit_rate = simulation_result['profit_rate']
-                                    best_result = {
-                                        'date': date,
-                                        'oversold': oversold,
-                                        'overbought': overbought,
-                                        'profit_rate': simulation_result['profit_rate'],
-                                        'profit': simulation_result['profit'],
-                                        'total_trades': simulation_result['total_trades'],
-                                        'buy_trades': simulation_result['buy_trades'],
-                                        'sell_trades': simulation_result['sell_trades']
-                                    }
-                            except Exception as e:
-                                continue
-                    
-                    if best_result:
-                        stock_results.append(best_result)
-                        print(f"    ✅ {date} 최고 수익률: {best_result['profit_rate']:.2f}%")
-                    else:
-                        print(f"    ❌ {date} 시뮬레이션 실패")
-                        
-                except Exception as e:
-                    print(f"    ❌ {date} 오류: {str(e)}")
-                    continue
-            
-            # 종목별 결과 정리
-            if stock_results:
-                # 최고 수익률 결과 선택
-                best_stock_result = max(stock_results, key=lambda x: x['profit_rate'])
-                
-                all_stock_results.append({
-                    'stock_code': stock_code,
-                    'stock_name': stock_name,
-                    'best_result': best_stock_result,
-                    'all_results': stock_results
-                })
-                
-                successful_stocks += 1
-                print(f"  ✅ {stock_code} {stock_name} 완료 - 최고 수익률: {best_stock_result['profit_rate']:.2f}%")
+            stock_results = simulate_stock_dates(stock_code, date_list, prepared_by_date, args.capital,
+                                                 args.rsi_period, best_by_date)
+            entry = append_stock_result(sink_path, stock_code, stock_name, stock_results)
+            finished_codes.add(stock_code)
+            if entry['best_result']:
+                print(f"  ✅ {stock_code} {stock_name} 완료 - 최고 수익률: {entry['best_result']['profit_rate']:.2f}%")
             else:
-                failed_stocks += 1
                 print(f"  ❌ {stock_code} {stock_name} 실패")
         
-        # 전체 결과 정리 및 저장
+        if args.workers > 1:
+            # --workers 2 이상이면 (종목, 날짜) 작업을 프로세스 풀에서 계산하고, 종목의 모든 날짜가 끝나는 대로 저널에 기록
+            work_units = [(stock_code, date) for stock_code in pending_codes for date in date_list
+                          if prepared_by_date[date][stock_code]['ok']]
+            pooled_codes = {stock_code for stock_code, _ in work_units}
+            for stock_code in pending_codes:
+                if stock_code not in pooled_codes:
+                    journal_stock(stock_code, {})
+            for stock_code, best_by_date in simulate_all_stocks_in_pool(work_units, args.capital, args.rsi_period, args.workers):
+                journal_stock(stock_code, best_by_date)
+        else:
+            # 각 종목에 대해 시뮬레이션 실행
+            for stock_code in pending_codes:
+                journal_stock(stock_code)
+        
+        # 저널을 정렬하여 결과 저장
+        result_filename, all_stock_results, summary = finalize_results(
+            sink_path, stock_codes, start_date, end_date, {'open_price_cache': dict(open_price_cache_stats)})
+        
+        # 전체 결과 정리
         print("\n" + "=" * 80)
         print("전체 종목 시뮬레이션 완료")
         print("=" * 80)
-        print(f"성공: {successful_stocks}개 종목")
-        print(f"실패: {failed_stocks}개 종목")
+        print(f"성공: {summary['successful_stocks']}개 종목")
+        print(f"실패: {summary['failed_stocks']}개 종목")
         print(f"총 처리: {len(stock_data)}개 종목")
-        
-        # 수익률 기준 정렬
-        all_stock_results.sort(key=lambda x: x['best_result']['profit_rate'], reverse=True)
+        print(format_open_price_cache_stats())
         
         # 상위 20개 결과 출력
         print(f"\n상위 20개 종목 (수익률 순):")
@@ -944,26 +1163,6 @@ def main():
             print(f"{i:<4} {result['stock_code']:<8} {result['stock_name']:<15} "
                   f"{best['profit_rate']:<8.2f}% {best['profit']:<12,}원 {best['total_trades']:<8}회 {best['date']:<10}")
         
-        # 결과 저장
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        result_filename = f"./data/all_stocks_simulation_results_{start_date}_{end_date}.json"
-        
-        final_results = {
-            'simulation_period': {
-                'start_date': start_date,
-                'end_date': end_date
-            },
-            'summary': {
-                'total_stocks': len(stock_data),
-                'successful_stocks': successful_stocks,
-                'failed_stocks': failed_stocks
-            },
-            'results': all_stock_results
-        }
-        
-        with open(result_filename, 'w', encoding='utf-8') as f:
-            json.dump(final_results, f, ensure_ascii=False, indent=4)
-        
         print(f"\n전체 종목 시뮬레이션 결과 저장 완료: {result_filename}")
         
         return
@@ -983,6 +1182,9 @@ def main():
         print(f"초기자본: {initial_capital:,}원")
         print(f"oversold 범위: 25 ~ 35")
         print(f"overbought 범위: 65 ~ 75")
+        sweep_periods = parse_periods(args.rsi_periods) if args.rsi_periods else [args.rsi_period]
+        if args.rsi_periods:
+            print(f"RSI 기간: {', '.join(map(str, sweep_periods))}")
         print(f"차트 생성: {'비활성화' if args.no_charts else '활성화'}")
         print("=" * 80)
         
@@ -991,8 +1193,9 @@ def main():
             print("데이터 준비 실패로 인해 시뮬레이션을 중단합니다.")
             sys.exit(1)
 
-        # RSI 데이터 로드 (한 번만)
-        rsi_data = load_rsi_data(stock_code, date)
+        # RSI 데이터 로드 (한 번만, 기간별 RSI는 같은 파일에서 선택)
+        base_rsi_data = load_rsi_data(stock_code, date)
+        rsi_data = base_rsi_data if sweep_periods[0] is None else select_rsi_period(base_rsi_data, sweep_periods[0])
         print(f"RSI 데이터 로드 완료: {len(rsi_data['data'])}개 데이터 포인트")
         
         # RSI 분석 (한 번만)
@@ -1009,96 +1212,112 @@ def main():
         charts_folder = f"data/{stock_code}/charts"
         os.makedirs(charts_folder, exist_ok=True)
         
-        # oversold 25-35, overbought 65-75 범위에서 시뮬레이션
-        for oversold in range(25, 36):  # 25 ~ 35
-            for overbought in range(65, 76):  # 65 ~ 75
-                print(f"\n--- 시뮬레이션 {len(all_results) + 1}/121 ---")
-                print(f"oversold: {oversold}, overbought: {overbought}")
+        total_simulations = 121 * len(sweep_periods)
+        
+        for rsi_period in sweep_periods:
+            if rsi_period is not None:
+                rsi_data = select_rsi_period(base_rsi_data, rsi_period)
+            period_suffix = f"_rsi{rsi_data['rsi_period']}" if len(sweep_periods) > 1 else ""
+            # 차트를 만들지 않으면 121개 조합을 한 번에 계산 (차트는 거래/포트폴리오 기록이 필요해 조합별로 시뮬레이션)
+            grid_results = simulate_rsi_trading_grid(rsi_data, initial_capital) if args.no_charts else None
+            
+            # oversold 25-35, overbought 65-75 범위에서 시뮬레이션
+            for oversold in range(25, 36):  # 25 ~ 35
+                for overbought in range(65, 76):  # 65 ~ 75
+                    print(f"\n--- 시뮬레이션 {len(all_results) + 1}/{total_simulations} ---")
+                    print(f"RSI 기간: {rsi_data['rsi_period']}, oversold: {oversold}, overbought: {overbought}")
                 
-                try:
-                    # 시뮬레이션 실행
-                    simulation_result = simulate_rsi_trading_final(
-                        rsi_data=rsi_data,
-                        initial_capital=initial_capital,
-                        rsi_oversold=oversold,
-                        rsi_overbought=overbought
-                    )
-                    
-                    # 보고서 생성
-                    report = create_final_trading_report(simulation_result, rsi_analysis)
+                    try:
+                        # 시뮬레이션 실행
+                        if grid_results is not None:
+                            simulation_result, error_message = grid_results[(oversold, overbought)]
+                            if simulation_result is None:
+                                raise RuntimeError(error_message)
+                        else:
+                            simulation_result = add_trade_lists(simulate_rsi_trading_final(
+                                rsi_data=rsi_data,
+                                initial_capital=initial_capital,
+                                rsi_oversold=oversold,
+                                rsi_overbought=overbought
+                            ))
+                            # 보고서 생성
+                            report = create_final_trading_report(simulation_result, rsi_analysis)
                     
-                    # 차트 생성 및 저장 (--no_charts 옵션이 없을 때만)
-                    chart_filename = None
-                    chart_json_filename = None
-                    if not args.no_charts:
-                        chart_filename = f"rsi_trading_chart_{stock_code}_{date}_oversold{oversold}_overbought{overbought}_{timestamp}.png"
-                        chart_path = f"{charts_folder}/{chart_filename}"
-                        try:
-                            create_final_trading_chart(report, save_path=chart_path)
-                            print(f"  ✅ 차트 생성 완료: {chart_filename}")
-                        except Exception as chart_error:
-                            print(f"  ⚠️ 차트 생성 실패: {str(chart_error)}")
-                            chart_filename = None
-                        # report를 json으로도 저장
-                        if chart_filename:
-                            chart_json_filename = chart_filename.replace('.png', '.json')
-                            chart_json_path = f"{charts_folder}/{chart_json_filename}"
+                        # 차트 생성 및 저장 (--no_charts 옵션이 없을 때만)
+                        chart_filename = None
+                        chart_json_filename = None
+                        if not args.no_charts:
+                            chart_filename = f"rsi_trading_chart_{stock_code}_{date}_oversold{oversold}_overbought{overbought}{period_suffix}_{timestamp}.png"
+                            chart_path = f"{charts_folder}/{chart_filename}"
                             try:
-                                with open(chart_json_path, 'w', encoding='utf-8') as f:
-                                    json.dump(report, f, ensure_ascii=False, indent=4)
-                                print(f"  ✅ 차트 데이터 저장 완료: {chart_json_filename}")
-                            except Exception as json_error:
-                                print(f"  ⚠️ 차트 데이터 저장 실패: {str(json_error)}")
-                                chart_json_filename = None
-                        chart_files.append({
-                            'oversold': oversold,
-                            'overbought': overbought,
-                            'chart_path': chart_filename,
-                            'chart_json': chart_json_filename,
-                            'profit_rate': simulation_result['profit_rate']
-                        })
-                    else:
-                        chart_files.append({
+                                create_final_trading_chart(report, save_path=chart_path)
+                                print(f"  ✅ 차트 생성 완료: {chart_filename}")
+                            except Exception as chart_error:
+                                print(f"  ⚠️ 차트 생성 실패: {str(chart_error)}")
+                                chart_filename = None
+                            # report를 json으로도 저장
+                            if chart_filename:
+                                chart_json_filename = chart_filename.replace('.png', '.json')
+                                chart_json_path = f"{charts_folder}/{chart_json_filename}"
+                                try:
+                                    with open(chart_json_path, 'w', encoding='utf-8') as f:
+                                        json.dump(report, f, ensure_ascii=False, indent=4)
+                                    print(f"  ✅ 차트 데이터 저장 완료: {chart_json_filename}")
+                                except Exception as json_error:
+                                    print(f"  ⚠️ 차트 데이터 저장 실패: {str(json_error)}")
+                                    chart_json_filename = None
+                            chart_files.append({
+                                'rsi_period': rsi_data['rsi_period'],
+                                'oversold': oversold,
+                                'overbought': overbought,
+                                'chart_path': chart_filename,
+                                'chart_json': chart_json_filename,
+                                'profit_rate': simulation_result['profit_rate']
+                            })
+                        else:
+                            chart_files.append({
+                                'rsi_period': rsi_data['rsi_period'],
+                                'oversold': oversold,
+                                'overbought': overbought,
+                                'chart_path': None,
+                                'chart_json': None,
+                                'profit_rate': simulation_result['profit_rate']
+                            })
+                            print(f"  ⏭️ 차트 생성 건너뜀 (--no_charts 옵션)")
+                    
+                        # 결과 저장
+                        result_summary = {
+                            'rsi_period': rsi_data['rsi_period'],
                             'oversold': oversold,
                             'overbought': overbought,
-                            'chart_path': None,
-                            'chart_json': None,
-                            'profit_rate': simulation_result['profit_rate']
-                        })
-                        print(f"  ⏭️ 차트 생성 건너뜀 (--no_charts 옵션)")
-                    
-                    # 결과 저장
-                    result_summary = {
-                        'oversold': oversold,
-                        'overbought': overbought,
-                        'profit_rate': simulation_result['profit_rate'],
-                        'profit': simulation_result['profit'],
-                        'total_trades': simulation_result['total_trades'],
-                        'buy_trades': simulation_result['buy_trades'],
-                        'sell_trades': simulation_result['sell_trades'],
-                        'avg_buy_price': simulation_result['avg_buy_price'],
-                        'avg_sell_price': simulation_result['avg_sell_price'],
-                        'max_profit_rate': simulation_result['max_profit_rate'],
-                        'max_loss_rate': simulation_result['max_loss_rate'],
-                        'chart_filename': chart_filename,
-                        'chart_json_filename': chart_json_filename,
-                        # 매수/매도 거래 가격 및 시간 리스트 추가
-                        'buy_prices': [t['price'] for t in simulation_result['trades'] if t['action'] == 'BUY'],
-                        'buy_times': [t['timestamp'] for t in simulation_result['trades'] if t['action'] == 'BUY'],
-                        'sell_prices': [t['price'] for t in simulation_result['trades'] if t['action'] in ['SELL', 'FINAL_SELL']],
-                        'sell_times': [t['timestamp'] for t in simulation_result['trades'] if t['action'] in ['SELL', 'FINAL_SELL']],
-                        # 차트 링크 추가
-                        'chart_link': f'chart_viewer.html?code={stock_code}&date={date}&oversold={oversold}&overbought={overbought}'
-                    }
+                            'profit_rate': simulation_result['profit_rate'],
+                            'profit': simulation_result['profit'],
+                            'total_trades': simulation_result['total_trades'],
+                            'buy_trades': simulation_result['buy_trades'],
+                            'sell_trades': simulation_result['sell_trades'],
+                            'avg_buy_price': simulation_result['avg_buy_price'],
+                            'avg_sell_price': simulation_result['avg_sell_price'],
+                            'max_profit_rate': simulation_result['max_profit_rate'],
+                            'max_loss_rate': simulation_result['max_loss_rate'],
+                            'chart_filename': chart_filename,
+                            'chart_json_filename': chart_json_filename,
+                            # 매수/매도 거래 가격 및 시간 리스트 추가
+                            'buy_prices': simulation_result['buy_prices'],
+                            'buy_times': simulation_result['buy_times'],
+                            'sell_prices': simulation_result['sell_prices'],
+                            'sell_times': simulation_result['sell_times'],
+                            # 차트 링크 추가
+                            'chart_link': f'chart_viewer.html?code={stock_code}&date={date}&oversold={oversold}&overbought={overbought}'
+                        }
                     
-                    all_results.append(result_summary)
+                        all_results.append(result_summary)
                     
-                    print(f"  수익률: {simulation_result['profit_rate']:.2f}%")
-                    print(f"  거래횟수: {simulation_result['total_trades']}회")
+                        print(f"  수익률: {simulation_result['profit_rate']:.2f}%")
+                        print(f"  거래횟수: {simulation_result['total_trades']}회")
                     
-                except Exception as e:
-                    print(f"  오류 발생: {str(e)}")
-                    continue
+                    except Exception as e:
+                        print(f"  오류 발생: {str(e)}")
+                        continue
         
         # 결과 정렬 (수익률 기준 내림차순)
         all_results.sort(key=lambda x: x['profit_rate'], reverse=True)
@@ -1115,6 +1334,8 @@ def main():
             print(f"{i:<4} {result['oversold']:<9} {result['overbought']:<10} "
                   f"{result['profit_rate']:<8.2f}% {result['profit']:<12,}원 {result['total_trades']:<8}회")
         
+        print(format_open_price_cache_stats())
+        
         # 최고 수익률 결과 상세 출력
         if all_results:
             best_result = all_results[0]
@@ -1148,6 +1369,7 @@ def main():
                 'overbought_min': 65,
                 'overbought_max': 75
             },
+            'rsi_periods': sorted({result['rsi_period'] for result in all_results}),
             'total_simulations': len(all_results),
             'results': all_results,
             'best_result': all_results[0] if all_results else None,
@@ -1187,7 +1409,7 @@ def main():
                 sys.exit(1)
 
             # RSI 데이터 로드
-            rsi_data = load_rsi_data(stock_code, date)
+            rsi_data = load_rsi_data(stock_code, date, args.rsi_period)
             print(f"RSI 데이터 로드 완료: {len(rsi_data['data'])}개 데이터 포인트")
             
             # RSI 분석
@@ -0,0 +1,139 @@
+import numpy as np
+
+# 시뮬레이션 거래/포트폴리오 기록
+#
+# 거래마다, 봉마다 dict를 만드는 대신
+#   - TradeLog    : 거래 항목별 리스트 (시간, 구분, 가격, 수량, 금액, RSI, 현금, 보유 주식)
+#   - EquityCurve : (기록 봉 인덱스 리스트, 현금, 보유 주식) 구간만 보관하고 가격/가치는 필요할 때 계산
+# 보고서(JSON) 저장이나 차트 생성 시에만 to_dicts()로 기존 dict 리스트 형식으로 변환
+# 값은 Python 리스트에 그대로 두므로 int/float 타입이 dict 기록과 같음 (JSON 출력도 같음)
+
+SELL_ACTIONS = ('SELL', 'FINAL_SELL')
+
+class TradeLog:
+    """
+    거래 기록 (항목별 리스트)
+
+    - prices_of('BUY') / times_of(*SELL_ACTIONS) : 구분별 체결 가격/시간 리스트
+    - count('BUY') : 구분별 거래 수
+    - to_dicts() : [{'timestamp', 'action', 'price', 'shares', 'cost' 또는 'revenue', 'rsi', 'capital', 'shares_held'}]
+    """
+
+    def __init__(self):
+        self.timestamps = []
+        self.actions = []
+        self.prices = []
+        self.shares = []
+        self.amounts = []
+        self.rsi = []
+        self.capital = []
+        self.shares_held = []
+
+    def add(self, timestamp, action, price, shares, amount, rsi, capital, shares_held):
+        """
+        거래 한 건 추가 (amount는 매수면 비용, 매도면 매도 금액)
+        """
+        self.timestamps.append(timestamp)
+        self.actions.append(action)
+        self.prices.append(price)
+        self.shares.append(shares)
+        self.amounts.append(amount)
+        self.rsi.append(rsi)
+        self.capital.append(capital)
+        self.shares_held.append(shares_held)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def count(self, *actions):
+        return sum(1 for action in self.actions if action in actions)
+
+    def prices_of(self, *actions):
+        return [price for action, price in zip(self.actions, self.prices) if action in actions]
+
+    def times_of(self, *actions):
+        return [timestamp for action, timestamp in zip(self.actions, self.timestamps) if action in actions]
+
+    def mean_price(self, *actions):
+        """
+        구분별 평균 체결 가격 (거래가 없으면 0)
+        np.mean과 같은 값 (float64로 바꿔 add.reduce 후 개수로 나눔, np.mean의 인자 처리 부담만 줄임)
+        """
+        prices = self.prices_of(*actions)
+        return np.add.reduce(np.array(prices, dtype=np.float64)) / len(prices) if prices else 0
+
+    def to_dicts(self):
+        trades = []
+        for row in zip(self.timestamps, self.actions, self.prices, self.shares, self.amounts,
+                       self.rsi, self.capital, self.shares_held):
+            timestamp, action, price, shares, amount, rsi, capital, shares_held = row
+            trades.append({
+                'timestamp': timestamp,
+                'action': action,
+                'price': price,
+                'shares': shares,
+                'cost' if action == 'BUY' else 'revenue': amount,
+                'rsi': rsi,
+                'capital': capital,
+                'shares_held': shares_held
+            })
+        return trades
+
+class EquityCurve:
+    """
+    포트폴리오 가치 기록 (현금/보유 주식이 같은 구간 단위)
+
+    - timestamps() / prices() / rsi() / values() : 기록 봉 순서의 리스트
+    - to_dicts() : [{'timestamp', 'price', 'rsi', 'capital', 'shares', 'portfolio_value'}]
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._segments = []
+
+    def add_segment(self, bars, capital, shares):
+        """
+        현금/보유 주식이 같은 기록 봉들을 추가 (bars: 봉 인덱스 리스트)
+        """
+        if bars:
+            self._segments.append((bars, capital, shares))
+
+    def add(self, bar, capital, shares):
+        self._segments.append(([bar], capital, shares))
+
+    def __len__(self):
+        return sum(len(bars) for bars, _, _ in self._segments)
+
+    def _column(self, key):
+        data = self.data
+        return [data[bar][key] for bars, _, _ in self._segments for bar in bars]
+
+    def timestamps(self):
+        return self._column('localDateTime')
+
+    def prices(self):
+        return self._column('currentPrice')
+
+    def rsi(self):
+        return self._column('rsi')
+
+    def values(self):
+        data = self.data
+        return [capital + (shares * data[bar]['currentPrice'])
+                for bars, capital, shares in self._segments for bar in bars]
+
+    def to_dicts(self):
+        data = self.data
+        records = []
+        for bars, capital, shares in self._segments:
+            for bar in bars:
+                item = data[bar]
+                records.append({
+                    'timestamp': item['localDateTime'],
+                    'price': item['currentPrice'],
+                    'rsi': item['rsi'],
+                    'capital': capital,
+                    'shares': shares,
+                    'portfolio_value': capital + (shares * item['currentPrice'])
+                })
+        return records
@@ -0,0 +1,132 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+# KRX 휴장일 (주말 제외, 연말 휴장일 포함)
+# config.json의 calendar_settings.extra_holidays / extra_trading_days로 추가/예외 지정 가능
+KRX_HOLIDAYS = {
+    # 2023
+    '20230123', '20230124', '20230301', '20230501', '20230505', '20230529', '20230606',
+    '20230815', '20230928', '20230929', '20231002', '20231003', '20231009', '20231225',
+    '20231229',
+    # 2024
+    '20240101', '20240209', '20240212', '20240301', '20240410', '20240501', '20240506',
+    '20240515', '20240606', '20240815', '20240916', '20240917', '20240918', '20241001',
+    '20241003', '20241009', '20241225', '20241231',
+    # 2025
+    '20250101', '20250127', '20250128', '20250129', '20250130', '20250303', '20250501',
+    '20250505', '20250506', '20250603', '20250606', '20250815', '20251003', '20251006',
+    '20251007', '20251008', '20251009', '20251225', '20251231',
+    # 2026
+    '20260101', '20260216', '20260217', '20260218', '20260302', '20260501', '20260505',
+    '20260525', '20260603', '20260817', '20260924', '20260925', '20261005', '20261009',
+    '20261225', '20261231',
+}
+
+class TradingCalendar:
+    """
+    KRX 거래일 캘린더
+
+    휴장일 테이블이 포함된 연도 범위에 대해서는 날짜별 전영업일을 미리 계산해 두어
+    previous_trading_day()가 파일 존재 여부를 확인하지 않고 O(1)로 동작
+    """
+
+    def __init__(self, holidays=KRX_HOLIDAYS, extra_trading_days=()):
+        self.holidays = set(holidays) - set(extra_trading_days)
+        self.extra_trading_days = set(extra_trading_days)
+
+        years = sorted({int(d[:4]) for d in self.holidays}) or [datetime.now().year]
+        start_dt = datetime(years[0], 1, 1)
+        end_dt = datetime(years[-1], 12, 31)
+
+        self._previous = {}
+        self.trading_days = []
+        last_trading_day = None
+        current_dt = start_dt
+        while current_dt <= end_dt:
+            date_str = current_dt.strftime('%Y%m%d')
+            self._previous[date_str] = last_trading_day
+            if self._is_trading_day(current_dt, date_str):
+                self.trading_days.append(date_str)
+                last_trading_day = date_str
+            current_dt += timedelta(days=1)
+        self._last_table_day = end_dt.strftime('%Y%m%d')
+        self._last_table_trading_day = last_trading_day
+
+    def _is_trading_day(self, dt, date_str):
+        if date_str in self.extra_trading_days:
+            return True
+        return dt.weekday() < 5 and date_str not in self.holidays
+
+    def is_trading_day(self, date_str):
+        """
+        거래일 여부 확인 (YYYYMMDD)
+        """
+        return self._is_trading_day(datetime.strptime(date_str, '%Y%m%d'), date_str)
+
+    def trading_days_between(self, start_date, end_date):
+        """
+        시작일~종료일(포함) 사이의 거래일 리스트를 반환
+        """
+        start_dt = datetime.strptime(start_date, '%Y%m%d')
+        end_dt = datetime.strptime(end_date, '%Y%m%d')
+
+        days = []
+        current_dt = start_dt
+        while current_dt <= end_dt:
+            date_str = current_dt.strftime('%Y%m%d')
+            if self._is_trading_day(current_dt, date_str):
+                days.append(date_str)
+            current_dt += timedelta(days=1)
+        return days
+
+    def previous_trading_day(self, date_str):
+        """
+        전영업일(YYYYMMDD)을 반환 (테이블 범위 밖이면 주말/휴장일을 건너뛰며 계산)
+        """
+        if self._previous.get(date_str) is not None:
+            return self._previous[date_str]
+        if date_str > self._last_table_day:
+            current_dt = datetime.strptime(date_str, '%Y%m%d') - timedelta(days=1)
+            while current_dt.strftime('%Y%m%d') > self._last_table_day:
+                if self._is_trading_day(current_dt, current_dt.strftime('%Y%m%d')):
+                    return current_dt.strftime('%Y%m%d')
+                current_dt -= timedelta(days=1)
+            return self._last_table_trading_day
+        # 테이블 시작 이전이거나 테이블 안에 앞선 거래일이 없는 날 (예: 테이블 첫 거래일): 주말만 건너뜀
+        current_dt = datetime.strptime(date_str, '%Y%m%d') - timedelta(days=1)
+        while current_dt.weekday() >= 5:
+            current_dt -= timedelta(days=1)
+        return current_dt.strftime('%Y%m%d')
+
+_calendar_cache = {}
+
+def load_trading_calendar(config=None, config_file='config.json'):
+    """
+    config의 calendar_settings를 반영한 TradingCalendar를 반환하는 함수
+    (같은 설정이면 프로세스 내에서 한 번만 생성)
+
+    Args:
+        config (dict): 설정 (None이면 config_file에서 읽음, 파일이 없으면 기본 휴장일만 사용)
+        config_file (str): 설정 파일 경로
+
+    Returns:
+        TradingCalendar: 거래일 캘린더
+    """
+    if config is None:
+        config = {}
+        if os.path.exists(config_file):
+            try:
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            except json.JSONDecodeError:
+                config = {}
+
+    calendar_settings = config.get('calendar_settings', {})
+    extra_holidays = tuple(sorted(calendar_settings.get('extra_holidays', [])))
+    extra_trading_days = tuple(sorted(calendar_settings.get('extra_trading_days', [])))
+
+    key = (extra_holidays, extra_trading_days)
+    if key not in _calendar_cache:
+        _calendar_cache[key] = TradingCalendar(KRX_HOLIDAYS | set(extra_holidays), extra_trading_days)
+    return _calendar_cache[key]
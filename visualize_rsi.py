@@ -5,8 +5,8 @@ from datetime import datetime
 import pandas as pd
 import numpy as np
 import os
-import glob
 import argparse
+from data_catalog import find_data_files
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'Malgun Gothic'
@@ -168,24 +168,12 @@ def visualize_all_rsi_data(data_dir='data'):
     Args:
         data_dir (str): 데이터 디렉토리 경로
     """
-    # data 디렉토리 내의 모든 종목 폴더 찾기
-    stock_folders = []
-    if os.path.exists(data_dir):
-        for item in os.listdir(data_dir):
-            item_path = os.path.join(data_dir, item)
-            if os.path.isdir(item_path):
-                stock_folders.append(item_path)
-    
-    if not stock_folders:
+    if not os.path.exists(data_dir):
         print("처리할 종목 폴더를 찾을 수 없습니다.")
         return
     
-    # 각 종목 폴더에서 rsi_data_*.json 파일들 찾기
-    rsi_files = []
-    for folder in stock_folders:
-        pattern = os.path.join(folder, 'rsi_data_*.json')
-        files = glob.glob(pattern)
-        rsi_files.extend(files)
+    # data 하위 폴더의 rsi_data_*.json 파일들 찾기 (카탈로그가 있으면 카탈로그에서 조회)
+    rsi_files = find_data_files('rsi_data', data_dir=data_dir)
     
     if not rsi_files:
         print("시각화할 RSI 데이터 파일을 찾을 수 없습니다.")